@@ -0,0 +1,79 @@
+import csv
+import os
+import tempfile
+import unittest
+import pyarrow as pa
+import pyarrow.parquet as pq
+from format_data import process_csv, convert_timestamps_to_aest, split_list_column, FIELDNAMES
+
+HEADER = ['moisture_active', 'oxygen', 'lid', 'co2', 'time_stamp', 'device_id', 'temperature_curing',
+          'moisture_curing', 'automation_active', 'methane', 'temperature_active']
+
+def export_row(i):
+    return [f'[{i}, {i + 1}]', 20.5, i % 2, 400 + i, 1719800000000 + 3000 * i, 'lida1',
+            '[25.5, 26]', '[40, 41]', 'true', 1.25, f'[50.25, 51, 52, {i}]']
+
+class TestFormatData(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.directory.name, 'export.csv')
+        with open(self.input_file, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADER)
+            writer.writerows(export_row(i) for i in range(500))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_aest_conversion(self):
+        """Test if epoch milliseconds are shifted to AEST (UTC+10) wall-clock time."""
+        converted = convert_timestamps_to_aest(pa.array([0, 1719800000000]))
+        self.assertEqual(str(converted[0].as_py()), '1970-01-01 10:00:00')
+        self.assertEqual(str(converted[1].as_py()), '2024-07-01 12:13:20')
+
+    def test_split_list_column(self):
+        """Test if list strings are split into float columns and short lists are rejected."""
+        first, second = split_list_column(pa.array(['[1, 2.5]', '[3,4]']), 'moisture_active', 2)
+        self.assertEqual(first.to_pylist(), [1.0, 3.0])
+        self.assertEqual(second.to_pylist(), [2.5, 4.0])
+        with self.assertRaises(ValueError):
+            split_list_column(pa.array(['[1, 2]', '[3]']), 'moisture_active', 2)
+
+    def test_parquet_output_in_order(self):
+        """Test if small chunks converted in the pool are written in input order next to the CSV."""
+        stats = process_csv(self.input_file, workers=2, block_size=4096, verbose=False)
+        self.assertEqual(stats['rows'], 500)
+        table = pq.read_table(os.path.join(self.directory.name, 'export.parquet'))
+        self.assertEqual(table.column_names, FIELDNAMES)
+        self.assertEqual(table.column('moisture_active1').to_pylist(), [float(i) for i in range(500)])
+        self.assertEqual(table.column('temperature_active4').to_pylist(), [float(i) for i in range(500)])
+        self.assertEqual(str(table.column('time_stamp')[0].as_py()), '2024-07-01 12:13:20')
+
+    def test_csv_output_matches_original_layout(self):
+        """Test if CSV output keeps the original columns and text time stamps."""
+        output_file = os.path.join(self.directory.name, 'cleaned.csv')
+        process_csv(self.input_file, output_file, workers=1, verbose=False)
+        with open(output_file, newline='') as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(list(rows[0]), FIELDNAMES)
+        self.assertEqual(rows[1]['time_stamp'], '2024-07-01 12:13:23')
+        self.assertEqual(rows[1]['temperature_curing2'], '26')
+
+    def test_types_fixed_across_chunks(self):
+        """Test if a sensor that only reads whole numbers in the first chunk still accepts fractions later."""
+        rows = [export_row(i) for i in range(1500)]
+        for i, row in enumerate(rows):
+            row[HEADER.index('methane')] = 0 if i < 1000 else 0.5
+            row[HEADER.index('co2')] = 400 if i < 1000 else 400.5
+        with open(self.input_file, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(HEADER)
+            writer.writerows(rows)
+        process_csv(self.input_file, workers=2, block_size=4096, verbose=False)
+        table = pq.read_table(os.path.join(self.directory.name, 'export.parquet'))
+        self.assertEqual(table.schema.field('methane').type, pa.float64())
+        self.assertEqual(table.column('methane').to_pylist(), [0.0] * 1000 + [0.5] * 500)
+        self.assertEqual(table.column('co2').to_pylist()[-1], 400.5)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
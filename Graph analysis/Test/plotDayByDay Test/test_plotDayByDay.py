@@ -0,0 +1,81 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from plotDayByDay import FileSource, StoreSource, render_all, moving_mean, decimate, PLOT_COLUMNS
+from telemetryStore import TelemetryStore
+
+def cleaned_table(count):
+    times = np.datetime64('2024-07-01T12:00:00', 'ms') + np.arange(count) * np.timedelta64(3, 's')
+    columns = {'time_stamp': pa.array(times[::-1]), 'device_id': ['lida1'] * count}  # Unsorted on purpose
+    columns.update({name: np.linspace(0, 100, count) for name in PLOT_COLUMNS})
+    return pa.table(columns)
+
+class TestPlotDayByDay(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cleaned.parquet')
+        pq.write_table(cleaned_table(40000), self.path)  # 12:00 on day 1 to 09:20 on day 2
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_moving_mean_matches_movmean(self):
+        """Test if the window shrinks at the ends like MATLAB's movmean(x, 5)."""
+        np.testing.assert_allclose(moving_mean([1, 2, 3, 4, 5, 6], 5), [2, 2.5, 3, 4, 4.5, 5])
+
+    def test_moving_mean_omits_missing_readings(self):
+        """Test if a NaN only affects its own windows, like movmean(x, 3, 'omitnan')."""
+        np.testing.assert_allclose(moving_mean([1, 2, np.nan, 4, 5, 6, 7], 3), [1.5, 1.5, 3, 4.5, 5, 6, 6.5])
+        np.testing.assert_array_equal(np.isnan(moving_mean([1, np.nan, np.nan, np.nan, 5], 3)), [False, False, True, False, False])
+
+    def test_decimate_keeps_envelope(self):
+        """Test if decimation keeps each segment's extremes in time order."""
+        times = np.arange(10000)
+        values = np.sin(times / 50.0)
+        values[1234] = 5.0
+        kept_times, kept_values = decimate(times, values, points=100)
+        self.assertEqual(len(kept_values), 200)
+        self.assertTrue(np.all(np.diff(kept_times) >= 0))
+        self.assertEqual(kept_values.max(), 5.0)
+        self.assertAlmostEqual(kept_values.min(), values.min())
+
+    def test_day_index(self):
+        """Test if the day index covers each day's rows, sorted, and a day loads only its own rows."""
+        source = FileSource(self.path, self.directory.name)
+        np.testing.assert_array_equal(source.days, np.array(['2024-07-01', '2024-07-02'], dtype='datetime64[D]'))
+        day = source.load(source.days[1])
+        self.assertEqual(len(day['time_stamp']), 40000 - 14400)
+        self.assertEqual(day['time_stamp'][0], np.datetime64('2024-07-02T00:00:00', 'ms'))
+        self.assertTrue(np.all(np.diff(day['time_stamp']) > np.timedelta64(0, 'ms')))
+
+    def test_date_range(self):
+        """Test if start and end limit the days that are indexed."""
+        source = FileSource(self.path, self.directory.name, start='2024-07-02')
+        np.testing.assert_array_equal(source.days, np.array(['2024-07-02'], dtype='datetime64[D]'))
+
+    def test_render_all_in_pool(self):
+        """Test if every day is rendered to a PNG per figure kind by the worker processes."""
+        output = os.path.join(self.directory.name, 'graphs')
+        paths = render_all(FileSource(self.path, self.directory.name), output, workers=2, dpi=30, verbose=False)
+        self.assertEqual(sorted(os.path.relpath(path, output) for path in paths), [
+            os.path.join('daybyday', '2024-07-01.png'), os.path.join('daybyday', '2024-07-02.png'),
+            os.path.join('gasses', '2024-07-01.png'), os.path.join('gasses', '2024-07-02.png')])
+        for path in paths:
+            with open(path, 'rb') as file:
+                self.assertEqual(file.read(8), b'\x89PNG\r\n\x1a\n')
+
+    def test_store_source(self):
+        """Test if days are read from a TelemetryStore partition by partition."""
+        store = TelemetryStore(os.path.join(self.directory.name, 'store'))
+        store.append_table(cleaned_table(40000))
+        source = StoreSource(store.root, 'lida1')
+        self.assertEqual(len(source.days), 2)
+        self.assertEqual(len(source.load(source.days[0])['time_stamp']), 14400)
+        paths = render_all(source, os.path.join(self.directory.name, 'graphs'), kinds=('gasses',), workers=1, dpi=30, verbose=False)
+        self.assertEqual(len(paths), 2)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
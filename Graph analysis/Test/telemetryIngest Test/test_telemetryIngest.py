@@ -0,0 +1,115 @@
+import json
+import math
+import tempfile
+import unittest
+from collections import namedtuple
+import numpy as np
+import paho.mqtt.client as mqtt
+from telemetryStore import TelemetryStore
+from telemetryIngest import TelemetryIngest, flatten_payload, device_from_topic, FIELD_NAMES, TOPIC
+
+Message = namedtuple('Message', ['topic', 'payload'])
+
+# A publishDataTask payload, as serialized by ArduinoJson
+PAYLOAD = {
+    'temperature': {'active_phase': [50.25, 51, 52, 53], 'curing_phase': [25.5, 26]},
+    'moisture': {'active_phase': [40, 41], 'curing_phase': [42, 43]},
+    'methane': 120, 'oxygen': 20.5, 'co2': 800, 'lid': 'open', 'automation_active': True
+}
+
+class FakeClient:
+    """In-process stand-in for a paho client connected to a broker: delivers publishes to its subscriptions."""
+
+    def __init__(self):
+        self.subscriptions = []
+        self.on_connect = None
+        self.on_message = None
+
+    def connect(self):
+        self.on_connect(self, None, {}, 0, None)
+
+    def subscribe(self, topic, qos=0):
+        self.subscriptions.append((topic, qos))
+
+    def publish(self, topic, payload):
+        if any(mqtt.topic_matches_sub(subscription, topic) for subscription, _ in self.subscriptions):
+            self.on_message(self, None, Message(topic, payload))
+
+class TestTelemetryIngest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = TelemetryStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_flatten_payload(self):
+        """Test if the nested payload maps to the format_data.py columns, the lid string to 1/0."""
+        row = dict(zip(FIELD_NAMES, flatten_payload(json.dumps(PAYLOAD).encode())))
+        self.assertEqual(row['temperature_active4'], 53.0)
+        self.assertEqual(row['temperature_curing1'], 25.5)
+        self.assertEqual(row['moisture_curing2'], 43.0)
+        self.assertEqual(row['co2'], 800.0)
+        self.assertEqual(row['lid'], 1.0)
+        self.assertEqual(row['automation_active'], 1.0)
+
+    def test_missing_readings_are_nan(self):
+        """Test if absent or short fields become NaN instead of failing the message."""
+        row = dict(zip(FIELD_NAMES, flatten_payload({'temperature': {'active_phase': [30]}, 'lid': 'close'})))
+        self.assertEqual(row['temperature_active1'], 30.0)
+        self.assertTrue(math.isnan(row['temperature_active2']))
+        self.assertTrue(math.isnan(row['oxygen']))
+        self.assertEqual(row['lid'], 0.0)
+        with self.assertRaises(ValueError):
+            flatten_payload(b'[1, 2]')
+
+    def test_device_from_topic(self):
+        self.assertEqual(device_from_topic('device/DB_testbench/data'), 'DB_testbench')
+        with self.assertRaises(ValueError):
+            device_from_topic('device/DB_testbench/motor')
+
+    def test_ingest_through_fake_broker(self):
+        """Test if messages published to device/<id>/data end up in the store, per device and in batches."""
+        ingest = TelemetryIngest(self.store, batch_size=100, flush_seconds=0.05)
+        client = FakeClient()
+        client.on_connect, client.on_message = ingest.on_connect, ingest.on_message
+        client.connect()
+        self.assertEqual(client.subscriptions, [(TOPIC, 1)])
+
+        payload = json.dumps(PAYLOAD).encode()
+        with ingest:
+            for i in range(1500):
+                client.publish(f'device/lida{i % 3}/data', payload)
+            client.publish('device/lida0/data', b'{not json')
+            client.publish('device/lida0/motor', payload)  # Not subscribed
+        stats = ingest.stats()
+        self.assertEqual((stats['written'], stats['malformed'], stats['dropped']), (1500, 1, 0))
+        self.assertGreaterEqual(stats['batches'], 15)
+        self.assertEqual(self.store.devices(), ['lida0', 'lida1', 'lida2'])
+        result = self.store.query('lida1')
+        self.assertEqual(len(result['time_stamp']), 500)
+        self.assertTrue(np.all(np.diff(result['time_stamp']) >= np.timedelta64(0, 'ms')))
+        np.testing.assert_allclose(result['temperature_active1'], 50.25)
+
+    def test_receive_times_never_go_backwards(self):
+        """Test if a clock step back is clamped so the store keeps accepting the device's rows."""
+        payload = json.dumps(PAYLOAD)
+        with TelemetryIngest(self.store, flush_seconds=0.01) as ingest:
+            ingest.submit('device/lida0/data', payload, received=1719800000000)
+        with TelemetryIngest(self.store, flush_seconds=0.01) as later:
+            later.last_time = dict(ingest.last_time)
+            later.submit('device/lida0/data', payload, received=1719799000000)
+        self.assertEqual(later.stats()['errors'], 0)
+        self.assertEqual(len(self.store.query('lida0')['time_stamp']), 2)
+
+    def test_backpressure(self):
+        """Test if a full queue blocks submit() and drops the message once put_timeout has passed."""
+        ingest = TelemetryIngest(self.store, queue_size=2, put_timeout=0.01)  # Writer not started
+        self.assertTrue(ingest.submit('device/lida0/data', b'{}'))
+        self.assertTrue(ingest.submit('device/lida0/data', b'{}'))
+        self.assertFalse(ingest.submit('device/lida0/data', b'{}'))
+        self.assertEqual(ingest.stats()['dropped'], 1)
+        self.assertEqual(ingest.stats()['queued'], 2)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,93 @@
+import csv
+import os
+import tempfile
+import unittest
+import numpy as np
+from telemetryStore import TelemetryStore
+from telemetryRollup import RollupEngine, aggregate
+
+START = np.datetime64('2024-07-01T23:00:00', 'ms')
+
+def readings(count, offset=0, seed=0):
+    rng = np.random.default_rng(seed)
+    temperature = rng.uniform(20, 60, count)
+    temperature[rng.random(count) < 0.1] = np.nan
+    return {
+        'time_stamp': START + (offset + np.arange(count)) * np.timedelta64(3, 's'),
+        'temperature_active1': temperature,
+        'co2': rng.integers(300, 500, count).astype(float)
+    }
+
+class TestRollupEngine(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = RollupEngine(os.path.join(self.directory.name, 'rollups'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_aggregate_skips_missing_readings(self):
+        """Test if bucket partials count only readings that are not NaN."""
+        buckets, aggregates = aggregate(np.array([0, 10, 60000, 60010]), {'oxygen': np.array([1.0, np.nan, np.nan, np.nan])}, 60000)
+        np.testing.assert_array_equal(buckets, [0, 60000])
+        total, count, low, high = aggregates['oxygen']
+        np.testing.assert_array_equal(count, [1, 0])
+        self.assertEqual(total[0], 1.0)
+        self.assertTrue(np.isnan(low[1]) and np.isnan(high[1]))
+
+    def test_incremental_updates_match_one_pass(self):
+        """Test if rollups fed in chunks (including an out-of-order one) equal rollups fed all rows at once."""
+        rows = readings(3000)
+        whole = RollupEngine(os.path.join(self.directory.name, 'whole'))
+        whole.update('lida1', rows)
+        for start, stop in [(1000, 1700), (1700, 3000), (0, 1000)]:
+            self.engine.update('lida1', {name: values[start:stop] for name, values in rows.items()})
+        for resolution in ('1min', '15min', 'hourly', 'daily'):
+            expected = whole.query('lida1', resolution)
+            result = self.engine.query('lida1', resolution)
+            np.testing.assert_array_equal(result['time_stamp'], expected['time_stamp'])
+            for name in ('temperature_active1_mean', 'temperature_active1_min', 'temperature_active1_max', 'co2_count'):
+                np.testing.assert_allclose(result[name], expected[name], rtol=1e-9)
+
+    def test_rollup_values(self):
+        """Test if bucket mean, min, max and count match the raw rows of the bucket."""
+        rows = readings(1500)
+        self.engine.update('lida1', rows)
+        result = self.engine.query('lida1', 'hourly')
+        self.assertEqual(result['time_stamp'][1], np.datetime64('2024-07-02T00:00:00', 'ms'))
+        first_hour = rows['temperature_active1'][:1200]  # 23:00 to 00:00 is 1200 readings
+        self.assertEqual(result['temperature_active1_count'][0], np.count_nonzero(~np.isnan(first_hour)))
+        self.assertAlmostEqual(result['temperature_active1_mean'][0], np.nanmean(first_hour), places=6)
+        self.assertAlmostEqual(float(result['temperature_active1_max'][0]), np.nanmax(first_hour), places=4)
+        self.assertTrue(np.isnan(result['oxygen_mean'][0]))  # Never reported
+
+        daily = self.engine.query('lida1', 'daily', '2024-07-01', '2024-07-02', columns=['co2'])
+        self.assertEqual(len(daily['time_stamp']), 1)
+        self.assertEqual(daily['co2_count'][0], 1200)
+
+    def test_store_updates_rollups_on_append(self):
+        """Test if a TelemetryStore with rollups keeps them current, and rebuild() reproduces them."""
+        store = TelemetryStore(os.path.join(self.directory.name, 'store'), rollups=self.engine)
+        rows = readings(2000)
+        store.append('lida1', {name: values[:800] for name, values in rows.items()})
+        store.append('lida1', {name: values[800:] for name, values in rows.items()})
+        live = self.engine.query('lida1', '15min')
+
+        rebuilt = RollupEngine(os.path.join(self.directory.name, 'rebuilt'))
+        rebuilt.rebuild(TelemetryStore(store.root), 'lida1')
+        expected = rebuilt.query('lida1', '15min')
+        np.testing.assert_array_equal(live['time_stamp'], expected['time_stamp'])
+        np.testing.assert_allclose(live['temperature_active1_mean'], expected['temperature_active1_mean'], rtol=1e-9)
+
+    def test_export_csv(self):
+        """Test if the bucket means are written as an 'Average of' table."""
+        self.engine.update('lida1', readings(600))
+        output = os.path.join(self.directory.name, 'means.csv')
+        self.assertEqual(self.engine.export_csv('lida1', '15min', output, columns=['co2']), 2)
+        with open(output, newline='') as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(rows[0], ['time_stamp', 'Average of co2'])
+        self.assertEqual(rows[1][0], '2024-07-01 23:00:00')
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pyarrow as pa
+from telemetryStore import TelemetryStore, encode_column, decode_column, COLUMNS
+
+def readings(start, count, step_ms=3000):
+    times = np.datetime64(start, 'ms') + np.arange(count) * np.timedelta64(step_ms, 'ms')
+    return {
+        'time_stamp': times,
+        'temperature_active1': 40 + np.arange(count) * 0.01,
+        'co2': np.full(count, 400.0),
+        'lid': np.arange(count) % 2
+    }
+
+class TestTelemetryStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = TelemetryStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_fixed_point_round_trip(self):
+        """Test if values survive the fixed-point encoding to its precision, with NaN for missing readings."""
+        encoded = encode_column('temperature_active1', [21.234, -127.0, np.nan, 1000.0])
+        self.assertEqual(encoded.dtype, np.int16)
+        decoded = decode_column('temperature_active1', encoded)
+        np.testing.assert_allclose(decoded[:2], [21.23, -127.0], atol=1e-4)
+        self.assertTrue(np.isnan(decoded[2]))
+        self.assertAlmostEqual(float(decoded[3]), 327.67, places=3)  # Clipped, not wrapped
+
+    def test_rows_are_partitioned_by_day(self):
+        """Test if rows crossing midnight land in one partition per day and come back in order."""
+        columns = readings('2024-07-01T23:59:00', 60)
+        self.assertEqual(self.store.append('lida1', columns), 60)
+        self.assertEqual(self.store.devices(), ['lida1'])
+        np.testing.assert_array_equal(self.store.days('lida1'), np.array(['2024-07-01', '2024-07-02'], dtype='datetime64[D]'))
+        result = self.store.query('lida1')
+        np.testing.assert_array_equal(result['time_stamp'], columns['time_stamp'])
+        np.testing.assert_allclose(result['temperature_active1'], columns['temperature_active1'], atol=1e-4)
+        self.assertTrue(np.all(np.isnan(result['oxygen'])))  # Not given, stored as missing
+
+    def test_range_query(self):
+        """Test if a range query returns exactly the rows with start <= time_stamp < end."""
+        self.store.append('lida1', readings('2024-07-01T00:00:00', 3 * 28800))  # Three days
+        self.store.append('lida2', readings('2024-07-01T00:00:00', 100))
+        result = self.store.query('lida1', '2024-07-02T06:00:00', '2024-07-02T07:00:00', columns=['co2'])
+        self.assertEqual(len(result['time_stamp']), 1200)
+        self.assertEqual(result['time_stamp'][0], np.datetime64('2024-07-02T06:00:00', 'ms'))
+        self.assertEqual(result['time_stamp'][-1], np.datetime64('2024-07-02T06:59:57', 'ms'))
+        self.assertEqual(sorted(result), ['co2', 'time_stamp'])
+        empty = self.store.query('lida1', '2024-08-01', '2024-08-02')
+        self.assertEqual(len(empty['time_stamp']), 0)
+
+    def test_appends_extend_partitions_in_order(self):
+        """Test if later appends extend a day and older rows for that day are rejected."""
+        self.store.append('lida1', readings('2024-07-01T10:00:00', 10))
+        self.store.append('lida1', readings('2024-07-01T11:00:00', 10))
+        self.assertEqual(len(self.store.query('lida1')['time_stamp']), 20)
+        with self.assertRaises(ValueError):
+            self.store.append('lida1', readings('2024-07-01T10:30:00', 1))
+
+    def test_interrupted_append_is_repaired(self):
+        """Test if a column left longer by an interrupted append is cut back on the next append."""
+        self.store.append('lida1', readings('2024-07-01T10:00:00', 10))
+        with open(os.path.join(self.directory.name, 'lida1', '2024-07-01', 'co2.bin'), 'ab') as file:
+            file.write(b'\x01\x00')
+        self.assertEqual(len(self.store.query('lida1')['time_stamp']), 10)
+        self.store.append('lida1', readings('2024-07-01T11:00:00', 5))
+        result = self.store.query('lida1', columns=['co2'])
+        np.testing.assert_array_equal(result['co2'], np.full(15, 400.0))
+
+    def test_append_table(self):
+        """Test if a format_data.py table with several devices is split per device."""
+        times = pa.array(np.datetime64('2024-07-01T10:00:00', 'ms') + np.arange(4) * np.timedelta64(3, 's'))
+        table = pa.table({'time_stamp': times, 'device_id': ['a', 'b', 'a', 'b'], 'methane': [1, 2, 3, 4],
+                          'automation_active': [True, False, True, True], 'lid': ['open', 'close', 'open', 'open']})
+        self.assertEqual(self.store.append_table(table), 4)
+        result = self.store.query('b', columns=['methane', 'automation_active'])
+        np.testing.assert_array_equal(result['methane'], [2, 4])
+        np.testing.assert_array_equal(result['automation_active'], [0, 1])
+        np.testing.assert_array_equal(self.store.query('b', columns=['lid'])['lid'], [0, 1])
+        self.assertEqual(set(COLUMNS) - set(self.store.query('a')), set())
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -1,63 +1,157 @@
-import csv
-from datetime import datetime, timezone, timedelta
-
-# Function to convert timestamp to AEST (Australian Eastern Standard Time)
-def convert_timestamp_to_aest(epoch_time):
-    # Convert epoch time to datetime object
-    dt = datetime.fromtimestamp(epoch_time / 1000, tz=timezone.utc)
-    # Convert to AEST (UTC+10)
-    aest = dt + timedelta(hours=10)
-    return aest.strftime('%Y-%m-%d %H:%M:%S')
-
-# Function to process the input CSV and write to output CSV
-def process_csv(input_file, output_file):
-    with open(input_file, mode='r') as infile, open(output_file, mode='w', newline='') as outfile:
-        reader = csv.DictReader(infile)
-        # Define the output fieldnames
-        fieldnames = [
-            'moisture_active1', 'moisture_active2', 'oxygen', 'lid', 'co2', 'time_stamp',
-            'device_id', 'temperature_curing1', 'temperature_curing2',
-            'moisture_curing1', 'moisture_curing2', 'automation_active',
-            'methane', 'temperature_active1', 'temperature_active2',
-            'temperature_active3', 'temperature_active4'
-        ]
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for row in reader:
-            # Split the list values and map them to the appropriate columns
-            moisture_active = eval(row['moisture_active'])  # Convert string to list
-            temperature_active = eval(row['temperature_active'])  # Convert string to list
-            temperature_curing = eval(row['temperature_curing'])  # Convert string to list
-            moisture_curing = eval(row['moisture_curing'])  # Convert string to list
-
-            # Create a new row with the required format
-            new_row = {
-                'moisture_active1': moisture_active[0],
-                'moisture_active2': moisture_active[1],
-                'oxygen': row['oxygen'],
-                'lid': row['lid'],
-                'co2': row['co2'],
-                'time_stamp': convert_timestamp_to_aest(int(row['time_stamp'])),
-                'device_id': row['device_id'],
-                'temperature_curing1': temperature_curing[0],
-                'temperature_curing2': temperature_curing[1],
-                'moisture_curing1': moisture_curing[0],
-                'moisture_curing2': moisture_curing[1],
-                'automation_active': row['automation_active'],
-                'methane': row['methane'],
-                'temperature_active1': temperature_active[0],
-                'temperature_active2': temperature_active[1],
-                'temperature_active3': temperature_active[2],
-                'temperature_active4': temperature_active[3],
-            }
-
-            # Write the new row to the output CSV
-            writer.writerow(new_row)
-
-# Specify the input and output file paths
-input_file = 'lida_table_exportFull.csv'
-output_file = 'lida_tableCleaned.csv'
-
-# Call the function to process the CSV
-process_csv(input_file, output_file)
+import argparse
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+AEST_OFFSET_MS = 10 * 3600 * 1000  # AEST is UTC+10
+BLOCK_SIZE = 16 << 20  # Bytes of CSV per chunk
+
+# List columns of the AWS IoT export, split into one column per element
+LIST_COLUMNS = {
+    'moisture_active': 2,
+    'temperature_active': 4,
+    'temperature_curing': 2,
+    'moisture_curing': 2
+}
+
+# Types of the other export columns, fixed so a chunk cannot be inferred differently from the first one
+# (a sensor reading 0 for a whole chunk would otherwise be read as integers and a later 0.5 fails)
+COLUMN_TYPES = {
+    'oxygen': pa.float64(),
+    'lid': pa.float64(),
+    'co2': pa.float64(),
+    'time_stamp': pa.int64(),  # Epoch milliseconds
+    'device_id': pa.string(),
+    'automation_active': pa.bool_(),
+    'methane': pa.float64()
+}
+
+# Output columns, in the order of the original cleaned CSV
+FIELDNAMES = [
+    'moisture_active1', 'moisture_active2', 'oxygen', 'lid', 'co2', 'time_stamp',
+    'device_id', 'temperature_curing1', 'temperature_curing2',
+    'moisture_curing1', 'moisture_curing2', 'automation_active',
+    'methane', 'temperature_active1', 'temperature_active2',
+    'temperature_active3', 'temperature_active4'
+]
+
+# Function to convert a column of epoch milliseconds to AEST (Australian Eastern Standard Time) wall-clock timestamps
+def convert_timestamps_to_aest(epoch_ms):
+    epoch_ms = pc.cast(epoch_ms, pa.int64())
+    return pc.cast(pc.add(epoch_ms, AEST_OFFSET_MS), pa.timestamp('ms'))
+
+# Function to split a column of "[a, b, ...]" strings into one float column per element
+def split_list_column(column, name, length):
+    values = pc.split_pattern(pc.utf8_trim(pc.cast(column, pa.string()), '[] '), ',')
+    short = pc.sum(pc.less(pc.list_value_length(values), length)).as_py()
+    if short:
+        raise ValueError(f"{short} rows of '{name}' have fewer than {length} values")
+    return [pc.cast(pc.utf8_trim_whitespace(pc.list_element(values, i)), pa.float64()) for i in range(length)]
+
+# Function to convert one chunk of the export into the cleaned layout, runs in the pool workers
+def convert_batch(batch):
+    table = pa.Table.from_batches([batch])
+    columns = {}
+    for name, length in LIST_COLUMNS.items():
+        for i, values in enumerate(split_list_column(table.column(name), name, length)):
+            columns[f'{name}{i + 1}'] = values
+    for name in FIELDNAMES:
+        if name == 'time_stamp':
+            columns[name] = convert_timestamps_to_aest(table.column(name))
+        elif name not in columns:
+            columns[name] = table.column(name)
+    return pa.table({name: columns[name] for name in FIELDNAMES})
+
+class OutputWriter:
+    """Appends converted chunks to a .parquet, .feather (Arrow IPC) or .csv file."""
+
+    def __init__(self, path):
+        self.path = path
+        self.format = os.path.splitext(path)[1].lower().lstrip('.')
+        if self.format not in ('parquet', 'feather', 'arrow', 'csv'):
+            raise ValueError(f"Unsupported output format '{self.format}', use .parquet, .feather or .csv")
+        self.writer = None
+        self.schema = None
+
+    def write(self, table):
+        if self.format == 'csv':
+            # Keep the time stamps in the text format the MATLAB scripts read
+            table = table.set_column(FIELDNAMES.index('time_stamp'), 'time_stamp',
+                                     pc.strftime(pc.cast(table.column('time_stamp'), pa.timestamp('s'), safe=False), format='%Y-%m-%d %H:%M:%S'))
+        if self.writer is None:
+            # Types inferred from the first chunk are kept for the whole file
+            self.schema = table.schema
+            if self.format == 'parquet':
+                self.writer = pq.ParquetWriter(self.path, self.schema)
+            elif self.format == 'csv':
+                self.writer = pacsv.CSVWriter(self.path, self.schema)
+            else:
+                self.writer = pa.ipc.new_file(self.path, self.schema)
+        self.writer.write_table(table.cast(self.schema))
+
+    def close(self):
+        if self.writer is None:
+            # No rows at all, still leave a readable file with the header
+            self.write(pa.table({name: pa.array([], pa.timestamp('ms') if name == 'time_stamp' else pa.string())
+                                 for name in FIELDNAMES}))
+        self.writer.close()
+
+# Function to stream the input CSV through the pool and write the converted chunks in order
+def process_csv(input_file, output_file=None, workers=None, block_size=BLOCK_SIZE, verbose=True):
+    """
+    Convert an AWS IoT export to the cleaned layout: list columns split into one column per value and
+    epoch time stamps converted to AEST. The CSV is read in chunks of block_size bytes, chunks are converted
+    in a process pool (at most two per worker in flight, so memory stays bounded) and written in order to
+    output_file, by default a .parquet file next to the CSV. Returns the row count, seconds and rows/sec.
+    """
+    if output_file is None:
+        output_file = os.path.splitext(input_file)[0] + '.parquet'
+    workers = workers or os.cpu_count() or 1
+    # List columns stay strings so they can be split, the rest have the fixed COLUMN_TYPES
+    convert_options = pacsv.ConvertOptions(column_types={name: pa.string() for name in LIST_COLUMNS} | COLUMN_TYPES)
+    reader = pacsv.open_csv(input_file, read_options=pacsv.ReadOptions(block_size=block_size), convert_options=convert_options)
+    writer = OutputWriter(output_file)
+
+    start = time.perf_counter()
+    rows = 0
+    with ProcessPoolExecutor(workers) as pool:
+        pending = deque()
+
+        def write_next():
+            nonlocal rows
+            table = pending.popleft().result()
+            writer.write(table)
+            rows += table.num_rows
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"{rows} rows, {rows / elapsed:.0f} rows/sec")
+
+        try:
+            for batch in reader:
+                pending.append(pool.submit(convert_batch, batch))
+                if len(pending) >= 2 * workers:
+                    write_next()
+            while pending:
+                write_next()
+        finally:
+            writer.close()
+
+    seconds = time.perf_counter() - start
+    return {'rows': rows, 'seconds': seconds, 'rows_per_sec': rows / seconds if seconds > 0 else 0.0}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Convert the AWS IoT telemetry export to the cleaned columnar layout')
+    parser.add_argument('input_file', nargs='?', default='lida_table_exportFull.csv')
+    parser.add_argument('output_file', nargs='?', default=None, help='.parquet, .feather or .csv, default a .parquet next to the input')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes, default one per CPU')
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help='Bytes of CSV per chunk')
+    args = parser.parse_args()
+
+    stats = process_csv(args.input_file, args.output_file, args.workers, args.block_size)
+    print(f"Converted {stats['rows']} rows in {stats['seconds']:.1f} s ({stats['rows_per_sec']:.0f} rows/sec)")
@@ -0,0 +1,226 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')  # Headless, figures only go to files
+import matplotlib.dates as mdates
+import matplotlib.pyplot as plt
+import pyarrow as pa
+import pyarrow.compute as pc
+from telemetryStore import TelemetryStore, TIME_COLUMN, read_table
+
+# Columns each figure needs
+PLOT_COLUMNS = [
+    'temperature_active1', 'temperature_active2', 'temperature_active3', 'temperature_active4',
+    'moisture_active1', 'moisture_active2', 'co2', 'methane', 'oxygen'
+]
+
+# Figure kinds: the single-day view of plot_csv_data_day_by_day.m and the
+# "Graphs with gasses and temps" view of plot_all_daybyday.m
+KINDS = ('daybyday', 'gasses')
+PLOT_POINTS = 1000  # Min/max pairs drawn per line, about one per pixel column of a figure
+
+# Function to compute a centered moving mean like MATLAB's movmean(..., 'omitnan'), shrinking the window at
+# the ends. Missing readings are left out of the sums and counts, so a NaN only affects the windows holding
+# it, and a window without any reading is NaN
+def moving_mean(values, window):
+    values = np.asarray(values, dtype=np.float64)
+    before, after = window // 2, (window - 1) // 2
+    present = ~np.isnan(values)
+    sums = np.r_[0.0, np.cumsum(np.where(present, values, 0.0))]
+    counts = np.r_[0, np.cumsum(present)]
+    index = np.arange(len(values))
+    low = np.maximum(index - before, 0)
+    high = np.minimum(index + after + 1, len(values))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[high] - sums[low]) / (counts[high] - counts[low])
+
+# Function to reduce a line to the minimum and maximum of each of points segments, in time order, which
+# draws the same envelope as every 3-second reading at a fraction of the rendering cost
+def decimate(times, values, points=PLOT_POINTS):
+    values = np.asarray(values, dtype=np.float64)
+    if len(values) <= 2 * points:
+        return times, values
+    size = -(-len(values) // points)
+    segments = np.full(points * size, np.nan)
+    segments[:len(values)] = values
+    segments = segments.reshape(points, size)
+    filled = ~np.all(np.isnan(segments), axis=1)
+    lowest = np.where(np.isnan(segments), np.inf, segments).argmin(axis=1)
+    highest = np.where(np.isnan(segments), -np.inf, segments).argmax(axis=1)
+    offsets = np.arange(points) * size
+    keep = np.sort(np.r_[(offsets + lowest)[filled], (offsets + highest)[filled]])
+    return times[keep], values[keep]
+
+
+class FileSource:
+    """
+    Days of a cleaned telemetry file (format_data.py output: .parquet, .feather or .csv).
+
+    The file is read once, sorted by time and cached as an uncompressed Arrow IPC file in cache_dir, with a
+    per-day row index (first and last row of every day). Pool workers memory-map the cache and slice only
+    the day they render, so no process reloads or refilters the whole table.
+    """
+
+    def __init__(self, path, cache_dir, start=None, end=None):
+        table = read_table(path)
+        table = table.select([TIME_COLUMN] + [name for name in PLOT_COLUMNS if name in table.column_names])
+        table = table.take(pc.sort_indices(table, [(TIME_COLUMN, 'ascending')]))
+        times = table.column(TIME_COLUMN).to_numpy().astype('datetime64[ms]')
+        first = 0 if start is None else int(np.searchsorted(times, np.datetime64(start, 'ms')))
+        last = len(times) if end is None else int(np.searchsorted(times, np.datetime64(end, 'ms')))
+        table, times = table.slice(first, max(last - first, 0)), times[first:last]
+
+        self.cache_path = os.path.join(cache_dir, 'daybyday.arrow')
+        with pa.OSFile(self.cache_path, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        days = times.astype('datetime64[D]')
+        self.days, self.starts = np.unique(days, return_index=True)
+        self.stops = np.r_[self.starts[1:], len(days)].astype(np.int64)
+        self.table = None
+
+    def __getstate__(self):
+        # Workers memory-map the cache themselves
+        return {**self.__dict__, 'table': None}
+
+    def load(self, day):
+        if self.table is None:
+            self.table = pa.ipc.open_file(pa.memory_map(self.cache_path)).read_all()
+        i = int(np.searchsorted(self.days, np.datetime64(day, 'D')))
+        part = self.table.slice(self.starts[i], self.stops[i] - self.starts[i])
+        data = {TIME_COLUMN: part.column(TIME_COLUMN).to_numpy().astype('datetime64[ms]')}
+        for name in PLOT_COLUMNS:
+            data[name] = (part.column(name).to_numpy(zero_copy_only=False).astype(np.float64)
+                          if name in part.column_names else np.full(part.num_rows, np.nan))
+        return data
+
+
+class StoreSource:
+    """Days of one device in a TelemetryStore, each loaded with a range query on its own partition."""
+
+    def __init__(self, root, device_id, start=None, end=None):
+        self.root = root
+        self.device_id = device_id
+        days = TelemetryStore(root).days(device_id)
+        if start is not None:
+            days = days[days >= np.datetime64(start, 'D')]
+        if end is not None:
+            days = days[days < np.datetime64(end, 'D')]
+        self.days = days
+
+    def load(self, day):
+        day = np.datetime64(day, 'D')
+        return TelemetryStore(self.root).query(self.device_id, day, day + np.timedelta64(1, 'D'), PLOT_COLUMNS)
+
+
+# Function to draw one decimated line
+def plot_line(axis, times, values, style, **options):
+    axis.plot(*decimate(times, values), style, linewidth=2, **options)
+
+# Function to format the time axis of a subplot as HH:MM, like datetick('x', 'HH:MM')
+def time_axis(axis, day):
+    start = np.datetime64(day, 'ms')
+    axis.set_xlim(start, start + np.timedelta64(1, 'D'))
+    axis.xaxis.set_major_locator(mdates.HourLocator(interval=3))  # Fixed ticks, no automatic locator search
+    axis.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M'))
+    axis.set_xlabel('Time')
+    axis.grid(True)
+
+# Function to draw the plot_csv_data_day_by_day.m view: smoothed average active temperature, methane, oxygen
+def plot_daybyday(figure, data, day):
+    times = data[TIME_COLUMN]
+    average = np.mean([data[f'temperature_active{i}'] for i in range(1, 5)], axis=0)
+    temperature, methane, oxygen = figure.subplots(3, 1)
+    plot_line(temperature, times, moving_mean(average, 5), '-b')
+    temperature.set_title(f'Day: {day}')
+    temperature.set_ylabel('Normalized Avg Temperature (°C)')
+    plot_line(methane, times, data['methane'], '-r')
+    methane.set_ylabel('Methane (ppm)')
+    plot_line(oxygen, times, data['oxygen'], '-g')
+    oxygen.set_ylabel('Oxygen (%)')
+    for axis in (temperature, methane, oxygen):
+        time_axis(axis, day)
+
+# Function to draw the plot_all_daybyday.m view: temperatures, active moisture, CO2 and methane, oxygen
+def plot_gasses(figure, data, day):
+    times = data[TIME_COLUMN]
+    temperature, moisture, gasses, oxygen = figure.subplots(4, 1)
+    for i, color in zip(range(1, 5), 'rbgk'):
+        plot_line(temperature, times, data[f'temperature_active{i}'], f'-{color}', label=f'Temp {i}')
+    temperature.set_title(f'Day: {day}')
+    temperature.set_ylabel('Temperature (°C)')
+    temperature.legend(loc='upper right')  # A fixed corner, 'best' searches every point of every line
+    plot_line(moisture, times, data['moisture_active1'], '-m', label='Moisture 1')
+    plot_line(moisture, times, data['moisture_active2'], '-c', label='Moisture 2')
+    moisture.set_ylabel('Moisture')
+    moisture.legend(loc='upper right')
+    plot_line(gasses, times, data['co2'], '-r', label='CO2')
+    plot_line(gasses, times, data['methane'], '-b', label='Methane')
+    gasses.set_ylabel('CO2 / Methane')
+    gasses.legend(loc='upper right')
+    plot_line(oxygen, times, data['oxygen'], '-g')
+    oxygen.set_ylabel('Oxygen (%)')
+    for axis in (temperature, moisture, gasses, oxygen):
+        time_axis(axis, day)
+
+# Function to render one day to output_dir/<kind>/<YYYY-MM-DD>.png, runs in the pool workers
+def render_day(source, day, kinds, output_dir, dpi=100):
+    data = source.load(day)
+    day = str(np.datetime64(day, 'D'))
+    paths = []
+    for kind in kinds:
+        # Constrained layout is solved while saving, tight_layout() would draw the figure twice
+        figure = plt.figure(figsize=(10, 10 if kind == 'gasses' else 8), layout='constrained')
+        if kind == 'gasses':
+            plot_gasses(figure, data, day)
+        else:
+            plot_daybyday(figure, data, day)
+        path = os.path.join(output_dir, kind, f'{day}.png')
+        figure.savefig(path, dpi=dpi)
+        plt.close(figure)
+        paths.append(path)
+    return paths
+
+# Function to render every day of a source across a process pool
+def render_all(source, output_dir, kinds=KINDS, workers=None, dpi=100, verbose=True):
+    """Render each day of source for every figure kind to PNG. Returns the written paths, in day order."""
+    for kind in kinds:
+        os.makedirs(os.path.join(output_dir, kind), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(render_day, source, day, kinds, output_dir, dpi) for day in source.days]
+        paths = [path for future in futures for path in future.result()]
+    if verbose:
+        seconds = time.perf_counter() - start
+        print(f"Rendered {len(source.days)} days ({len(paths)} figures) in {seconds:.1f} s "
+              f"({len(paths) / seconds if seconds > 0 else 0:.1f} figures/sec)")
+    return paths
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render day-by-day temperature and gas figures to PNG')
+    parser.add_argument('input_file', nargs='?', default=None, help='format_data.py output (.parquet, .feather or .csv)')
+    parser.add_argument('--store', default=None, help='Read from a TelemetryStore directory instead of a file')
+    parser.add_argument('--device', default=None, help='Device to plot from the store')
+    parser.add_argument('--output', default='Graphs with gasses and temps')
+    parser.add_argument('--kind', choices=KINDS, action='append', default=None, help='Figures to render, default both')
+    parser.add_argument('--start', default=None, help='First day, e.g. 2024-06-28')
+    parser.add_argument('--end', default=None, help='Day after the last one, e.g. 2024-07-19')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes, default one per CPU')
+    parser.add_argument('--dpi', type=int, default=100)
+    args = parser.parse_args()
+
+    if args.store is not None:
+        if args.device is None:
+            parser.error('--store needs --device')
+        render_all(StoreSource(args.store, args.device, args.start, args.end), args.output, args.kind or KINDS, args.workers, args.dpi)
+    elif args.input_file is not None:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            source = FileSource(args.input_file, cache_dir, args.start, args.end)
+            render_all(source, args.output, args.kind or KINDS, args.workers, args.dpi)
+    else:
+        parser.error('Give an input file or --store and --device')
@@ -0,0 +1,237 @@
+import argparse
+import json
+import math
+import queue
+import threading
+import time
+import numpy as np
+from telemetryStore import TelemetryStore, COLUMNS, LID_STATES, TIME_COLUMN
+
+try:
+    import paho.mqtt.client as mqtt
+except ImportError:  # Only the live MQTT connection needs paho, the ingester itself can be fed directly
+    mqtt = None
+
+TOPIC = 'device/+/data'  # publishDataTask publishes to device/<DEVICE_ID>/data
+AEST_OFFSET_MS = 10 * 3600 * 1000  # Receive times are stored in AEST like format_data.py output
+BATCH_SIZE = 1024  # Rows per store append
+FLUSH_SECONDS = 1.0  # Longest time a row waits in a partial batch
+QUEUE_SIZE = 65536  # Messages buffered before the MQTT network loop is held back
+PUT_TIMEOUT = 5.0  # Seconds a full queue may hold the network loop before messages are dropped
+
+# Payload path of every stored column, as built by publishDataTask in sketch_oct10b.ino
+PAYLOAD_FIELDS = [
+    ('temperature_active1', ('temperature', 'active_phase', 0)),
+    ('temperature_active2', ('temperature', 'active_phase', 1)),
+    ('temperature_active3', ('temperature', 'active_phase', 2)),
+    ('temperature_active4', ('temperature', 'active_phase', 3)),
+    ('temperature_curing1', ('temperature', 'curing_phase', 0)),
+    ('temperature_curing2', ('temperature', 'curing_phase', 1)),
+    ('moisture_active1', ('moisture', 'active_phase', 0)),
+    ('moisture_active2', ('moisture', 'active_phase', 1)),
+    ('moisture_curing1', ('moisture', 'curing_phase', 0)),
+    ('moisture_curing2', ('moisture', 'curing_phase', 1)),
+    ('oxygen', ('oxygen',)),
+    ('co2', ('co2',)),
+    ('methane', ('methane',)),
+    ('lid', ('lid',)),
+    ('automation_active', ('automation_active',))
+]
+FIELD_NAMES = [name for name, _ in PAYLOAD_FIELDS]
+
+# Function to read one reading from the nested payload, NaN when it is missing or not a number
+def payload_value(payload, path):
+    value = payload
+    for key in path:
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return math.nan
+    if isinstance(value, str):
+        return LID_STATES.get(value.lower(), math.nan)
+    if isinstance(value, (bool, int, float)):
+        return float(value)
+    return math.nan
+
+# Function to flatten a device/<id>/data payload into the format_data.py columns, in FIELD_NAMES order
+def flatten_payload(payload):
+    if isinstance(payload, (bytes, bytearray, str)):
+        payload = json.loads(payload)
+    if not isinstance(payload, dict):
+        raise ValueError('Telemetry payload is not a JSON object')
+    return tuple(payload_value(payload, path) for _, path in PAYLOAD_FIELDS)
+
+# Function to read the device id from a device/<id>/data topic
+def device_from_topic(topic):
+    parts = topic.split('/')
+    if len(parts) != 3 or parts[0] != 'device' or parts[2] != 'data' or not parts[1]:
+        raise ValueError(f"Not a telemetry topic: {topic}")
+    return parts[1]
+
+# Function to stamp a message with its receive time, the payload carries none
+def receive_time_ms():
+    return int(time.time() * 1000) + AEST_OFFSET_MS
+
+
+class TelemetryIngest:
+    """
+    Live ingestion of device telemetry into a TelemetryStore.
+
+    on_message() (the paho callback) or submit() puts (device, receive time, raw payload) on a bounded
+    queue and returns; a writer thread drains it, parses the JSON, flattens it into the store columns and
+    appends batches of up to batch_size rows, or whatever arrived within flush_seconds. When the writer
+    falls behind the queue fills and submit() blocks, which holds back the MQTT network loop and with it
+    the broker (QoS 1), instead of growing memory; a message still waiting after put_timeout is dropped
+    and counted. Rows carry the receive time in AEST, kept non-decreasing per device.
+    """
+
+    def __init__(self, store, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS, queue_size=QUEUE_SIZE,
+                 put_timeout=PUT_TIMEOUT):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.put_timeout = put_timeout
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.last_time = {}  # Device -> newest stored receive time
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.counts = {'received': 0, 'dropped': 0, 'malformed': 0, 'written': 0, 'batches': 0, 'errors': 0}
+        self.last_error = None
+
+    def start(self):
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self.write_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        """Write every queued message, then stop the writer thread."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def submit(self, topic, payload, received=None):
+        """Queue one message, blocking while the queue is full. Returns False if it was dropped."""
+        self.counts['received'] += 1
+        try:
+            self.queue.put((topic, received if received is not None else receive_time_ms(), payload),
+                           timeout=self.put_timeout)
+            return True
+        except queue.Full:
+            self.counts['dropped'] += 1
+            return False
+
+    def on_message(self, client, userdata, message):
+        self.submit(message.topic, message.payload)
+
+    def on_connect(self, client, userdata, flags, reason_code, properties=None):
+        # Subscribe on every (re)connect, a clean session forgets subscriptions
+        client.subscribe(TOPIC, qos=1)
+
+    def next_batch(self):
+        """Up to batch_size messages, waiting at most flush_seconds after the first one."""
+        try:
+            batch = [self.queue.get(timeout=self.flush_seconds)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                if time.monotonic() >= deadline or self.stop_event.is_set():
+                    break
+                time.sleep(0.001)
+        return batch
+
+    def write_loop(self):
+        while not (self.stop_event.is_set() and self.queue.empty()):
+            batch = self.next_batch()
+            if batch:
+                self.write_batch(batch)
+
+    def write_batch(self, batch):
+        # 1. Parse and group by device, in arrival order
+        devices = {}
+        for topic, received, payload in batch:
+            try:
+                row = flatten_payload(payload)
+                device_id = device_from_topic(topic)
+            except ValueError:  # Includes JSON decode errors
+                self.counts['malformed'] += 1
+                continue
+            times, rows = devices.setdefault(device_id, ([], []))
+            times.append(received)
+            rows.append(row)
+
+        # 2. Append each device's rows as one batch of columns
+        for device_id, (times, rows) in devices.items():
+            times = np.maximum.accumulate(np.maximum(np.array(times, dtype=np.int64), self.last_time.get(device_id, 0)))
+            values = np.array(rows, dtype=np.float64)
+            columns = {TIME_COLUMN: times, **{name: values[:, i] for i, name in enumerate(FIELD_NAMES) if name in COLUMNS}}
+            try:
+                self.store.append(device_id, columns)
+            except (OSError, ValueError) as error:  # Keep ingesting other devices and later batches
+                self.counts['errors'] += 1
+                self.last_error = error
+                continue
+            self.last_time[device_id] = int(times[-1])
+            self.counts['written'] += len(times)
+            self.counts['batches'] += 1
+
+    def stats(self):
+        return {**self.counts, 'queued': self.queue.qsize()}
+
+
+# Function to create a paho client feeding an ingester, with TLS certificates for AWS IoT when given
+def make_client(ingest, client_id='', ca_certs=None, certfile=None, keyfile=None):
+    if mqtt is None:
+        raise ImportError("Connecting to an MQTT broker requires paho-mqtt")
+    client = mqtt.Client(mqtt.CallbackAPIVersion.VERSION2, client_id=client_id)
+    if ca_certs is not None:
+        client.tls_set(ca_certs=ca_certs, certfile=certfile, keyfile=keyfile)
+    client.on_connect = ingest.on_connect
+    client.on_message = ingest.on_message
+    return client
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ingest live device telemetry from MQTT into the telemetry store')
+    parser.add_argument('--host', default='localhost', help='Broker, e.g. the AWS IoT endpoint')
+    parser.add_argument('--port', type=int, default=1883, help='8883 for AWS IoT')
+    parser.add_argument('--client-id', default='lida-telemetry-ingest')
+    parser.add_argument('--ca-certs', default=None, help='e.g. AmazonRootCA1.pem, enables TLS')
+    parser.add_argument('--certfile', default=None)
+    parser.add_argument('--keyfile', default=None)
+    parser.add_argument('--store', default='telemetry_store', help='TelemetryStore directory')
+    parser.add_argument('--rollups', default=None, help='Also keep rollups up to date in this directory')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+    parser.add_argument('--queue-size', type=int, default=QUEUE_SIZE)
+    parser.add_argument('--stats-seconds', type=float, default=60, help='Seconds between progress lines')
+    args = parser.parse_args()
+
+    rollups = None
+    if args.rollups is not None:
+        from telemetryRollup import RollupEngine
+        rollups = RollupEngine(args.rollups)
+    ingest = TelemetryIngest(TelemetryStore(args.store, rollups=rollups), args.batch_size, queue_size=args.queue_size)
+    client = make_client(ingest, args.client_id, args.ca_certs, args.certfile, args.keyfile)
+    with ingest:
+        client.connect(args.host, args.port, keepalive=60)
+        client.loop_start()
+        try:
+            while True:
+                time.sleep(args.stats_seconds)
+                print(', '.join(f'{key} {value}' for key, value in ingest.stats().items()))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            client.loop_stop()
+            client.disconnect()
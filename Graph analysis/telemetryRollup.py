@@ -0,0 +1,215 @@
+import argparse
+import csv
+import os
+import shutil
+import numpy as np
+from telemetryStore import TelemetryStore, COLUMNS, TIME_COLUMN, to_ms
+
+# Rollup resolutions and their bucket width in milliseconds, buckets start at multiples of the width
+# (AEST wall clock, so daily buckets are AEST days)
+RESOLUTIONS = {
+    '1min': 60 * 1000,
+    '15min': 15 * 60 * 1000,
+    'hourly': 3600 * 1000,
+    'daily': 24 * 3600 * 1000
+}
+
+# Partial aggregate files kept per column, mergeable across updates: (suffix, dtype)
+STATISTICS = (('sum', '<f8'), ('count', '<i4'), ('min', '<f4'), ('max', '<f4'))
+BUCKET_DTYPE = np.dtype('<i8')
+
+# Function to aggregate time-sorted rows into buckets of width milliseconds
+def aggregate(times, values, width):
+    """
+    Returns the bucket starts and, per column, (sum, count, min, max) over the readings that are not NaN.
+    Buckets without readings of a column get count 0 and NaN min and max.
+    """
+    buckets = times // width * width
+    starts = np.r_[0, np.flatnonzero(np.diff(buckets)) + 1]
+    aggregates = {}
+    for name, column in values.items():
+        present = ~np.isnan(column)
+        aggregates[name] = (
+            np.add.reduceat(np.where(present, column, 0.0), starts),
+            np.add.reduceat(present.astype(np.int32), starts),
+            np.fmin.reduceat(column, starts).astype(np.float32),  # fmin/fmax skip NaN
+            np.fmax.reduceat(column, starts).astype(np.float32)
+        )
+    return buckets[starts], aggregates
+
+
+class RollupEngine:
+    """
+    Materialized mean/min/max/count rollups of every COLUMNS sensor at the RESOLUTIONS.
+
+    Each device and resolution has a directory root/<resolution>/<device_id> holding bucket.bin (int64
+    bucket start, AEST milliseconds, sorted) and per column the mergeable partials <column>_sum/_count/
+    _min/_max.bin. update() aggregates only the new rows and merges them in: buckets that already exist
+    (usually just the newest, partly filled one) are combined in place through a memory map and later
+    buckets are appended, so maintaining the rollups never rescans raw data. Rows for older, missing
+    buckets are merged by rewriting that device's files.
+    """
+
+    def __init__(self, root, resolutions=None):
+        self.root = root
+        self.resolutions = {name: RESOLUTIONS[name] for name in (resolutions or RESOLUTIONS)}
+        os.makedirs(root, exist_ok=True)
+
+    def path(self, resolution, device_id):
+        return os.path.join(self.root, resolution, str(device_id))
+
+    def files(self, path):
+        """(file, dtype) of every column file of a rollup directory, the bucket file first."""
+        files = [(os.path.join(path, 'bucket.bin'), BUCKET_DTYPE)]
+        for name in COLUMNS:
+            files += [(os.path.join(path, f'{name}_{suffix}.bin'), np.dtype(dtype)) for suffix, dtype in STATISTICS]
+        return files
+
+    def rows(self, path):
+        """Complete buckets of a rollup directory, a bucket interrupted mid-append is ignored."""
+        counts = [os.path.getsize(file) // dtype.itemsize if os.path.exists(file) else 0 for file, dtype in self.files(path)]
+        return min(counts)
+
+    def update(self, device_id, columns):
+        """
+        Merge new rows of a device into every resolution. columns is laid out as for TelemetryStore.append:
+        time_stamp (datetime64 or AEST milliseconds) and any COLUMNS names, missing readings as NaN.
+        """
+        times = np.asarray(columns[TIME_COLUMN])
+        times = times.astype('datetime64[ms]').astype(np.int64) if times.dtype.kind == 'M' else times.astype(np.int64)
+        if len(times) == 0:
+            return
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        values = {name: np.full(len(times), np.nan) if columns.get(name) is None
+                  else np.asarray(columns[name], dtype=np.float64)[order] for name in COLUMNS}
+        for resolution, width in self.resolutions.items():
+            buckets, aggregates = aggregate(times, values, width)
+            self.merge(self.path(resolution, device_id), buckets, aggregates)
+
+    def merge(self, path, buckets, aggregates):
+        os.makedirs(path, exist_ok=True)
+        rows = self.rows(path)
+        found = np.zeros(len(buckets), dtype=bool)
+        if rows:
+            stored = np.memmap(os.path.join(path, 'bucket.bin'), dtype=BUCKET_DTYPE, mode='r', shape=(rows,))
+            positions = np.searchsorted(stored, buckets)
+            found = (positions < rows) & (stored[np.minimum(positions, rows - 1)] == buckets)
+            if found.any():
+                self.combine(path, rows, positions[found], {name: tuple(part[found] for part in parts)
+                                                            for name, parts in aggregates.items()})
+            if (~found).any() and buckets[~found][0] < stored[-1]:
+                del stored
+                self.rewrite(path, rows, buckets[~found], {name: tuple(part[~found] for part in parts)
+                                                           for name, parts in aggregates.items()})
+                return
+            del stored
+        new = ~found
+        if new.any():
+            self.append(path, rows, [buckets[new]] + [part[new] for name in COLUMNS for part in aggregates[name]])
+
+    def combine(self, path, rows, positions, aggregates):
+        # Merge partials into existing buckets, in place
+        for name in COLUMNS:
+            for (suffix, dtype), part in zip(STATISTICS, aggregates[name]):
+                stored = np.memmap(os.path.join(path, f'{name}_{suffix}.bin'), dtype=dtype, mode='r+', shape=(rows,))
+                if suffix in ('sum', 'count'):
+                    stored[positions] += part
+                elif suffix == 'min':
+                    stored[positions] = np.fmin(stored[positions], part)
+                else:
+                    stored[positions] = np.fmax(stored[positions], part)
+                stored.flush()
+
+    def append(self, path, rows, arrays):
+        # Cut back a bucket left incomplete by an interrupted append, then extend every file
+        for (file, dtype), values in zip(self.files(path), arrays):
+            with open(file, 'ab') as handle:
+                handle.truncate(rows * dtype.itemsize)
+                handle.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+    def rewrite(self, path, rows, buckets, aggregates):
+        # New buckets before the newest stored one: merge-sort them in and replace every file
+        arrays = [np.fromfile(file, dtype=dtype, count=rows) for file, dtype in self.files(path)]
+        new = [buckets] + [part for name in COLUMNS for part in aggregates[name]]
+        order = np.argsort(np.concatenate([arrays[0], buckets]), kind='stable')
+        for (file, dtype), stored, values in zip(self.files(path), arrays, new):
+            merged = np.concatenate([stored, np.asarray(values, dtype=dtype)])[order]
+            merged.tofile(f'{file}.tmp')
+            os.replace(f'{file}.tmp', file)
+
+    def query(self, device_id, resolution, start=None, end=None, columns=None):
+        """
+        Buckets of a device with start <= bucket start < end (AEST datetime-likes, None for open ends).
+        Returns time_stamp (bucket starts, datetime64[ms]) and <column>_mean/_min/_max/_count for the
+        requested COLUMNS (default all); mean, min and max are NaN for buckets without readings.
+        """
+        columns = list(COLUMNS) if columns is None else list(columns)
+        path = self.path(resolution, device_id)
+        rows = self.rows(path) if os.path.isdir(path) else 0
+        result = {TIME_COLUMN: np.array([], dtype='datetime64[ms]')}
+        for name in columns:
+            result.update({f'{name}_mean': np.array([], dtype=np.float64), f'{name}_min': np.array([], dtype=np.float32),
+                           f'{name}_max': np.array([], dtype=np.float32), f'{name}_count': np.array([], dtype=np.int32)})
+        if rows == 0:
+            return result
+
+        buckets = np.memmap(os.path.join(path, 'bucket.bin'), dtype=BUCKET_DTYPE, mode='r', shape=(rows,))
+        low = 0 if start is None else int(np.searchsorted(buckets, to_ms(start)))
+        high = rows if end is None else int(np.searchsorted(buckets, to_ms(end)))
+        result[TIME_COLUMN] = np.array(buckets[low:high]).astype('datetime64[ms]')
+        for name in columns:
+            parts = {suffix: np.array(np.memmap(os.path.join(path, f'{name}_{suffix}.bin'), dtype=dtype, mode='r',
+                                                shape=(rows,))[low:high]) for suffix, dtype in STATISTICS}
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result[f'{name}_mean'] = np.where(parts['count'] > 0, parts['sum'] / parts['count'], np.nan)
+            result[f'{name}_min'] = parts['min']
+            result[f'{name}_max'] = parts['max']
+            result[f'{name}_count'] = parts['count']
+        return result
+
+    def rebuild(self, store, device_id):
+        """Drop a device's rollups and recompute them from a TelemetryStore, one day at a time."""
+        for resolution in self.resolutions:
+            shutil.rmtree(self.path(resolution, device_id), ignore_errors=True)
+        for day in store.days(device_id):
+            self.update(device_id, store.query(device_id, day, day + np.timedelta64(1, 'D')))
+
+    def export_csv(self, device_id, resolution, path, start=None, end=None, columns=None):
+        """Write the bucket means of a device as a CSV, one row per bucket (the 'Average of ...' tables)."""
+        columns = list(COLUMNS) if columns is None else list(columns)
+        result = self.query(device_id, resolution, start, end, columns)
+        with open(path, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow([TIME_COLUMN] + [f'Average of {name}' for name in columns])
+            times = result[TIME_COLUMN].astype('datetime64[s]').astype(str)
+            for i, time_stamp in enumerate(times):
+                writer.writerow([time_stamp.replace('T', ' ')] + [f'{result[f"{name}_mean"][i]:.2f}' for name in columns])
+        return len(times)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rollups of the telemetry store at 1-minute, 15-minute, hourly and daily resolution')
+    parser.add_argument('--store', default='telemetry_store', help='TelemetryStore directory')
+    parser.add_argument('--root', default='telemetry_rollups', help='Rollup directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    rebuild = commands.add_parser('rebuild', help='Recompute the rollups of devices from the store')
+    rebuild.add_argument('device_id', nargs='*', help='Devices, default every device in the store')
+    export = commands.add_parser('export', help='Write the bucket means of a device as CSV')
+    export.add_argument('device_id')
+    export.add_argument('resolution', choices=list(RESOLUTIONS))
+    export.add_argument('output')
+    export.add_argument('--start', default=None)
+    export.add_argument('--end', default=None)
+    export.add_argument('--columns', nargs='*', default=None)
+    args = parser.parse_args()
+
+    engine = RollupEngine(args.root)
+    if args.command == 'rebuild':
+        store = TelemetryStore(args.store)
+        for device_id in args.device_id or store.devices():
+            engine.rebuild(store, device_id)
+            print(f"Rebuilt rollups of {device_id}")
+    else:
+        rows = engine.export_csv(args.device_id, args.resolution, args.output, args.start, args.end, args.columns)
+        print(f"Wrote {rows} {args.resolution} buckets to {args.output}")
@@ -0,0 +1,264 @@
+import argparse
+import os
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pacsv
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # Only importing format_data.py output needs pyarrow, the store itself is NumPy
+    pa = None
+
+DAY_MS = 24 * 3600 * 1000
+TIME_COLUMN = 'time_stamp'  # AEST wall-clock milliseconds since the epoch, as written by format_data.py
+TIME_DTYPE = np.dtype('<i4')  # Stored as milliseconds since the start of the partition's day
+
+# Encoding of each column on disk: (dtype, scale). Stored value = round(value * scale), the smallest value of
+# a signed dtype marks a missing reading. Temperatures and oxygen keep two decimals, the gas and moisture
+# readings are integers on the device and the flags are 0/1.
+COLUMNS = {
+    'temperature_active1': ('<i2', 100),
+    'temperature_active2': ('<i2', 100),
+    'temperature_active3': ('<i2', 100),
+    'temperature_active4': ('<i2', 100),
+    'temperature_curing1': ('<i2', 100),
+    'temperature_curing2': ('<i2', 100),
+    'moisture_active1': ('<i2', 1),
+    'moisture_active2': ('<i2', 1),
+    'moisture_curing1': ('<i2', 1),
+    'moisture_curing2': ('<i2', 1),
+    'oxygen': ('<i2', 100),
+    'co2': ('<i2', 1),
+    'methane': ('<i2', 1),
+    'lid': ('u1', 1),
+    'automation_active': ('u1', 1)
+}
+
+# The firmware reports the lid as a string, stored as 1 (open) or 0 (closed)
+LID_STATES = {'open': 1.0, 'close': 0.0, 'closed': 0.0}
+
+# Function to encode decoded values (floats, NaN for missing) into a column's stored integers
+def encode_column(name, values):
+    dtype, scale = COLUMNS[name]
+    dtype = np.dtype(dtype)
+    info = np.iinfo(dtype)
+    values = np.asarray(values, dtype=np.float64) * scale
+    missing = np.isnan(values)
+    low = info.min + 1 if info.min < 0 else info.min  # Keep the smallest signed value free for missing readings
+    encoded = np.clip(np.rint(np.where(missing, 0, values)), low, info.max).astype(dtype)
+    if info.min < 0:
+        encoded[missing] = info.min
+    return encoded
+
+# Function to decode a column's stored integers back to float32 values, NaN for missing
+def decode_column(name, encoded):
+    dtype, scale = COLUMNS[name]
+    values = encoded.astype(np.float32)
+    if scale != 1:
+        values /= scale
+    if np.dtype(dtype).kind == 'i':
+        values[encoded == np.iinfo(dtype).min] = np.nan
+    return values
+
+# Function to convert a datetime-like bound to AEST wall-clock milliseconds
+def to_ms(value):
+    if value is None:
+        return None
+    return int(np.datetime64(value, 'ms').astype(np.int64))
+
+def day_name(day):
+    return str(np.datetime64(int(day), 'D'))
+
+
+class TelemetryStore:
+    """
+    Append-only telemetry store partitioned by device and day.
+
+    Every partition is a directory root/<device_id>/<YYYY-MM-DD> holding one raw little-endian file per
+    column: time_stamp.bin (int32 milliseconds into the AEST day) and the COLUMNS files, fixed-point encoded
+    to keep the fleet's history small (2 bytes per sensor reading instead of 8). Rows within a partition are kept in time
+    order, so a range query memory-maps only the partitions its days touch and binary searches the time
+    column for the rows it needs.
+
+    rollups (a telemetryRollup.RollupEngine) is updated with every appended batch, as stored.
+    """
+
+    def __init__(self, root, rollups=None):
+        self.root = root
+        self.rollups = rollups
+        os.makedirs(root, exist_ok=True)
+
+    def partition_path(self, device_id, day):
+        return os.path.join(self.root, str(device_id), day_name(day))
+
+    def devices(self):
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+
+    def days(self, device_id):
+        """Days stored for a device, as datetime64[D] values."""
+        directory = os.path.join(self.root, str(device_id))
+        if not os.path.isdir(directory):
+            return np.array([], dtype='datetime64[D]')
+        return np.array(sorted(os.listdir(directory)), dtype='datetime64[D]')
+
+    def partition_rows(self, path):
+        """Complete rows of a partition, a row interrupted mid-append is ignored."""
+        time_file = os.path.join(path, f'{TIME_COLUMN}.bin')
+        if not os.path.exists(time_file):
+            return 0
+        counts = [os.path.getsize(time_file) // TIME_DTYPE.itemsize]
+        for name, (dtype, _) in COLUMNS.items():
+            file = os.path.join(path, f'{name}.bin')
+            counts.append(os.path.getsize(file) // np.dtype(dtype).itemsize if os.path.exists(file) else 0)
+        return min(counts)
+
+    def last_time(self, path):
+        """Milliseconds into the day of a partition's newest row, None when it is empty."""
+        rows = self.partition_rows(path)
+        if rows == 0:
+            return None
+        with open(os.path.join(path, f'{TIME_COLUMN}.bin'), 'rb') as file:
+            file.seek((rows - 1) * TIME_DTYPE.itemsize)
+            return int(np.frombuffer(file.read(TIME_DTYPE.itemsize), dtype=TIME_DTYPE)[0])
+
+    def append(self, device_id, columns):
+        """
+        Append rows of one device. columns maps time_stamp (datetime64 or AEST milliseconds) and any of the
+        COLUMNS names to equal-length arrays, columns left out are stored as missing. Rows may arrive in any
+        order within a call, but must not be older than rows already stored in the same day. Returns the
+        number of rows appended.
+        """
+        times = np.asarray(columns[TIME_COLUMN])
+        times = times.astype('datetime64[ms]').astype(np.int64) if times.dtype.kind == 'M' else times.astype(np.int64)
+        if len(times) == 0:
+            return 0
+        order = np.argsort(times, kind='stable')
+        times = times[order]
+        encoded = {}
+        for name in COLUMNS:
+            values = columns.get(name)
+            values = np.full(len(times), np.nan) if values is None else np.asarray(values, dtype=np.float64)[order]
+            encoded[name] = encode_column(name, values)
+
+        # Split the sorted rows at day boundaries and append each run to its partition
+        days = times // DAY_MS
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(times)]):
+            path = self.partition_path(device_id, days[start])
+            os.makedirs(path, exist_ok=True)
+            offsets = times[start:stop] - days[start] * DAY_MS
+            last = self.last_time(path)
+            if last is not None and offsets[0] < last:
+                raise ValueError(f"Rows for {device_id} on {day_name(days[start])} are older than the stored ones")
+            self.write_rows(path, offsets, {name: values[start:stop] for name, values in encoded.items()})
+        if self.rollups is not None:
+            self.rollups.update(device_id, {TIME_COLUMN: times, **{name: decode_column(name, values) for name, values in encoded.items()}})
+        return len(times)
+
+    def write_rows(self, path, offsets, encoded):
+        # Cut back a row left incomplete by an interrupted append, then extend every column file
+        rows = self.partition_rows(path)
+        for name, values in [(TIME_COLUMN, offsets.astype(TIME_DTYPE))] + list(encoded.items()):
+            file = os.path.join(path, f'{name}.bin')
+            with open(file, 'ab') as handle:
+                handle.truncate(rows * values.dtype.itemsize)
+                handle.write(values.tobytes())
+
+    def append_table(self, table):
+        """Append a table in the format_data.py layout (pyarrow Table, one or more devices). Returns rows appended."""
+        if pa is None:
+            raise ImportError("Appending a pyarrow table requires pyarrow")
+        rows = 0
+        for device_id in pc.unique(table.column('device_id')).to_pylist():
+            part = table.filter(pc.equal(table.column('device_id'), device_id))
+            columns = {name: part.column(name).to_numpy(zero_copy_only=False)
+                       for name in [TIME_COLUMN, *COLUMNS] if name in part.column_names}
+            if 'lid' in columns and columns['lid'].dtype == object:
+                columns['lid'] = np.array([LID_STATES.get(str(state).lower(), np.nan) for state in columns['lid']])
+            rows += self.append(device_id, columns)
+        return rows
+
+    def query(self, device_id, start=None, end=None, columns=None):
+        """
+        Rows of a device with start <= time_stamp < end (datetime-likes in AEST, None for open ends).
+        Returns a dictionary of NumPy arrays: time_stamp as datetime64[ms] and the requested COLUMNS
+        (default all) decoded to float32, NaN for missing readings.
+        """
+        columns = list(COLUMNS) if columns is None else list(columns)
+        start_ms, end_ms = to_ms(start), to_ms(end)
+        days = self.days(device_id).astype(np.int64)
+        if start_ms is not None:
+            days = days[days >= start_ms // DAY_MS]
+        if end_ms is not None:
+            days = days[days <= (end_ms - 1) // DAY_MS]
+
+        parts = {name: [] for name in [TIME_COLUMN, *columns]}
+        for day in days:
+            path = self.partition_path(device_id, day)
+            rows = self.partition_rows(path)
+            if rows == 0:
+                continue
+            offsets = np.memmap(os.path.join(path, f'{TIME_COLUMN}.bin'), dtype=TIME_DTYPE, mode='r', shape=(rows,))
+            day_start = int(day) * DAY_MS
+            low = 0 if start_ms is None or start_ms <= day_start else int(np.searchsorted(offsets, start_ms - day_start))
+            high = rows if end_ms is None or end_ms >= day_start + DAY_MS else int(np.searchsorted(offsets, end_ms - day_start))
+            if low >= high:
+                continue
+            parts[TIME_COLUMN].append(offsets[low:high] + np.int64(day_start))
+            for name in columns:
+                encoded = np.memmap(os.path.join(path, f'{name}.bin'), dtype=COLUMNS[name][0], mode='r', shape=(rows,))
+                parts[name].append(decode_column(name, encoded[low:high]))
+
+        result = {TIME_COLUMN: np.concatenate(parts[TIME_COLUMN]).astype('datetime64[ms]') if parts[TIME_COLUMN]
+                  else np.array([], dtype='datetime64[ms]')}
+        for name in columns:
+            result[name] = np.concatenate(parts[name]) if parts[name] else np.array([], dtype=np.float32)
+        return result
+
+    def disk_usage(self):
+        """Bytes used by all partitions."""
+        total = 0
+        for directory, _, files in os.walk(self.root):
+            total += sum(os.path.getsize(os.path.join(directory, file)) for file in files)
+        return total
+
+
+# Function to read a format_data.py output file (.parquet, .feather or .csv) as a pyarrow Table
+def read_table(path):
+    if pa is None:
+        raise ImportError("Reading format_data.py output requires pyarrow")
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.parquet':
+        return pq.read_table(path)
+    if extension in ('.feather', '.arrow'):
+        return feather.read_table(path)
+    options = pacsv.ConvertOptions(column_types={TIME_COLUMN: pa.timestamp('ms'), 'device_id': pa.string()},
+                                   timestamp_parsers=['%Y-%m-%d %H:%M:%S'])
+    return pacsv.read_csv(path, convert_options=options)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Day-partitioned columnar telemetry store')
+    parser.add_argument('--root', default='telemetry_store', help='Store directory')
+    commands = parser.add_subparsers(dest='command', required=True)
+    importer = commands.add_parser('import', help='Append a format_data.py output file')
+    importer.add_argument('path')
+    query = commands.add_parser('query', help='Print summary statistics of a time range')
+    query.add_argument('device_id')
+    query.add_argument('--start', default=None, help='AEST, e.g. 2024-07-01 or 2024-07-01T06:00')
+    query.add_argument('--end', default=None)
+    args = parser.parse_args()
+
+    store = TelemetryStore(args.root)
+    if args.command == 'import':
+        rows = store.append_table(read_table(args.path))
+        print(f"Appended {rows} rows, store uses {store.disk_usage() / 1e6:.1f} MB")
+    else:
+        result = store.query(args.device_id, args.start, args.end)
+        print(f"{len(result[TIME_COLUMN])} rows")
+        for name in COLUMNS:
+            values = result[name]
+            if len(values) and not np.all(np.isnan(values)):
+                print(f"{name}: mean {np.nanmean(values):.2f}, min {np.nanmin(values):.2f}, max {np.nanmax(values):.2f}")
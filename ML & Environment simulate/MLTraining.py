@@ -1,10 +1,17 @@
+import argparse
+import json
 import numpy as np
 import random
+import time
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from collections import deque
-from lidaEnvironment import CompostingEnv
+from lidaEnvironment import CompostingEnv, array_to_action
+from replayBuffer import PrioritizedReplayBuffer
+from subprocVectorEnv import SubprocVectorEnv
+from actionCodec import ActionCodec
+from trainingCheckpoint import AsyncCheckpointer, load_checkpoint, snapshot_module
+from trainingTelemetry import TrainingTelemetry
 
 # Define the DQN model
 class DQN(nn.Module):
@@ -19,7 +26,45 @@ class DQN(nn.Module):
         x = torch.relu(self.fc2(x))
         return self.fc3(x)
 
+# Define the branching DQN model: a shared trunk with one Q-value head per action component
+class BranchingDQN(nn.Module):
+    def __init__(self, input_dim, branch_sizes):
+        super(BranchingDQN, self).__init__()
+        self.branch_sizes = tuple(branch_sizes)
+        self.fc1 = nn.Linear(input_dim, 128)
+        self.fc2 = nn.Linear(128, 128)
+        # All heads in one layer, branch d owns outputs offsets[d] .. offsets[d] + branch_sizes[d] - 1
+        self.heads = nn.Linear(128, sum(self.branch_sizes))
+        offsets = np.concatenate([[0], np.cumsum(self.branch_sizes)[:-1]])
+        self.register_buffer("offsets", torch.from_numpy(offsets), persistent=False)
+        # (branches, largest branch) map into the head outputs, padding entries are masked out
+        choices = np.arange(max(self.branch_sizes))
+        valid = choices[None, :] < np.array(self.branch_sizes)[:, None]
+        self.register_buffer("padded_index", torch.from_numpy(np.where(valid, offsets[:, None] + choices, 0)), persistent=False)
+        self.register_buffer("padding", torch.from_numpy(~valid), persistent=False)
+
+    def forward(self, x):
+        x = torch.relu(self.fc1(x))
+        x = torch.relu(self.fc2(x))
+        return self.heads(x)  # Shape [batch, sum(branch_sizes)]
+
+    def branch_values(self, q_values):
+        # Shape [batch, branches, largest branch], padding set to -inf so it never wins a max
+        return q_values[:, self.padded_index].masked_fill(self.padding, float("-inf"))
+
+    def greedy(self, q_values):
+        # Best choice of every branch, O(sum of branch sizes) instead of O(product)
+        return self.branch_values(q_values).argmax(2)
+
+    def max_values(self, q_values):
+        return self.branch_values(q_values).max(2)[0]
+
+    def gather(self, q_values, branch_actions):
+        # Q-value of the chosen option of every branch, shape [batch, branches]
+        return q_values.gather(1, branch_actions + self.offsets)
+
 # Flatten the nested state into a single list of sensor values
+# (only needed for dict observations, the training loop uses the env's flat observation mode)
 def flatten_state(state):
     flat_state = []
     for chamber_key in ["active_chamber", "curing_chamber"]:
@@ -60,126 +105,364 @@ def decode_action(encoded_action):
 
 # Define RL parameters
 GAMMA = 0.99
+N_STEP = 3  # Rewards summed before bootstrapping from the target network
 BATCH_SIZE = 32
 REPLAY_BUFFER_SIZE = 10000
+DURATION_BINS = tuple(range(0, 900, 60))  # Seconds, durations the agent can choose from per chamber
+PRIORITY_ALPHA = 0.6  # How strongly TD errors shape the sampling distribution (0 = uniform)
+PRIORITY_BETA_START = 0.4  # Importance-sampling correction, annealed to 1 over training
 EPSILON_START = 1.0
 EPSILON_END = 0.1
 EPSILON_DECAY = 0.995
 LEARNING_RATE = 0.001
 TARGET_UPDATE_FREQUENCY = 10
+CHECKPOINT_PATH = "checkpoints/MLTraining.pt"
+CHECKPOINT_FREQUENCY = 10  # Episodes between checkpoints
 
-# Initialize environment and determine state_dim from a flattened state sample
-env = CompostingEnv()
-sample_state = flatten_state(env.reset())  # Flattened sample state
-state_dim = len(sample_state)  # Get the length of the flattened state
-action_dim = 4  # Example with 4 possible actions; adjust as needed
-
-# Initialize DQN and optimizer with the correct input dimension
-policy_net = DQN(input_dim=state_dim, output_dim=action_dim)
-target_net = DQN(input_dim=state_dim, output_dim=action_dim)
-target_net.load_state_dict(policy_net.state_dict())
-optimizer = optim.Adam(policy_net.parameters(), lr=LEARNING_RATE)
-replay_buffer = deque(maxlen=REPLAY_BUFFER_SIZE)
-
-# Generate random action compatible with the environment's dictionary action space
-def generate_random_action():
-    return {
-        "active_chamber": {
-            "paddle": (random.randint(0, 1), random.randint(0, 1)),
-            "air_pump": random.randint(0, 1),
-            "lid": random.randint(0, 1),
-            "duration": random.randint(1, env.max_duration)
-        },
-        "curing_chamber": {
-            "paddle": (random.randint(0, 1), random.randint(0, 1)),
-            "air_pump": random.randint(0, 1),
-            "lid": random.randint(0, 1),
-            "duration": random.randint(1, env.max_duration)
-        }
-    }
+# Everything train() can be configured with, the constants above are the defaults
+DEFAULT_CONFIG = {
+    "gamma": GAMMA,
+    "n_step": N_STEP,
+    "batch_size": BATCH_SIZE,
+    "replay_buffer_size": REPLAY_BUFFER_SIZE,
+    "duration_bins": DURATION_BINS,
+    "priority_alpha": PRIORITY_ALPHA,
+    "priority_beta_start": PRIORITY_BETA_START,
+    "epsilon_start": EPSILON_START,
+    "epsilon_end": EPSILON_END,
+    "epsilon_decay": EPSILON_DECAY,
+    "learning_rate": LEARNING_RATE,
+    "target_update_frequency": TARGET_UPDATE_FREQUENCY,
+    "num_episodes": 500,
+    "max_steps": None,  # Cap on steps per episode, None runs every episode until done
+    "num_envs": 0,  # Units stepped in parallel through SubprocVectorEnv, 0 steps one CompostingEnv in process
+    "num_workers": None,  # SubprocVectorEnv worker processes, None for one per CPU
+    "seed": None,
+    "checkpoint_path": CHECKPOINT_PATH,
+    "checkpoint_every": CHECKPOINT_FREQUENCY,  # 0 disables checkpoints
+    "resume": False,
+    "telemetry_path": None,  # Run log (.csv or .parquet) with per-episode throughput, timings, loss and Q-values
+    "telemetry_flush_every": 50,  # Episodes buffered in memory between writes to the run log
+    "verbose": True
+}
 
-# Choose action using epsilon-greedy strategy
-def choose_action(state, epsilon):
-    state_values = flatten_state(state)
-    
+# Action codec for the default duration bins, shared by the actor-learner and the policy export
+codec = ActionCodec(duration_bins=DURATION_BINS)
+branch_sizes = codec.branch_sizes  # One branch per ACTION_COLUMNS column, see ActionCodec.encode_branches
+
+# Choose the option of every action branch using epsilon-greedy strategy
+def choose_action(state, epsilon, net):
     if random.random() < epsilon:
-        return generate_random_action()
+        return np.array([random.randrange(size) for size in net.branch_sizes])
     else:
         with torch.no_grad():
-            state_tensor = torch.FloatTensor(state_values).unsqueeze(0)
-            q_values = policy_net(state_tensor)
-            action_index = q_values.max(1)[1].item()
-            return generate_random_action()  # Return random action for simplicity
+            state_tensor = torch.from_numpy(state).unsqueeze(0)
+            q_values = net(state_tensor)
+            return net.greedy(q_values)[0].numpy()
+
+# Choose the branch options of a batch of states, each row epsilon-greedy on its own
+def choose_actions(states, epsilon, net):
+    with torch.no_grad():
+        branches = net.greedy(net(torch.from_numpy(states))).numpy()
+    explore = np.random.random(len(states)) < epsilon
+    if explore.any():
+        branches[explore] = np.random.randint(0, net.branch_sizes, size=(explore.sum(), len(net.branch_sizes)))
+    return branches
 
 # Sample from replay buffer
-def sample_from_buffer(buffer, batch_size):
-    batch = random.sample(buffer, batch_size)
-    states, encoded_actions, rewards, next_states, dones = zip(*batch)
+def sample_from_buffer(buffer, batch_size, beta, action_codec=codec, n_step=N_STEP, gamma=GAMMA):
+    # rewards are n-step discounted returns, next_states the states to bootstrap from and discounts
+    # gamma ** steps taken, zero where the episode ended within the n steps
+    states, action_rows, rewards, next_states, discounts, weights, indices = buffer.sample(batch_size, beta, n_step, gamma)
 
-    # Extract a scalar or index from the encoded actions for indexing Q-values
-    # Example: Using only the "air_pump" action as a scalar index for simplicity
-    actions = torch.LongTensor([action[0][2] for action in encoded_actions])  # Just an example
+    # Map the stored action rows back to their branch choices for indexing Q-values
+    actions = torch.from_numpy(action_codec.encode_branches(action_rows.numpy()))
 
-    return (
-        torch.FloatTensor(states),
-        actions,
-        torch.FloatTensor(rewards),
-        torch.FloatTensor(next_states),
-        torch.FloatTensor(dones),
-    )
+    return states, actions, rewards, next_states, discounts, weights, indices
 
 
-# Update the Q network
-def update_model():
-    if len(replay_buffer) < BATCH_SIZE:
-        return
+# One branching DQN update on a sampled batch, returns the new priorities of the sampled transitions
+def branching_update(policy_net, target_net, optimizer, batch, telemetry=None):
+    states, actions, rewards, next_states, discounts, weights, indices = batch
+    if telemetry is not None:
+        start = time.perf_counter()
 
-    # Sample from replay buffer and extract components
-    states, actions, rewards, next_states, dones = sample_from_buffer(replay_buffer, BATCH_SIZE)
-    
     # Get Q-values for the current policy network
-    q_values = policy_net(states)  # Output shape [BATCH_SIZE, action_dim]
+    q_values = policy_net(states)  # Output shape [BATCH_SIZE, sum(branch_sizes)]
 
-    # Use actions to gather specific Q-values from policy_net
-    q_values = q_values.gather(1, actions.view(-1, 1).long()).squeeze(1)  # Shape [BATCH_SIZE]
+    # Use actions to gather the chosen option's Q-value in every branch
+    q_values = policy_net.gather(q_values, actions)  # Shape [BATCH_SIZE, branches]
     
-    # Calculate next Q-values from target network
-    next_q_values = target_net(next_states).max(1)[0]
-    expected_q_values = rewards + (GAMMA * next_q_values * (1 - dones))
+    # Calculate next Q-values from target network, per branch
+    with torch.no_grad():
+        next_q_values = target_net.max_values(target_net(next_states))
+    expected_q_values = rewards[:, None] + (discounts[:, None] * next_q_values)
 
-    # Compute loss and perform a backward pass
-    loss = nn.MSELoss()(q_values, expected_q_values)
+    # Compute the importance-weighted loss over all branches and perform a backward pass
+    td_errors = q_values - expected_q_values
+    loss = (weights[:, None] * td_errors.pow(2)).mean()
+    if telemetry is not None:
+        forward_done = time.perf_counter()
     optimizer.zero_grad()
     loss.backward()
     optimizer.step()
 
+    if telemetry is not None:
+        telemetry.add_time("forward", forward_done - start)
+        telemetry.add_time("backward", time.perf_counter() - forward_done)
+        telemetry.observe("loss", loss.item())
+        telemetry.observe("q_mean", q_values.detach().mean().item())
+        telemetry.observe("q_max", q_values.detach().max().item())
+    return td_errors.detach().abs().mean(1).numpy()
+
+# Merge overrides into the default configuration
+def make_config(config=None, **overrides):
+    merged = dict(DEFAULT_CONFIG)
+    for key, value in {**(config or {}), **overrides}.items():
+        if key not in DEFAULT_CONFIG:
+            raise ValueError(f"Unknown training option {key}")
+        merged[key] = value
+    return merged
+
+
+class DQNTrainer:
+    """
+    Branching DQN training on CompostingEnv, set up from a configuration dictionary (see DEFAULT_CONFIG).
+    Owns the env, action codec, networks, optimizer and prioritized replay buffer of one run.
+    """
+
+    def __init__(self, config=None):
+        self.config = make_config(config)
+        config = self.config
+        if config["seed"] is not None:
+            random.seed(config["seed"])
+            np.random.seed(config["seed"])
+            torch.manual_seed(config["seed"])
+
+        # Initialize environment with flat float32 observations, see env.observation_layout
+        self.env = CompostingEnv(observation_mode="flat", verbose=config["verbose"])
+        self.env.reset()
+        state_dim = self.env.observation_space.shape[0]  # Length of the flat observation vector
+        # With num_envs, transitions are collected from that many units in worker processes instead
+        self.vector_env = None
+        if config["num_envs"]:
+            self.vector_env = SubprocVectorEnv(config["num_envs"], config["num_workers"])
+        self.codec = ActionCodec(max_duration=self.env.max_duration, duration_bins=config["duration_bins"])
+
+        # Initialize branching DQN and optimizer with the correct input dimension
+        self.policy_net = BranchingDQN(input_dim=state_dim, branch_sizes=self.codec.branch_sizes)
+        self.target_net = BranchingDQN(input_dim=state_dim, branch_sizes=self.codec.branch_sizes)
+        self.target_net.load_state_dict(self.policy_net.state_dict())
+        self.optimizer = optim.Adam(self.policy_net.parameters(), lr=config["learning_rate"])
+        self.replay_buffer = PrioritizedReplayBuffer(config["replay_buffer_size"], state_dim,
+                                                     alpha=config["priority_alpha"], seed=config["seed"])
+
+        # Optional run log, see TrainingTelemetry
+        self.telemetry = None
+        if config["telemetry_path"]:
+            self.telemetry = TrainingTelemetry(config["telemetry_path"], flush_every=config["telemetry_flush_every"],
+                                               append=config["resume"])
+            self.telemetry.declare(counters=("env_steps", "updates"), timers=("env_step", "sample", "forward", "backward"),
+                                   values=("loss", "q_mean", "q_max"))
+
+    # Update the Q network
+    def update_model(self, beta):
+        if len(self.replay_buffer) < self.config["batch_size"]:
+            return
+
+        # Sample from replay buffer and extract components
+        telemetry = self.telemetry
+        if telemetry is not None:
+            start = time.perf_counter()
+        batch = sample_from_buffer(self.replay_buffer, self.config["batch_size"], beta, self.codec,
+                                   self.config["n_step"], self.config["gamma"])
+        if telemetry is not None:
+            telemetry.add_time("sample", time.perf_counter() - start)
+            telemetry.count("updates")
+        priorities = branching_update(self.policy_net, self.target_net, self.optimizer, batch, telemetry)
+
+        # Sampled transitions get their new TD errors as priorities
+        self.replay_buffer.update_priorities(batch[-1], priorities)
+
+    # Snapshot everything needed to continue training, on the training thread
+    def training_state(self, episode, epsilon, beta):
+        return {
+            "episode": episode,
+            "config": dict(self.config),  # Lets policyExport rebuild the network with the trained duration bins
+            "epsilon": epsilon,
+            "beta": beta,
+            "policy_net": snapshot_module(self.policy_net),
+            "target_net": snapshot_module(self.target_net),
+            "optimizer": snapshot_module(self.optimizer),
+            "replay_buffer": self.replay_buffer.state_dict(),
+            "env": self.env.get_state() if self.vector_env is None else None,  # Worker units restart at reset
+            "python_random": random.getstate(),
+            "torch_random": torch.get_rng_state()
+        }
+
+    # Restore a training_state() checkpoint, returns the episode to continue from
+    def restore_training_state(self, state):
+        self.policy_net.load_state_dict(state["policy_net"])
+        self.target_net.load_state_dict(state["target_net"])
+        self.optimizer.load_state_dict(state["optimizer"])
+        self.replay_buffer.load_state_dict(state["replay_buffer"])
+        if state["env"] is not None:
+            self.env.set_state(state["env"])
+        random.setstate(state["python_random"])
+        torch.set_rng_state(state["torch_random"])
+        return state["episode"] + 1, state["epsilon"], state["beta"]
+
+    # Run one episode with epsilon-greedy actions, training after every step
+    def run_episode(self, epsilon, beta):
+        if self.vector_env is not None:
+            return self.run_vector_episode(epsilon, beta)
+        env, codec, telemetry = self.env, self.codec, self.telemetry
+        # The env reuses its observation vector, so keep a copy of each state
+        state = env.reset().copy()
+        total_reward = 0
+        done = False
+        steps = 0
+
+        max_steps = self.config["max_steps"]
+        while not done and (max_steps is None or steps < max_steps):
+            action_row = codec.decode_branches(choose_action(state, epsilon, self.policy_net)[None, :])[0]
+            if telemetry is not None:
+                start = time.perf_counter()
+            next_state, reward, done, _ = env.step(array_to_action(action_row))
+            if telemetry is not None:
+                telemetry.add_time("env_step", time.perf_counter() - start)
+                telemetry.count("env_steps")
+            next_state = next_state.copy()
+            total_reward += reward
+            steps += 1
+
+            # Store the transition with the action as an ACTION_COLUMNS row, an episode cut off by max_steps
+            # ends its n-step returns without counting as done
+            self.replay_buffer.add(state, action_row, reward, next_state, done, truncated=steps == max_steps)
+            state = next_state
+
+            self.update_model(beta)
+        return total_reward
+
+    # Run one episode in every SubprocVectorEnv unit at once, training after every batched step. Units that
+    # finish early are reset by the env and keep adding transitions until the last unit is done. Returns the
+    # mean total reward of the units' first episodes.
+    def run_vector_episode(self, epsilon, beta):
+        env, codec, telemetry = self.vector_env, self.codec, self.telemetry
+        num_envs = env.num_envs
+        states = env.reset().copy()
+        total_rewards = np.zeros(num_envs)
+        finished = np.zeros(num_envs, dtype=bool)
+        units = np.arange(num_envs)
+        steps = 0
+
+        max_steps = self.config["max_steps"]
+        while not finished.all() and (max_steps is None or steps < max_steps):
+            action_rows = codec.decode_branches(choose_actions(states, epsilon, self.policy_net))
+            if telemetry is not None:
+                start = time.perf_counter()
+            observations, rewards, dones, info = env.step(action_rows)
+            if telemetry is not None:
+                telemetry.add_time("env_step", time.perf_counter() - start)
+                telemetry.count("env_steps", num_envs)
+            # Finished units were reset by the env, their transition ends in the final observation
+            next_states = np.where(dones[:, None], info["final_observation"], observations) if dones.any() else observations.copy()
+            total_rewards[~finished] += rewards[~finished]
+            finished |= dones
+            steps += 1
+
+            # Each unit is its own stream of transitions, episodes still running at the end are cut off
+            last_step = finished.all() or steps == max_steps
+            self.replay_buffer.add_batch(states, action_rows, rewards, next_states, dones.copy(),
+                                         truncated=np.full(num_envs, last_step), streams=units)
+            states = observations.copy()
+
+            self.update_model(beta)
+        return float(total_rewards.mean())
+
+    def close(self):
+        if self.vector_env is not None:
+            self.vector_env.close()
+
+    def train(self, report=None):
+        """
+        Run the training loop. report(episode, total_reward), if given, is called after every episode and
+        can stop training early by returning False. Returns the episode rewards and whether training was stopped.
+        """
+        config = self.config
+        num_episodes = config["num_episodes"]
+        start_episode = 0
+        epsilon = config["epsilon_start"]
+        beta = config["priority_beta_start"]
+        if config["resume"]:
+            checkpoint = load_checkpoint(config["checkpoint_path"])
+            if checkpoint is not None:
+                start_episode, epsilon, beta = self.restore_training_state(checkpoint)
+                if config["verbose"]:
+                    print(f"Resuming from episode {start_episode + 1}")
+        checkpointer = AsyncCheckpointer(config["checkpoint_path"]) if config["checkpoint_every"] else None
+
+        rewards, stopped = [], False
+        try:
+            for episode in range(start_episode, num_episodes):
+                total_reward = self.run_episode(epsilon, beta)
+                rewards.append(total_reward)
+
+                if episode % config["target_update_frequency"] == 0:
+                    self.target_net.load_state_dict(self.policy_net.state_dict())
+
+                epsilon = max(config["epsilon_end"], epsilon * config["epsilon_decay"])
+                beta = min(1.0, beta + (1.0 - config["priority_beta_start"]) / num_episodes)
 
+                if config["verbose"]:
+                    print(f"Episode {episode+1}, Total Reward: {total_reward:.2f}")
+                if self.telemetry is not None:
+                    self.telemetry.end_row(episode=episode + 1, total_reward=total_reward, epsilon=epsilon, beta=beta,
+                                           buffer_size=len(self.replay_buffer),
+                                           buffer_fill=len(self.replay_buffer) / self.replay_buffer.capacity,
+                                           buffer_bytes=self.replay_buffer.nbytes)
 
-# Training loop
-num_episodes = 500
-epsilon = EPSILON_START
+                if checkpointer is not None and ((episode + 1) % config["checkpoint_every"] == 0 or episode + 1 == num_episodes):
+                    checkpointer.save(self.training_state(episode, epsilon, beta))
 
-for episode in range(num_episodes):
-    state = env.reset()
-    total_reward = 0
-    done = False
+                if report is not None and report(episode, total_reward) is False:
+                    stopped = True
+                    break
+        finally:
+            self.close()
+            if checkpointer is not None:
+                checkpointer.close()
+            if self.telemetry is not None:
+                self.telemetry.close()
+        return {"rewards": rewards, "stopped": stopped}
 
-    while not done:
-        action = choose_action(state, epsilon)
-        next_state, reward, done, _ = env.step(action)
-        total_reward += reward
 
-        # Store encoded action
-        replay_buffer.append((flatten_state(state), encode_action(action), reward, flatten_state(next_state), done))
-        state = next_state
+# Train with a configuration dictionary and/or keyword overrides of DEFAULT_CONFIG
+def train(config=None, report=None, **overrides):
+    return DQNTrainer(make_config(config, **overrides)).train(report)
 
-        update_model()
 
-    if episode % TARGET_UPDATE_FREQUENCY == 0:
-        target_net.load_state_dict(policy_net.state_dict())
+# Parse a KEY=VALUE option, values are read as JSON when possible (numbers, lists, null)
+def parse_option(option):
+    key, _, value = option.partition("=")
+    try:
+        return key, json.loads(value)
+    except json.JSONDecodeError:
+        return key, value
 
-    epsilon = max(EPSILON_END, epsilon * EPSILON_DECAY)
 
-    print(f"Episode {episode+1}, Total Reward: {total_reward:.2f}")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the branching DQN on CompostingEnv")
+    parser.add_argument("--episodes", type=int, default=DEFAULT_CONFIG["num_episodes"])
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="Checkpoint file, written atomically in the background")
+    parser.add_argument("--checkpoint-every", type=int, default=CHECKPOINT_FREQUENCY, help="Episodes between checkpoints, 0 to disable")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint file if it exists")
+    parser.add_argument("--telemetry", default=None, help="Write a per-episode run log to this .csv or .parquet file")
+    parser.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="Override any DEFAULT_CONFIG option, e.g. --set learning_rate=0.0005")
+    args = parser.parse_args()
 
-print("Training complete.")
+    config = make_config(dict(parse_option(option) for option in args.set), num_episodes=args.episodes,
+                         checkpoint_path=args.checkpoint, checkpoint_every=args.checkpoint_every, resume=args.resume,
+                         telemetry_path=args.telemetry)
+    train(config)
+    print("Training complete.")
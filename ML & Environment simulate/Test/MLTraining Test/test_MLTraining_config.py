@@ -0,0 +1,48 @@
+import unittest
+from MLTraining import DEFAULT_CONFIG, DQNTrainer, make_config, train
+
+class TestTrainingConfig(unittest.TestCase):
+    def setUp(self):
+        self.config = make_config(num_episodes=3, max_steps=40, checkpoint_every=0, verbose=False, seed=1)
+
+    def test_make_config(self):
+        """Test if overrides replace defaults and unknown options are rejected."""
+        self.assertEqual(self.config["gamma"], DEFAULT_CONFIG["gamma"])
+        self.assertEqual(make_config({"gamma": 0.9}, batch_size=8)["gamma"], 0.9)
+        with self.assertRaises(ValueError):
+            make_config(gama=0.9)
+
+    def test_config_reaches_trainer(self):
+        """Test if the configured options are used to build the trainer."""
+        trainer = DQNTrainer(make_config(self.config, learning_rate=0.01, replay_buffer_size=123, duration_bins=(0, 300)))
+        self.assertEqual(trainer.optimizer.param_groups[0]["lr"], 0.01)
+        self.assertEqual(trainer.replay_buffer.capacity, 123)
+        self.assertEqual(trainer.policy_net.branch_sizes, (2, 2, 2, 2, 2) * 2)
+
+    def test_seeded_training_is_reproducible(self):
+        """Test if two runs with the same seed give the same episode rewards."""
+        first = train(self.config)
+        second = train(self.config)
+        self.assertEqual(len(first["rewards"]), 3)
+        self.assertEqual(first["rewards"], second["rewards"])
+        self.assertFalse(first["stopped"])
+
+    def test_report_can_stop_training(self):
+        """Test if training stops when the report callback returns False."""
+        episodes = []
+        result = train(self.config, report=lambda episode, reward: episodes.append(episode) or episode < 1)
+        self.assertTrue(result["stopped"])
+        self.assertEqual(episodes, [0, 1])
+
+    def test_vector_env_collection(self):
+        """Test if num_envs collects each episode's transitions from that many SubprocVectorEnv units."""
+        trainer = DQNTrainer(make_config(self.config, num_episodes=1, max_steps=20, num_envs=3, num_workers=2))
+        result = trainer.train()
+        self.assertEqual(len(result["rewards"]), 1)
+        size = len(trainer.replay_buffer)
+        self.assertTrue(0 < size <= 3 * 20 and size % 3 == 0)  # One transition per unit and step
+        self.assertEqual(trainer.replay_buffer.stream_rows, {})  # Episodes still running at the end were cut off
+        self.assertTrue(trainer.vector_env.closed)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,67 @@
+import unittest
+import numpy as np
+from lidaEnvironment import CompostingEnv, action_to_array
+from actionCodec import ActionCodec
+
+class TestActionCodec(unittest.TestCase):
+    def setUp(self):
+        self.codec = ActionCodec(max_duration=900, duration_bins=(0, 60, 300, 600))
+
+    def test_round_trip_every_index(self):
+        """Test if every flat index decodes to an action that encodes back to the same index."""
+        self.assertEqual(self.codec.num_actions, 48 * 48)
+        indices = np.arange(self.codec.num_actions)
+        np.testing.assert_array_equal(self.codec.encode_rows(self.codec.decode_rows(indices)), indices)
+        for index in (0, 1, 47, 48, 1234, self.codec.num_actions - 1):
+            self.assertEqual(self.codec.encode(self.codec.decode(index)), index)
+
+    def test_decoded_actions_are_valid(self):
+        """Test if decoded actions are accepted by the env's action space."""
+        env = CompostingEnv()
+        for index in range(0, self.codec.num_actions, 97):
+            self.assertTrue(env.action_space.contains(self.codec.decode(index)))
+
+    def test_duration_rounds_down_to_bin(self):
+        """Test if durations are encoded as the bin they fall in."""
+        action = {
+            'active_chamber': {'paddle': (1, 1), 'air_pump': 0, 'lid': 1, 'duration': 299},
+            'curing_chamber': {'paddle': (0, 0), 'air_pump': 1, 'lid': 0, 'duration': 899}
+        }
+        decoded = self.codec.decode(self.codec.encode(action))
+        self.assertEqual(decoded['active_chamber']['duration'], 60)
+        self.assertEqual(decoded['curing_chamber']['duration'], 600)
+        self.assertEqual(decoded['active_chamber']['paddle'], (1, 1))
+        self.assertEqual(decoded['curing_chamber']['air_pump'], 1)
+
+    def test_paddle_off_ignores_direction(self):
+        """Test if an off paddle encodes to the same index for either direction."""
+        action = {
+            'active_chamber': {'paddle': (0, 1), 'air_pump': 0, 'lid': 0, 'duration': 0},
+            'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0}
+        }
+        rows = np.stack([action_to_array(action), action_to_array(action)])
+        rows[1, 1] = 0
+        indices = self.codec.encode_rows(rows)
+        self.assertEqual(indices[0], indices[1])
+
+    def test_branch_round_trip(self):
+        """Test if action rows map to one choice per branch and back, durations through their bin."""
+        self.assertEqual(self.codec.branch_sizes, (2, 2, 2, 2, 4) * 2)
+        rows = np.array([[1, 0, 1, 1, 70, 0, 1, 0, 0, 899],
+                         [0, 1, 0, 0, 0, 1, 1, 1, 1, 300]])
+        branches = self.codec.encode_branches(rows)
+        np.testing.assert_array_equal(branches, [[1, 0, 1, 1, 1, 0, 1, 0, 0, 3],
+                                                 [0, 1, 0, 0, 0, 1, 1, 1, 1, 2]])
+        self.assertTrue(np.all(branches < np.array(self.codec.branch_sizes)))
+        np.testing.assert_array_equal(self.codec.decode_branches(branches), [[1, 0, 1, 1, 60, 0, 1, 0, 0, 600],
+                                                                            [0, 1, 0, 0, 0, 1, 1, 1, 1, 300]])
+
+    def test_invalid_bins(self):
+        """Test if bins that do not start at 0 or reach max_duration are rejected."""
+        with self.assertRaises(ValueError):
+            ActionCodec(max_duration=900, duration_bins=(10, 60))
+        with self.assertRaises(ValueError):
+            ActionCodec(max_duration=900, duration_bins=(0, 900))
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
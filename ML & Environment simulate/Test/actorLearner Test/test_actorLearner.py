@@ -0,0 +1,108 @@
+import queue
+import threading
+import time
+import unittest
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from actorLearner import ActorLearner, actor_epsilon, run_actor, ACTOR_BATCH
+from lidaEnvironment import ACTION_COLUMNS, CompostingEnv, EPISODE_MAX_TIME
+from MLTraining import BranchingDQN, codec, branch_sizes
+
+def wait_for(condition, timeout=300):
+    # Spawning the actors imports torch in each of them, which can take a while on a loaded machine
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for the actors")
+        time.sleep(0.05)
+
+class TestActorLearner(unittest.TestCase):
+    def setUp(self):
+        self.trainer = ActorLearner(num_actors=1, buffer_size=256, batch_size=8, target_update=2, publish_every=3)
+
+    def tearDown(self):
+        self.trainer.close()
+
+    def test_actor_epsilons(self):
+        """Test if exploration rates go from the base rate down to base ** 8 across actors."""
+        self.assertEqual(actor_epsilon(0, 1), 0.4)
+        rates = [actor_epsilon(i, 4) for i in range(4)]
+        self.assertAlmostEqual(rates[0], 0.4)
+        self.assertAlmostEqual(rates[-1], 0.4 ** 8)
+        self.assertTrue(all(a > b for a, b in zip(rates, rates[1:])))
+
+    def test_learn_step_publishes_weights(self):
+        """Test if the learner trains on ingested batches and publishes its weights to the shared network."""
+        rng = np.random.default_rng(0)
+        state_dim = self.trainer.replay_buffer.observations.shape[1]
+        rows = np.zeros((32, len(ACTION_COLUMNS)), dtype=np.int64)
+        rows[:, 4::5] = 60
+        self.trainer.replay_buffer.add_batch(rng.random((32, state_dim), dtype=np.float32), rows,
+                                             rng.random(32), rng.random((32, state_dim), dtype=np.float32), np.zeros(32, dtype=bool))
+        before = [parameter.clone() for parameter in self.trainer.policy_net.parameters()]
+        for _ in range(3):
+            self.trainer.learn_step()
+        self.assertEqual(self.trainer.updates, 3)
+        self.assertEqual(self.trainer.weights_version.value, 1)
+        self.assertFalse(all(torch.equal(a, b) for a, b in zip(before, self.trainer.policy_net.parameters())))
+        for shared, trained in zip(self.trainer.shared_net.parameters(), self.trainer.policy_net.parameters()):
+            self.assertTrue(torch.equal(shared, trained))
+
+    def test_actors_feed_the_learner(self):
+        """Test if actor processes fill the replay buffer, pick up newly published weights and run() trains on them."""
+        trainer = ActorLearner(num_actors=2, buffer_size=4096, batch_size=8, publish_every=1000, report_seconds=1000)
+        self.addCleanup(trainer.close)
+        trainer.start()
+
+        # 1. Transition batches from both actors reach the buffer through the queue
+        wait_for(lambda: min(trainer.step_counts[:]) >= ACTOR_BATCH and trainer.ingested >= 2 * ACTOR_BATCH)
+        self.assertEqual(trainer.ingested % ACTOR_BATCH, 0)
+        with trainer.buffer_lock:
+            size = len(trainer.replay_buffer)
+            self.assertEqual(size, trainer.ingested)
+            self.assertTrue(trainer.replay_buffer.observations[:size].any(axis=1).all())
+            self.assertTrue(np.isin(trainer.replay_buffer.actions[:size, 4::5], codec.duration_bins).all())  # Decoded bins
+            self.assertTrue(set(trainer.replay_buffer.stream_rows) <= {0, 1})
+
+        # 2. Both actors switch to weights published after they started
+        wait_for(lambda: trainer.actor_versions[:] == [0, 0])
+        trainer.publish_weights()
+        wait_for(lambda: trainer.actor_versions[:] == [1, 1])
+
+        # 3. The learner loop trains while the actors keep stepping
+        steps = sum(trainer.step_counts[:])
+        stats = trainer.run(max_updates=5)
+        self.assertEqual(stats["updates"], 5)
+        self.assertGreaterEqual(stats["env_steps"], steps)
+        self.assertEqual(stats["buffer_size"], stats["ingested"])
+        self.assertEqual(trainer.actors, [])
+
+    def test_actor_episodes_restart_the_clock(self):
+        """Test if an actor that has stepped past 20 simulated days still starts every episode at time 0."""
+        env = CompostingEnv(observation_mode="flat", verbose=False)
+        steps_past_limit = EPISODE_MAX_TIME // env.time_increment + 10 * ACTOR_BATCH
+        context = mp.get_context("fork")
+        transitions, stop = context.Queue(), threading.Event()
+        step_counts, episode_counts = [0], [0]
+        torch.manual_seed(0)
+        actor = threading.Thread(target=run_actor, args=(
+            0, 1, BranchingDQN(input_dim=env.observation_space.shape[0], branch_sizes=branch_sizes),
+            context.Value("q", 0), context.Array("q", [-1]), transitions, step_counts, episode_counts, stop, 0))
+        actor.start()
+
+        dones = []
+        try:
+            while len(dones) < steps_past_limit:
+                _, (_, _, _, _, batch_dones) = transitions.get(timeout=300)
+                dones.extend(batch_dones)
+        finally:
+            stop.set()
+            actor.join()
+        # Without the clock reset every episode after the first 20 days would end after one step
+        late = np.array(dones[EPISODE_MAX_TIME // env.time_increment:])
+        self.assertFalse(late.all())
+        self.assertGreaterEqual(episode_counts[0], int(np.sum(dones)))  # The actor may be ahead of the queue
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
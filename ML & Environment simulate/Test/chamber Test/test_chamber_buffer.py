@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from chamber import Chamber
+
+class TestChamberBuffer(unittest.TestCase):
+    def setUp(self):
+        # Initialize the Chamber with sample data
+        self.chamber = Chamber(
+            temperature=[20.0, 21.44, 19.9],
+            moisture=[50.17, 52.5],
+            oxygen=[18.35],
+            co2=[0.04],
+            methane=[0.65]
+        )
+
+    def test_getters_are_read_only_views(self):
+        """Test if getters return read-only views into one shared buffer"""
+        temperature = self.chamber.get_temperature()
+        self.assertFalse(temperature.flags.writeable)
+        with self.assertRaises(ValueError):
+            temperature[0] = 1.0
+        self.assertTrue(np.shares_memory(temperature, self.chamber.get_methane().base))
+
+    def test_update_in_place(self):
+        """Test if updates write into the existing buffer, so views see the new values"""
+        temperature = self.chamber.get_temperature()
+        self.chamber.update_temperature(1.5)
+        self.chamber.set_oxygen([19.999])
+        np.testing.assert_array_almost_equal(temperature, np.array([21.5, 22.94, 21.4]), decimal=2)
+        self.assertIs(temperature, self.chamber.get_temperature())
+        self.assertEqual(self.chamber.get_oxygen(0), 19.99)
+
+    def test_set_with_new_sensor_count(self):
+        """Test if setting a different number of readings rebuilds the buffer and keeps the other sensors"""
+        self.chamber.set_temperature([120.0])
+        np.testing.assert_array_equal(self.chamber.get_temperature(), np.array([120.0]))
+        np.testing.assert_array_equal(self.chamber.get_moisture(), np.array([50.17, 52.5]))
+        self.assertEqual(self.chamber.get_methane(0), 0.65)
+
+    def test_no_dynamic_attributes(self):
+        """Test if the chamber uses __slots__ and rejects unknown attributes"""
+        with self.assertRaises(AttributeError):
+            self.chamber.unknown_sensor = 1.0
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
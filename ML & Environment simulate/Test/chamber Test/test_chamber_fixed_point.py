@@ -0,0 +1,63 @@
+import unittest
+import contextlib
+import io
+import numpy as np
+from chamber import Chamber
+from lidaEnvironment import CompostingEnv
+
+class TestChamberFixedPoint(unittest.TestCase):
+    def setUp(self):
+        # Initialize a fixed-point Chamber with sample data
+        self.chamber = Chamber(
+            temperature=[20.0, 21.44, 19.9],
+            moisture=[50.17, 52.5],
+            oxygen=[18.35],
+            co2=[0.29],
+            methane=[0.65],
+            fixed_point=True
+        )
+
+    def test_storage_is_int32_centi_units(self):
+        """Test if readings are stored as int32 hundredths and returned as float32"""
+        self.assertTrue(self.chamber.is_fixed_point())
+        self.assertEqual(self.chamber._buffer.dtype, np.int32)
+        np.testing.assert_array_equal(self.chamber._views["temperature"], np.array([2000, 2144, 1990]))
+        self.assertEqual(self.chamber._views["co2"][0], 29)
+        self.assertEqual(self.chamber.get_temperature().dtype, np.float32)
+        np.testing.assert_array_equal(self.chamber.get_moisture(), np.array([50.17, 52.5], dtype=np.float32))
+
+    def test_update_truncates_deltas(self):
+        """Test if deltas are truncated to whole hundredths and clipped like the float mode"""
+        self.chamber.update_temperature(5.129, index=1)
+        self.assertEqual(self.chamber._views["temperature"][1], 2656)
+        self.chamber.update_oxygen(200)
+        self.assertEqual(self.chamber._views["oxygen"][0], 10000)
+        self.chamber.update_co2(-0.3)
+        self.assertEqual(self.chamber._views["co2"][0], -1)
+        with self.assertRaises(IndexError):
+            self.chamber.update_moisture(1, index=2)
+
+    def test_long_run_is_exact(self):
+        """Test if thousands of small updates accumulate without drift"""
+        for _ in range(4800):
+            self.chamber.update_methane(0.02)
+            self.chamber.update_moisture(-0.01)
+        self.assertEqual(self.chamber._views["methane"][0], 65 + 4800 * 2)
+        np.testing.assert_array_equal(self.chamber._views["moisture"], np.array([5017 - 4800, 5250 - 4800]))
+
+    def test_env_observation_is_float32(self):
+        """Test if the fixed-point environment produces float32 observations"""
+        env = CompostingEnv(fixed_point=True)
+        env.reset()
+        action = {
+            'active_chamber': {'paddle': (1, 1), 'air_pump': 1, 'lid': 0, 'duration': 2},
+            'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0}
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            observation, reward, done, _ = env.step(action)
+        self.assertEqual(observation['active_chamber']['temperature'].dtype, np.float32)
+        np.testing.assert_array_equal(observation['active_chamber']['oxygen'], np.array([15.6], dtype=np.float32))
+        np.testing.assert_array_equal(observation['curing_chamber']['co2'], np.array([6.04], dtype=np.float32))
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,77 @@
+import unittest
+import numpy as np
+from lidaEnvironment import CompostingEnv
+
+class TestActionEffects(unittest.TestCase):
+    def setUp(self):
+        self.env = CompostingEnv()
+        self.env.reset()
+        self.slices = self.env.active_chamber.get_sensor_slices()
+        self.rates, self.natural, self.touched = self.env.get_action_effects(self.env.active_chamber)
+
+    def test_table_rows(self):
+        """Test if each (paddle, air_pump, stage) row holds the per-second effects of the calculate_* functions."""
+        temperature = self.slices["temperature"].start
+        oxygen = self.slices["oxygen"].start
+        self.assertAlmostEqual(self.rates[1, 0, 0, temperature], 0.15)
+        self.assertAlmostEqual(self.rates[0, 1, 0, temperature], -0.2)
+        self.assertAlmostEqual(self.rates[1, 1, 0, temperature], 0.15)  # Paddle first
+        self.assertAlmostEqual(self.rates[1, 1, 1, temperature], -0.2)  # Then the air pump
+        self.assertAlmostEqual(self.rates[0, 1, 0, oxygen], 0.3)
+        self.assertFalse(self.touched[1, 0, 0, oxygen])
+        self.assertFalse(self.touched[1, 1, 0, oxygen])
+        self.assertTrue(self.touched[1, 1].any(axis=0).all())
+        self.assertFalse(self.touched[1, 0, 1].any() or self.touched[0, 1, 1].any() or self.touched[0, 0, 1].any())
+        np.testing.assert_array_equal(self.rates[0, 0], 0)
+
+    def test_natural_row_only_when_idle(self):
+        """Test if natural changes apply only when paddle and air pump are both off."""
+        self.assertAlmostEqual(self.natural[0, 0, 0, self.slices["co2"].start], 0.04)
+        np.testing.assert_array_equal(self.natural[1, 0], 0)
+        np.testing.assert_array_equal(self.natural[0, 1], 0)
+        np.testing.assert_array_equal(self.natural[1, 1], 0)
+
+    def test_update_state_both_components(self):
+        """Test if paddle and air pump together change temperature by the combined rate while in range."""
+        action = {
+            'active_chamber': {'paddle': (1, 1), 'air_pump': 1, 'lid': 0, 'duration': 10},
+            'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 10}
+        }
+        self.env.apply_action(self.env.active_chamber, action['active_chamber'])
+        self.env.apply_action(self.env.curing_chamber, action['curing_chamber'])
+        self.env.update_state(action)
+
+        np.testing.assert_array_almost_equal(self.env.active_chamber.get_temperature(), [49.5, 51.5, 50.5, 49.5], decimal=2)
+        np.testing.assert_array_almost_equal(self.env.active_chamber.get_oxygen(), [18.0], decimal=2)
+        np.testing.assert_array_almost_equal(self.env.curing_chamber.get_temperature(), [59.9, 60.9], decimal=2)
+
+    def test_paddle_clipped_before_air_pump(self):
+        """Test if with both on the paddle effects are clipped before the air pump's apply, as in the per-sensor updates."""
+        action = {
+            'active_chamber': {'paddle': (1, 1), 'air_pump': 1, 'lid': 0, 'duration': 900},
+            'curing_chamber': {'paddle': (1, 0), 'air_pump': 1, 'lid': 0, 'duration': 900}
+        }
+        self.env.apply_action(self.env.active_chamber, action['active_chamber'])
+        self.env.apply_action(self.env.curing_chamber, action['curing_chamber'])
+        self.env.update_state(action)
+
+        # +135 clips at 100 before the -180, adding the combined rate would end near 5
+        np.testing.assert_array_almost_equal(self.env.active_chamber.get_temperature(), [-80, -80, -80, -80], decimal=2)
+        np.testing.assert_array_almost_equal(self.env.active_chamber.get_oxygen(), [100], decimal=2)
+        np.testing.assert_array_almost_equal(self.env.curing_chamber.get_temperature(), [-80, -80], decimal=2)
+        np.testing.assert_array_almost_equal(self.env.curing_chamber.get_moisture(), [-20, -18], decimal=2)
+
+    def test_new_sensor_layout(self):
+        """Test if a chamber with a different number of readings gets its own table."""
+        self.env.active_chamber.set_temperature(np.array([30.0]))
+        action = {
+            'active_chamber': {'paddle': (1, 1), 'air_pump': 0, 'lid': 0, 'duration': 10},
+            'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0}
+        }
+        self.env.apply_action(self.env.active_chamber, action['active_chamber'])
+        self.env.update_state(action)
+        np.testing.assert_array_almost_equal(self.env.active_chamber.get_temperature(), [31.5], decimal=2)
+        self.assertEqual(len(self.env.action_effects), 3)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
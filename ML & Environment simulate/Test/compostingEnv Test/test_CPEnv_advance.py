@@ -0,0 +1,94 @@
+import unittest
+import contextlib
+import io
+import numpy as np
+from lidaEnvironment import CompostingEnv
+
+IDLE_ACTION = {
+    'active_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0},
+    'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0}
+}
+
+class TestAdvance(unittest.TestCase):
+    def setUp(self):
+        # Fixed-point mode, where stepping is exact and advance() must match it bit for bit
+        self.env = CompostingEnv(fixed_point=True)
+        self.stepped_env = CompostingEnv(fixed_point=True)
+        self.env.reset()
+        self.stepped_env.reset()
+
+    def step_until(self, steps):
+        total_reward, taken = 0, 0
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(steps):
+                observation, reward, done, _ = self.stepped_env.step(IDLE_ACTION)
+                total_reward += reward
+                taken += 1
+                if done:
+                    break
+        return observation, reward, done, taken, total_reward
+
+    def assert_matches_stepping(self, steps):
+        observation, reward, done, info = self.env.advance(steps)
+        expected_observation, expected_reward, expected_done, taken, total_reward = self.step_until(steps)
+        for chamber_key in ["active_chamber", "curing_chamber"]:
+            for sensor in ["temperature", "moisture", "oxygen", "co2", "methane"]:
+                np.testing.assert_array_equal(observation[chamber_key][sensor], expected_observation[chamber_key][sensor])
+        self.assertEqual(reward, expected_reward)
+        self.assertEqual(done, expected_done)
+        self.assertEqual(info["steps"], taken)
+        self.assertAlmostEqual(info["total_reward"], total_reward, places=6)
+        self.assertEqual(self.env.state['time'], self.stepped_env.state['time'])
+        return info
+
+    def test_advance_without_done(self):
+        """Test if a short idle stretch matches stepping one step at a time."""
+        info = self.assert_matches_stepping(50)
+        self.assertEqual(info["steps"], 50)
+
+    def test_advance_stops_at_extreme_values(self):
+        """Test if advance() stops at the first step where moisture falls below its extreme limit."""
+        info = self.assert_matches_stepping(3000)
+        self.assertLess(info["steps"], 3000)
+
+    def test_advance_stops_at_successful_completion(self):
+        """Test if advance() stops once optimal conditions hold after 14 days."""
+        for env in (self.env, self.stepped_env):
+            env.state['time'] = 14 * 24 * 60 * 60 - 10 * 360
+            env.active_chamber.set_temperature(np.array([25.0, 25.0, 25.0, 25.0]))
+            env.active_chamber.set_moisture(np.array([15.0, 15.0]))
+            env.active_chamber.set_oxygen(np.array([20.0]))
+            env.active_chamber.set_co2(np.array([20.0]))
+            env.active_chamber.set_methane(np.array([2.5]))
+            env.curing_chamber.set_temperature(np.array([25.0, 25.0]))
+            env.curing_chamber.set_moisture(np.array([15.0, 15.0]))
+            env.curing_chamber.set_oxygen(np.array([20.0]))
+            env.curing_chamber.set_co2(np.array([20.0]))
+            env.curing_chamber.set_methane(np.array([2.5]))
+        info = self.assert_matches_stepping(100)
+        self.assertEqual(info["steps"], 10)
+
+    def test_advance_clips_out_of_range_readings(self):
+        """Test if a reading above the clip range is clipped on the first step, like update_temperature."""
+        for env in (self.env, self.stepped_env):
+            env.curing_chamber.set_temperature(np.array([150.0, 61.0]))
+        self.assert_matches_stepping(20)
+
+    def test_advance_requires_idle_chambers(self):
+        """Test if advance() refuses to skip steps while a paddle or air pump is on."""
+        self.env.active_chamber.simulate_air_pump(True)
+        with self.assertRaises(ValueError):
+            self.env.advance(10)
+
+    def test_advance_float_mode(self):
+        """Test if float mode matches stepping, truncation drift included, and stops at the same step."""
+        self.env = CompostingEnv()
+        self.stepped_env = CompostingEnv()
+        self.env.reset()
+        self.stepped_env.reset()
+        info = self.assert_matches_stepping(5000)
+        self.assertEqual(info["steps"], 329)
+        np.testing.assert_array_almost_equal(self.env.active_chamber.get_temperature(), [15.87, 18.0, 16.93, 15.87], decimal=6)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,104 @@
+import unittest
+import numpy as np
+from lidaEnvironment import CompostingEnv
+from eventSimulation import EventDrivenSimulation
+
+class TestEventDrivenSimulation(unittest.TestCase):
+    def setUp(self):
+        self.env = CompostingEnv(fixed_point=True, verbose=False)
+        self.env.reset()
+        self.simulation = EventDrivenSimulation(self.env)
+
+    def test_idle_time_matches_advance(self):
+        """Test if an idle hour is integrated in closed form, like ten idle steps."""
+        expected_env = CompostingEnv(fixed_point=True, verbose=False)
+        expected_env.reset()
+        expected_observation, _, _, _ = expected_env.advance(10)
+
+        observation, _, done, info = self.simulation.run_until(3600 * 1000)
+        self.assertFalse(done)
+        self.assertEqual(info["segments"], 1)
+        self.assertEqual(self.env.state['time'], 3600)
+        np.testing.assert_array_equal(observation['active_chamber']['temperature'], expected_observation['active_chamber']['temperature'])
+
+    def test_air_pump_pulse(self):
+        """Test if an air pump pulse changes the chamber for exactly its on-time."""
+        self.simulation.schedule_pulse(0, 'active_chamber', 'air_pump', 100 * 1000)
+        observation, _, done, info = self.simulation.run_until(100 * 1000)
+
+        self.assertEqual(info["events"], 2)
+        self.assertFalse(self.env.active_chamber.get_air_pump_status())
+        np.testing.assert_array_almost_equal(observation['active_chamber']['oxygen'], [45.0], decimal=4)
+        np.testing.assert_array_almost_equal(observation['active_chamber']['methane'], [-9.0], decimal=4)
+        # Natural changes only come with a whole idle step
+        np.testing.assert_array_almost_equal(observation['curing_chamber']['co2'], [6.0], decimal=4)
+        observation, _, _, _ = self.simulation.run_until(360 * 1000)
+        np.testing.assert_array_almost_equal(observation['curing_chamber']['co2'], [6.04], decimal=4)
+        np.testing.assert_array_almost_equal(observation['active_chamber']['co2'], [5.0], decimal=4)  # Idle for 260 s
+
+    def test_idle_time_split_by_events(self):
+        """Test if an idle hour split by a lid toggle every second gives the ten idle steps, in both modes."""
+        for fixed_point in (False, True):
+            env = CompostingEnv(fixed_point=fixed_point, verbose=False)
+            expected_env = CompostingEnv(fixed_point=fixed_point, verbose=False)
+            env.reset()
+            expected_env.reset()
+            expected_observation, _, _, _ = expected_env.advance(10)
+            simulation = EventDrivenSimulation(env)
+            for second in range(3600):
+                simulation.schedule(second * 1000, 'curing_chamber', 'lid', second % 2 == 0)
+            observation, _, done, _ = simulation.run_until(3600 * 1000)
+            self.assertFalse(done)
+            for chamber_key in ['active_chamber', 'curing_chamber']:
+                for sensor in ['temperature', 'moisture', 'oxygen', 'co2', 'methane']:
+                    np.testing.assert_array_equal(observation[chamber_key][sensor], expected_observation[chamber_key][sensor])
+            np.testing.assert_array_almost_equal(observation['active_chamber']['temperature'], [49.0, 51.0, 50.0, 49.0], decimal=4)
+            np.testing.assert_array_almost_equal(observation['active_chamber']['co2'], [5.4], decimal=4)
+
+    def test_component_time_split_by_events(self):
+        """Test if a paddle run split into many short segments ends where the unsplit run does."""
+        self.simulation.schedule_pulse(0, 'active_chamber', 'paddle', 10500)
+        expected_observation, _, _, _ = self.simulation.run_until(20000)
+
+        env = CompostingEnv(fixed_point=True, verbose=False)
+        env.reset()
+        simulation = EventDrivenSimulation(env)
+        simulation.schedule_pulse(0, 'active_chamber', 'paddle', 10500)
+        for time_ms in range(0, 10500, 70):
+            simulation.schedule(time_ms, 'active_chamber', 'paddle_direction', 1 if time_ms % 140 else -1)
+        observation, _, _, info = simulation.run_until(20000)
+        self.assertGreater(info["segments"], 150)
+        for sensor in ['temperature', 'moisture', 'co2']:
+            np.testing.assert_array_equal(observation['active_chamber'][sensor], expected_observation['active_chamber'][sensor])
+        np.testing.assert_array_almost_equal(observation['active_chamber']['co2'], [5.84], decimal=4)
+
+    def test_events_run_in_time_order(self):
+        """Test if events scheduled out of order are applied by time."""
+        self.simulation.schedule(2000, 'curing_chamber', 'lid', False)
+        self.simulation.schedule(1000, 'curing_chamber', 'lid', True)
+        self.simulation.schedule(1500, 'curing_chamber', 'paddle_direction', -1)
+        self.simulation.run_until(1600)
+        self.assertTrue(self.env.curing_chamber.lid_status)
+        self.assertEqual(self.env.curing_chamber.get_paddle_direction(), -1)
+        self.simulation.run_until(2000)
+        self.assertFalse(self.env.curing_chamber.lid_status)
+
+    def test_stops_when_done(self):
+        """Test if a long paddle run ends the episode at the millisecond it ends, and leaves later events queued."""
+        self.simulation.schedule_pulse(0, 'active_chamber', 'paddle', 900 * 1000)
+        self.simulation.schedule(5000 * 1000, 'curing_chamber', 'lid', True)
+        observation, _, done, info = self.simulation.run_until(6000 * 1000)
+        self.assertTrue(done)
+        # Mean moisture (60, 62) falls below its extreme limit of 10 at -0.1 per second
+        self.assertEqual(info["time_ms"], 510001)
+        np.testing.assert_array_almost_equal(observation['active_chamber']['moisture'], [8.99, 10.99], decimal=4)
+        self.assertEqual(self.env.state['time'], 510.001)
+        self.assertEqual(len(self.simulation.events), 2)
+
+    def test_rejects_unknown_actuator(self):
+        """Test if scheduling an unknown actuator raises a ValueError."""
+        with self.assertRaises(ValueError):
+            self.simulation.schedule(0, 'active_chamber', 'heater', True)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,68 @@
+import unittest
+import contextlib
+import io
+import numpy as np
+from lidaEnvironment import CompostingEnv
+
+class TestFlatObservation(unittest.TestCase):
+    def setUp(self):
+        self.env = CompostingEnv(observation_mode="flat")
+        self.dict_env = CompostingEnv()
+        self.action = {
+            'active_chamber': {'paddle': (1, 1), 'air_pump': 1, 'lid': 0, 'duration': 5},
+            'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0}
+        }
+
+    def flatten(self, observation):
+        # Same order as MLTraining.flatten_state
+        values = []
+        for chamber_key in ["active_chamber", "curing_chamber"]:
+            for sensor_key, sensor_values in observation[chamber_key].items():
+                values.extend(np.atleast_1d(sensor_values).tolist())
+        return np.array(values, dtype=np.float32)
+
+    def test_matches_flattened_dict_observation(self):
+        """Test if the flat observation equals the flattened dict observation after reset and a step."""
+        np.testing.assert_array_equal(self.env.reset(), self.flatten(self.dict_env.reset()))
+        with contextlib.redirect_stdout(io.StringIO()):
+            flat, _, _, _ = self.env.step(self.action)
+            observation, _, _, _ = self.dict_env.step(self.action)
+        np.testing.assert_array_equal(flat, self.flatten(observation))
+
+    def test_buffer_is_reused(self):
+        """Test if every observation is written into the same preallocated float32 vector."""
+        first = self.env.reset()
+        with contextlib.redirect_stdout(io.StringIO()):
+            second, _, _, _ = self.env.step(self.action)
+        self.assertIs(first, second)
+        self.assertEqual(first.dtype, np.float32)
+        self.assertEqual(self.env.observation_space.shape, first.shape)
+
+    def test_layout_descriptor(self):
+        """Test if observation_layout maps every offset to its chamber, sensor and index."""
+        layout = self.env.observation_layout
+        observation = self.env.reset()
+        self.assertEqual(len(layout), len(observation))
+        self.assertEqual([entry[0] for entry in layout], list(range(len(observation))))
+        for offset, chamber_key, sensor, index in layout:
+            chamber = getattr(self.env, chamber_key)
+            expected = chamber.get_isEmpty() if sensor == "isEmpty" else getattr(chamber, f"get_{sensor}")(index)
+            self.assertAlmostEqual(observation[offset], expected, places=4)
+        self.assertEqual(layout[3], (3, "active_chamber", "temperature", 3))
+        self.assertEqual(layout[9], (9, "active_chamber", "isEmpty", 0))
+
+    def test_layout_follows_sensor_count(self):
+        """Test if the layout is rebuilt when a chamber's number of readings changes."""
+        self.env.reset()
+        self.env.active_chamber.set_temperature(np.array([30.0]))
+        observation = self.env.get_observation()
+        self.assertEqual(len(observation), 15)
+        self.assertEqual(observation[0], 30.0)
+
+    def test_fixed_point_flat_observation(self):
+        """Test if fixed-point chambers are written as float32 readings."""
+        env = CompostingEnv(fixed_point=True, observation_mode="flat")
+        np.testing.assert_array_equal(env.reset(), self.flatten(self.dict_env.reset()))
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,73 @@
+import unittest
+import numpy as np
+from lidaEnvironment import CompostingEnv, ACTION_COLUMNS, action_to_array, array_to_action
+
+SCHEDULE = [
+    {'active_chamber': {'paddle': (1, 1), 'air_pump': 0, 'lid': 0, 'duration': 20},
+     'curing_chamber': {'paddle': (0, 0), 'air_pump': 1, 'lid': 1, 'duration': 10}},
+    {'active_chamber': {'paddle': (0, 0), 'air_pump': 1, 'lid': 0, 'duration': 15},
+     'curing_chamber': {'paddle': (0, 1), 'air_pump': 0, 'lid': 0, 'duration': 30}},
+    {'active_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 1, 'duration': 0},
+     'curing_chamber': {'paddle': (1, 0), 'air_pump': 0, 'lid': 0, 'duration': 5}},
+]
+
+class TestRollout(unittest.TestCase):
+    def setUp(self):
+        self.env = CompostingEnv(verbose=False)
+        self.counter = 0
+
+    def schedule_policy(self, observation):
+        action = SCHEDULE[self.counter % len(SCHEDULE)]
+        self.counter += 1
+        return action
+
+    def test_rollout_matches_step(self):
+        """Test if the trajectory arrays match calling step() with the same fixed schedule."""
+        trajectory = self.env.rollout(self.schedule_policy, max_steps=30)
+
+        env = CompostingEnv(observation_mode="flat", verbose=False)
+        observation = env.reset()
+        for t in range(len(trajectory["rewards"])):
+            np.testing.assert_array_equal(trajectory["observations"][t], observation)
+            observation, reward, done, _ = env.step(SCHEDULE[t % len(SCHEDULE)])
+            self.assertEqual(trajectory["rewards"][t], reward)
+            self.assertEqual(trajectory["dones"][t], done)
+            self.assertEqual(trajectory["times"][t], env.state['time'])
+            np.testing.assert_array_equal(trajectory["actions"][t], action_to_array(SCHEDULE[t % len(SCHEDULE)]))
+        np.testing.assert_array_equal(trajectory["final_observation"], observation)
+
+    def test_rollout_shapes_and_early_stop(self):
+        """Test if the arrays are trimmed to the episode length when the episode ends early."""
+        long_paddle = {key: {'paddle': (1, 1), 'air_pump': 0, 'lid': 0, 'duration': 400} for key in ['active_chamber', 'curing_chamber']}
+        trajectory = self.env.rollout(lambda observation: long_paddle, max_steps=100)
+        steps = len(trajectory["rewards"])
+        self.assertLess(steps, 100)
+        self.assertTrue(trajectory["dones"][-1])
+        self.assertFalse(trajectory["dones"][:-1].any())
+        self.assertEqual(trajectory["observations"].shape, (steps, 18))
+        self.assertEqual(trajectory["actions"].shape, (steps, len(ACTION_COLUMNS)))
+        self.assertEqual(trajectory["times"][0], 360)
+
+    def test_batched_array_policy(self):
+        """Test if a batched policy returning action rows gives the same trajectory as a scalar dict policy."""
+        rows = np.stack([action_to_array(action) for action in SCHEDULE])
+
+        def batched_policy(observations):
+            self.assertEqual(observations.shape, (1, 18))
+            row = rows[self.counter % len(rows)]
+            self.counter += 1
+            return row[None, :]
+
+        batched = self.env.rollout(batched_policy, max_steps=12, batched=True)
+        self.counter = 0
+        scalar = self.env.rollout(self.schedule_policy, max_steps=12)
+        for key in ["observations", "actions", "rewards", "dones", "times"]:
+            np.testing.assert_array_equal(batched[key], scalar[key])
+
+    def test_action_row_round_trip(self):
+        """Test if converting an action to a row and back returns the same action."""
+        for action in SCHEDULE:
+            self.assertEqual(array_to_action(action_to_array(action)), action)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,75 @@
+import unittest
+import numpy as np
+from lidaEnvironment import CompostingEnv
+
+ACTION = {
+    'active_chamber': {'paddle': (1, 0), 'air_pump': 1, 'lid': 1, 'duration': 7},
+    'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 3}
+}
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.env = CompostingEnv(verbose=False)
+        self.env.reset()
+        self.env.step(ACTION)
+
+    def assert_same_state(self, env, other):
+        for chamber_key in ["active_chamber", "curing_chamber"]:
+            chamber, other_chamber = getattr(env, chamber_key), getattr(other, chamber_key)
+            np.testing.assert_array_equal(chamber.get_sensor_buffer(), other_chamber.get_sensor_buffer())
+            self.assertEqual(chamber.get_status()["paddle_status"], other_chamber.get_status()["paddle_status"])
+            self.assertEqual(chamber.get_paddle_direction(), other_chamber.get_paddle_direction())
+            self.assertEqual(chamber.lid_status, other_chamber.lid_status)
+            self.assertEqual(chamber.get_air_pump_status(), other_chamber.get_air_pump_status())
+            self.assertEqual(chamber.get_isEmpty(), other_chamber.get_isEmpty())
+        self.assertEqual(env.state['time'], other.state['time'])
+
+    def test_restore_after_branching(self):
+        """Test if stepping on, then restoring, returns to the snapshot exactly."""
+        blob = self.env.get_state()
+        self.assertIsInstance(blob, bytes)
+        expected = CompostingEnv(verbose=False)
+        expected.set_state(blob)
+
+        for _ in range(5):
+            self.env.step(ACTION)
+        self.env.active_chamber.set_isEmpty_status(True)
+        self.env.set_state(blob)
+        self.assert_same_state(self.env, expected)
+        self.assertEqual(self.env.state['time'], 360)
+        self.assertTrue(self.env.active_chamber.get_paddle_status())
+
+    def test_restored_env_steps_identically(self):
+        """Test if a restored copy produces the same trajectory as the original."""
+        copy = CompostingEnv(verbose=False)
+        copy.set_state(self.env.get_state())
+        for _ in range(5):
+            observation, reward, done, _ = self.env.step(ACTION)
+            copy_observation, copy_reward, copy_done, _ = copy.step(ACTION)
+            np.testing.assert_array_equal(observation['active_chamber']['temperature'], copy_observation['active_chamber']['temperature'])
+            self.assertEqual(reward, copy_reward)
+            self.assertEqual(done, copy_done)
+
+    def test_rng_state(self):
+        """Test if the RNG continues from the snapshot after restoring."""
+        self.env.np_random = np.random.default_rng(3)
+        blob = self.env.get_state()
+        expected = self.env.np_random.random(3)
+        self.env.np_random.random(10)
+        self.env.set_state(blob)
+        np.testing.assert_array_equal(self.env.np_random.random(3), expected)
+
+    def test_fixed_point_and_sensor_count(self):
+        """Test if fixed-point buffers and changed sensor counts are restored, and modes cannot be mixed."""
+        env = CompostingEnv(fixed_point=True, verbose=False)
+        env.active_chamber.set_temperature(np.array([30.0]))
+        blob = env.get_state()
+        copy = CompostingEnv(fixed_point=True, verbose=False)
+        copy.set_state(blob)
+        self.assert_same_state(env, copy)
+        self.assertEqual(copy.active_chamber.get_layout(), (1, 2, 1, 1, 1))
+        with self.assertRaises(ValueError):
+            self.env.set_state(blob)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -53,5 +53,24 @@ class TestCompostingEnvReset(unittest.TestCase):
         np.testing.assert_array_equal(observation["active_chamber"]["temperature"], expected_active_chamber_values["temperature"])
         np.testing.assert_array_equal(observation["curing_chamber"]["temperature"], expected_curing_chamber_values["temperature"])
 
+    def test_reset_clock_and_equipment(self):
+        """Test that reset starts a new episode at time 0 with all equipment off, whatever the last episode left."""
+        self.env.state['time'] = 21 * 24 * 60 * 60  # Past the 20-day limit
+        self.env.active_chamber.operate_paddle(True)
+        self.env.active_chamber.change_paddle_direction(-1)
+        self.env.curing_chamber.simulate_air_pump(True)
+        self.env.curing_chamber.open_lid()
+        self.env.reset()
+
+        self.assertEqual(self.env.state['time'], 0)
+        for chamber in (self.env.active_chamber, self.env.curing_chamber):
+            self.assertFalse(chamber.get_paddle_status())
+            self.assertEqual(chamber.get_paddle_direction(), 1)
+            self.assertFalse(chamber.get_air_pump_status())
+            self.assertFalse(chamber.lid_status)
+        idle = {key: {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0} for key in ['active_chamber', 'curing_chamber']}
+        _, _, done, _ = self.env.step(idle)
+        self.assertFalse(done)
+
 if __name__ == "__main__":
     unittest.main(argv=[''], exit=False)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import unittest
+from hyperparameterSweep import MedianPruner, grid_trials, random_trials, parse_space, run_trial
+
+class TestHyperparameterSweep(unittest.TestCase):
+    def test_grid_and_random_trials(self):
+        """Test if the grid covers every combination and random trials draw distinct ones from it."""
+        space = {"gamma": [0.9, 0.99], "batch_size": [16, 32, 64]}
+        grid = grid_trials(space)
+        self.assertEqual(len(grid), 6)
+        self.assertIn({"gamma": 0.99, "batch_size": 32}, grid)
+        sampled = random_trials(space, 4, seed=1)
+        self.assertEqual(len(sampled), 4)
+        self.assertTrue(all(trial in grid for trial in sampled))
+        self.assertEqual(len({tuple(trial.items()) for trial in sampled}), 4)
+
+    def test_parse_space(self):
+        """Test if command line values are read as numbers when possible."""
+        self.assertEqual(parse_space(["learning_rate=0.001,0.0005", "name=a,b"]), {"learning_rate": [0.001, 0.0005], "name": ["a", "b"]})
+
+    def test_median_pruner(self):
+        """Test if a trial below the median of the others at the same episode is pruned, only at check episodes."""
+        curves = {1: {9: 2.0}, 2: {9: 3.0}, 3: {9: 4.0}}
+        pruner = MedianPruner(curves, warmup=10, interval=5, window=2, min_trials=3)
+        self.assertFalse(pruner.should_prune(0, 8, [0.0] * 9))
+        self.assertTrue(pruner.should_prune(0, 9, [0.0] * 10))
+        self.assertEqual(curves[0], {9: 0.0})
+        self.assertFalse(pruner.should_prune(4, 9, [5.0] * 10))
+        pruner.min_trials = 10
+        self.assertFalse(pruner.should_prune(5, 9, [0.0] * 10))
+
+    def test_run_trial(self):
+        """Test if a trial trains with its options and returns a results row."""
+        pruning = {"warmup": 1, "interval": 1, "window": 2, "min_trials": 1}
+        curves = {99: {0: 100.0, 1: 100.0}}
+        row = run_trial(0, {"learning_rate": 0.0005}, {"num_episodes": 3, "max_steps": 20}, curves, pruning)
+        self.assertEqual(row["learning_rate"], 0.0005)
+        self.assertEqual(row["status"], "pruned")
+        self.assertEqual(row["episodes"], 1)
+        self.assertIn(0, curves)
+
+    def test_trials_share_the_seed(self):
+        """Test if two trials with the same options see the same reward curve whatever their trial id."""
+        pruning = {"warmup": 1, "interval": 1, "window": 1, "min_trials": 10}
+        curves = {}
+        rows = [run_trial(trial_id, {}, {"num_episodes": 2, "max_steps": 20, "seed": 3}, curves, pruning) for trial_id in (0, 1)]
+        self.assertEqual([row["status"] for row in rows], ["complete", "complete"])
+        self.assertEqual(curves[0], curves[1])
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
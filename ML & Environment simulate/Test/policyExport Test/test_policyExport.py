@@ -0,0 +1,72 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import torch
+from MLTraining import BranchingDQN, DQN, DQNTrainer, codec, branch_sizes, make_config
+from policyExport import export_policy, load_policy, greedy_actions, load_trained_net
+
+class TestPolicyExport(unittest.TestCase):
+    def setUp(self):
+        torch.manual_seed(0)
+        self.net = BranchingDQN(input_dim=18, branch_sizes=branch_sizes)
+        self.directory = tempfile.TemporaryDirectory()
+        self.observations = np.random.default_rng(0).uniform(0, 100, size=(300, 18)).astype(np.float32)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def expected_rows(self):
+        with torch.no_grad():
+            branches = self.net.greedy(self.net(torch.from_numpy(self.observations))).numpy()
+        return codec.decode_branches(branches)
+
+    def test_exported_policy_matches_network(self):
+        """Test if the TorchScript artifact returns the network's greedy action rows for a whole batch."""
+        path = os.path.join(self.directory.name, "policy.pt")
+        export_policy(self.net, path)
+        actions = greedy_actions(load_policy(path), self.observations)
+        self.assertEqual(actions.shape, (300, 10))
+        np.testing.assert_array_equal(actions, self.expected_rows())
+        self.assertTrue(self.net.training)
+
+    def test_single_observation(self):
+        """Test if a single observation is scored as a batch of one."""
+        path = os.path.join(self.directory.name, "policy.pt")
+        export_policy(self.net, path)
+        actions = greedy_actions(load_policy(path), self.observations[0])
+        np.testing.assert_array_equal(actions, self.expected_rows()[:1])
+
+    def test_quantized_policy(self):
+        """Test if the int8 variant returns valid action rows that mostly agree with the float network."""
+        path = os.path.join(self.directory.name, "policy_int8.pt")
+        export_policy(self.net, path, quantized=True)
+        actions = greedy_actions(load_policy(path), self.observations)
+        self.assertTrue(np.isin(actions[:, 4], codec.duration_bins).all())
+        self.assertGreater((actions == self.expected_rows()).mean(), 0.8)
+
+    def test_flat_dqn(self):
+        """Test if a flat DQN exports as a policy returning action indices."""
+        net = DQN(18, 7)
+        path = os.path.join(self.directory.name, "flat.pt")
+        export_policy(net, path)
+        with torch.no_grad():
+            expected = net(torch.from_numpy(self.observations)).argmax(1).numpy()
+        np.testing.assert_array_equal(greedy_actions(load_policy(path), self.observations), expected)
+
+    def test_checkpoint_duration_bins(self):
+        """Test if a checkpoint trained with other duration bins is exported with those bins."""
+        path = os.path.join(self.directory.name, "trained.pt")
+        trainer = DQNTrainer(make_config(num_episodes=1, max_steps=5, checkpoint_every=1, checkpoint_path=path,
+                                         duration_bins=(0, 300), verbose=False, seed=1))
+        trainer.train()
+        net, duration_bins = load_trained_net(path)
+        self.assertEqual(net.branch_sizes, (2, 2, 2, 2, 2) * 2)
+        np.testing.assert_array_equal(duration_bins, [0, 300])
+        policy_path = os.path.join(self.directory.name, "policy.pt")
+        export_policy(net, policy_path, duration_bins=duration_bins)
+        actions = greedy_actions(load_policy(policy_path), self.observations)
+        self.assertTrue(np.isin(actions[:, 4::5], [0, 300]).all())
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,120 @@
+import unittest
+import numpy as np
+from replayBuffer import ReplayBuffer, PrioritizedReplayBuffer
+
+GAMMA = 0.5
+ACTION_ROW = np.zeros(10, dtype=np.int32)
+
+def observation(value):
+    return np.full(2, value, dtype=np.float32)
+
+class TestNStepReturns(unittest.TestCase):
+    def fill(self, buffer, rewards, done_at=(), truncated_at=(), stream=0, start=0):
+        """Add one transition per reward, observation i -> i + 1, returning the rows."""
+        rows = []
+        for i, reward in enumerate(rewards):
+            rows.append(buffer.add(observation(start + i), ACTION_ROW, reward, observation(start + i + 1),
+                                   i in done_at, truncated=i in truncated_at, stream=stream))
+        return rows
+
+    def test_n_step_sum_and_bootstrap(self):
+        """Test if each row sums n discounted rewards and bootstraps from the observation n steps ahead."""
+        buffer = ReplayBuffer(16, 2)
+        rows = self.fill(buffer, [1.0, 2.0, 3.0, 4.0, 5.0])
+        _, _, returns, next_observations, discounts = buffer.gather_n_step(np.array(rows[:3]), 3, GAMMA)
+        np.testing.assert_allclose(returns, [1 + 1.0 + 0.75, 2 + 1.5 + 1.0, 3 + 2.0 + 1.25])
+        np.testing.assert_array_equal(next_observations[:, 0], [3, 4, 5])
+        np.testing.assert_allclose(discounts, [GAMMA ** 3] * 3)
+
+    def test_done_stops_the_return(self):
+        """Test if the return stops at done and the bootstrap discount is zero."""
+        buffer = ReplayBuffer(16, 2)
+        rows = self.fill(buffer, [1.0, 2.0, 3.0], done_at=(1,))
+        rows += self.fill(buffer, [10.0, 10.0], start=10)  # Next episode, must not leak into the first
+        returns, bootstrap_rows, discounts = buffer.n_step_targets(np.array(rows[:2]), 3, GAMMA)
+        np.testing.assert_allclose(returns, [1 + 1.0, 2.0])
+        np.testing.assert_array_equal(bootstrap_rows, [rows[1], rows[1]])
+        np.testing.assert_array_equal(discounts, [0.0, 0.0])
+
+    def test_truncation_bootstraps_early(self):
+        """Test if a truncated episode ends the return early but still bootstraps from its last state."""
+        buffer = ReplayBuffer(16, 2)
+        rows = self.fill(buffer, [1.0, 2.0], truncated_at=(1,))
+        rows += self.fill(buffer, [10.0, 10.0], start=10)
+        returns, bootstrap_rows, discounts = buffer.n_step_targets(np.array(rows[:1]), 3, GAMMA)
+        np.testing.assert_allclose(returns, [2.0])
+        np.testing.assert_array_equal(bootstrap_rows, [rows[1]])
+        np.testing.assert_allclose(discounts, [GAMMA ** 2])
+
+    def test_newest_transition_bootstraps_from_itself(self):
+        """Test if rows near the write position use the steps stored so far."""
+        buffer = ReplayBuffer(16, 2)
+        rows = self.fill(buffer, [1.0, 2.0])
+        returns, bootstrap_rows, discounts = buffer.n_step_targets(np.array(rows), 3, GAMMA)
+        np.testing.assert_allclose(returns, [2.0, 2.0])
+        np.testing.assert_array_equal(bootstrap_rows, [rows[1], rows[1]])
+        np.testing.assert_allclose(discounts, [GAMMA ** 2, GAMMA])
+
+    def test_interleaved_streams(self):
+        """Test if transitions of interleaved envs are chained per stream."""
+        buffer = ReplayBuffer(16, 2)
+        a, b = [], []
+        for step in range(3):
+            a.append(buffer.add(observation(step), ACTION_ROW, 1.0, observation(step + 1), False, stream="a"))
+            b.append(buffer.add(observation(100 + step), ACTION_ROW, 100.0, observation(101 + step), False, stream="b"))
+        returns, bootstrap_rows, _ = buffer.n_step_targets(np.array([a[0], b[0]]), 3, GAMMA)
+        np.testing.assert_allclose(returns, [1.75, 175.0])
+        np.testing.assert_array_equal(bootstrap_rows, [a[2], b[2]])
+
+    def test_add_batch_chains_vector_env_units(self):
+        """Test if add_batch chains row k of every batch to row k of the next one, and explicit streams in order."""
+        buffer = ReplayBuffer(32, 2)
+        first = buffer.add_batch(np.zeros((2, 2)), np.zeros((2, 10)), [1.0, 2.0], np.zeros((2, 2)), [False, True])
+        second = buffer.add_batch(np.zeros((2, 2)), np.zeros((2, 10)), [3.0, 4.0], np.zeros((2, 2)), [False, False])
+        np.testing.assert_array_equal(buffer.next_index[first], [second[0], -1])
+
+        rows = buffer.add_batch(np.zeros((4, 2)), np.zeros((4, 10)), [1.0, 2.0, 3.0, 4.0], np.zeros((4, 2)),
+                                [False, False, False, False], streams=[7, 8, 7, 7])
+        np.testing.assert_array_equal(buffer.next_index[rows], [rows[2], -1, rows[3], -1])
+        more = buffer.add_batch(np.zeros((1, 2)), np.zeros((1, 10)), [5.0], np.zeros((1, 2)), [False], streams=[7])
+        self.assertEqual(buffer.next_index[rows[3]], more[0])
+
+    def test_overwritten_rows_are_not_linked(self):
+        """Test if a stream does not link to its old row once the ring buffer has overwritten it."""
+        buffer = ReplayBuffer(4, 2)
+        old = buffer.add(observation(0), ACTION_ROW, 1.0, observation(1), False, stream="slow")
+        self.fill(buffer, [0.0] * 4, stream="fast")  # Wraps around and overwrites old
+        buffer.add(observation(1), ACTION_ROW, 1.0, observation(2), False, stream="slow")
+        self.assertNotEqual(buffer.next_index[old], buffer.position - 1)
+        returns, _, _ = buffer.n_step_targets(np.arange(4), 3, GAMMA)
+        self.assertTrue(np.all(np.isfinite(returns)))
+
+    def test_one_step_matches_plain_target(self):
+        """Test if n_step = 1 gives the one-step target reward + gamma * (1 - done) * Q(next_observation)."""
+        buffer = ReplayBuffer(16, 2)
+        rows = np.array(self.fill(buffer, [1.0, 2.0, 3.0], done_at=(2,)))
+        _, _, rewards, next_observations, dones = buffer.gather(rows)
+        _, _, returns, bootstrap_observations, discounts = buffer.gather_n_step(rows, 1, GAMMA)
+        np.testing.assert_array_equal(returns, rewards)
+        np.testing.assert_array_equal(bootstrap_observations, next_observations)
+        np.testing.assert_allclose(discounts, GAMMA * (1 - dones.numpy()))
+
+    def test_prioritized_n_step_sample(self):
+        """Test if the prioritized buffer returns n-step columns followed by weights and indices."""
+        buffer = PrioritizedReplayBuffer(16, 2, seed=0)
+        self.fill(buffer, [1.0] * 8)
+        batch = buffer.sample(4, beta=1.0, n_step=3, gamma=GAMMA)
+        self.assertEqual(len(batch), 7)
+        self.assertTrue(np.all(batch[2].numpy() >= 1.0))
+
+    def test_state_dict_keeps_stream_links(self):
+        """Test if a restored buffer keeps chaining a stream that was mid-episode."""
+        buffer = ReplayBuffer(16, 2)
+        self.fill(buffer, [1.0, 2.0])
+        restored = ReplayBuffer(16, 2)
+        restored.load_state_dict(buffer.state_dict())
+        row = restored.add(observation(2), ACTION_ROW, 3.0, observation(3), False)
+        self.assertEqual(restored.next_index[1], row)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
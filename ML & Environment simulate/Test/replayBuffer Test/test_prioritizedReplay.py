@@ -0,0 +1,53 @@
+import unittest
+import numpy as np
+from replayBuffer import SumTree, PrioritizedReplayBuffer
+
+ACTION = {
+    'active_chamber': {'paddle': (0, 0), 'air_pump': 1, 'lid': 0, 'duration': 5},
+    'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 0, 'duration': 0}
+}
+
+class TestSumTree(unittest.TestCase):
+    def test_total_and_find(self):
+        """Test if prefix sums map to the leaf whose interval contains them, skipping empty leaves."""
+        tree = SumTree(5)
+        tree.update([0, 1, 2, 3, 4], [1.0, 2.0, 3.0, 0.0, 4.0])
+        self.assertEqual(tree.total(), 10.0)
+        np.testing.assert_array_equal(tree.find([0, 0.99, 1, 2.9, 3, 5.9, 6, 9.99]), [0, 0, 1, 1, 2, 2, 4, 4])
+
+    def test_batched_update_refreshes_ancestors(self):
+        """Test if updating several leaves at once, sharing ancestors, keeps every node the sum of its children."""
+        tree = SumTree(8)
+        tree.update(np.arange(8), np.ones(8))
+        tree.update([1, 2, 3], [5.0, 0.5, 2.0])
+        self.assertEqual(tree.total(), 1 + 5 + 0.5 + 2 + 4)
+        nodes = np.arange(1, tree.leaves)
+        np.testing.assert_array_equal(tree.tree[nodes], tree.tree[2 * nodes] + tree.tree[2 * nodes + 1])
+
+class TestPrioritizedReplayBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = PrioritizedReplayBuffer(capacity=4, obs_dim=2, alpha=1.0, seed=0)
+        for value in range(4):
+            observation = np.full(2, value, dtype=np.float32)
+            self.buffer.add(observation, ACTION, float(value), observation, False)
+
+    def test_new_transitions_get_max_priority(self):
+        """Test if every new transition starts at the highest priority seen so far."""
+        self.buffer.update_priorities([0], [7.0])
+        self.buffer.add(np.zeros(2, dtype=np.float32), ACTION, 9.0, np.zeros(2, dtype=np.float32), True)
+        self.assertAlmostEqual(self.buffer.tree.get([0])[0], 7.0, places=4)  # Row 0 overwritten by the new one
+
+    def test_sampling_follows_priorities(self):
+        """Test if rows are sampled in proportion to their priority and weights correct for it."""
+        self.buffer.update_priorities([0, 1, 2, 3], [0.0, 1.0, 0.0, 3.0])
+        _, _, rewards, _, _, weights, indices = self.buffer.sample(4000, beta=1.0)
+        counts = np.bincount(indices, minlength=4)
+        self.assertLess(counts[0] + counts[2], 10)
+        self.assertAlmostEqual(counts[3] / counts[1], 3.0, delta=0.3)
+        np.testing.assert_array_equal(rewards.numpy(), indices.astype(np.float32))
+        # With beta = 1 the weights undo the sampling bias, so the rarer row has the larger weight
+        self.assertAlmostEqual(weights[indices == 1][0].item(), 1.0, places=5)
+        self.assertAlmostEqual(weights[indices == 3][0].item(), 1 / 3, places=3)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
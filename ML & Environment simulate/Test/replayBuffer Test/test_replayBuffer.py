@@ -0,0 +1,60 @@
+import unittest
+import numpy as np
+import torch
+from lidaEnvironment import action_to_array
+from replayBuffer import ReplayBuffer
+
+ACTION = {
+    'active_chamber': {'paddle': (1, 0), 'air_pump': 1, 'lid': 0, 'duration': 12},
+    'curing_chamber': {'paddle': (0, 1), 'air_pump': 0, 'lid': 1, 'duration': 3}
+}
+
+class TestReplayBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = ReplayBuffer(capacity=5, obs_dim=3, seed=0)
+
+    def add(self, value):
+        observation = np.full(3, value, dtype=np.float32)
+        self.buffer.add(observation, ACTION, float(value), observation + 1, value % 2 == 0)
+
+    def test_add_and_gather(self):
+        """Test if a stored transition comes back unchanged as torch tensors."""
+        self.add(1)
+        observations, actions, rewards, next_observations, dones = self.buffer.gather(np.array([0]))
+        self.assertIsInstance(observations, torch.Tensor)
+        self.assertEqual(observations.dtype, torch.float32)
+        np.testing.assert_array_equal(observations.numpy(), [[1, 1, 1]])
+        np.testing.assert_array_equal(next_observations.numpy(), [[2, 2, 2]])
+        np.testing.assert_array_equal(actions.numpy()[0], action_to_array(ACTION))
+        self.assertEqual(rewards.item(), 1.0)
+        self.assertEqual(dones.item(), 0.0)
+
+    def test_ring_overwrites_oldest(self):
+        """Test if adding past capacity overwrites the oldest rows and keeps the size at capacity."""
+        for value in range(8):
+            self.add(value)
+        self.assertEqual(len(self.buffer), 5)
+        self.assertEqual(self.buffer.position, 3)
+        np.testing.assert_array_equal(np.sort(self.buffer.rewards), [3, 4, 5, 6, 7])
+
+    def test_sample_only_stored_rows(self):
+        """Test if sampling a partly filled buffer only returns stored transitions."""
+        self.add(1)
+        self.add(2)
+        observations, _, rewards, _, _ = self.buffer.sample(64)
+        self.assertEqual(observations.shape, (64, 3))
+        self.assertTrue(set(rewards.tolist()) <= {1.0, 2.0})
+
+    def test_add_batch_wraps(self):
+        """Test if a batch from a vector env wraps around the end of the ring."""
+        self.add(0)
+        self.add(0)
+        observations = np.arange(12, dtype=np.float32).reshape(4, 3)
+        actions = np.tile(action_to_array(ACTION), (4, 1))
+        rows = self.buffer.add_batch(observations, actions, np.arange(4), observations, np.zeros(4, dtype=bool))
+        np.testing.assert_array_equal(rows, [2, 3, 4, 0])
+        self.assertEqual(len(self.buffer), 5)
+        np.testing.assert_array_equal(self.buffer.observations[0], [9, 10, 11])
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,71 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import torch
+from replayBuffer import PrioritizedReplayBuffer
+from trainingCheckpoint import AsyncCheckpointer, load_checkpoint, snapshot_module
+
+ACTION = {
+    'active_chamber': {'paddle': (1, 1), 'air_pump': 1, 'lid': 0, 'duration': 60},
+    'curing_chamber': {'paddle': (0, 0), 'air_pump': 0, 'lid': 1, 'duration': 0}
+}
+
+class TestTrainingCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "run", "checkpoint.pt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_missing_checkpoint(self):
+        """Test if loading a checkpoint that was never written returns None."""
+        self.assertIsNone(load_checkpoint(self.path))
+
+    def test_snapshot_is_independent(self):
+        """Test if a snapshot does not change when the network keeps training, and is written atomically."""
+        net = torch.nn.Linear(3, 2)
+        checkpointer = AsyncCheckpointer(self.path)
+        checkpointer.save({"net": snapshot_module(net), "episode": 4})
+        with torch.no_grad():
+            net.weight.add_(1.0)
+        checkpointer.close()
+
+        state = load_checkpoint(self.path)
+        self.assertEqual(state["episode"], 4)
+        self.assertTrue(torch.equal(state["net"]["weight"] + 1.0, net.weight))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_latest_snapshot_wins(self):
+        """Test if the file ends up holding the last saved snapshot."""
+        checkpointer = AsyncCheckpointer(self.path)
+        for episode in range(20):
+            checkpointer.save({"episode": episode})
+        checkpointer.wait()
+        self.assertEqual(load_checkpoint(self.path)["episode"], 19)
+        self.assertLessEqual(checkpointer.writes, 20)
+        checkpointer.close()
+
+    def test_replay_buffer_round_trip(self):
+        """Test if a prioritized buffer restored from a checkpoint samples the same batch."""
+        buffer = PrioritizedReplayBuffer(capacity=16, obs_dim=4, seed=1)
+        for value in range(10):
+            observation = np.full(4, value, dtype=np.float32)
+            buffer.add(observation, ACTION, float(value), observation, value == 9)
+        buffer.update_priorities(np.arange(10), np.arange(10) * 0.5)
+
+        checkpointer = AsyncCheckpointer(self.path)
+        checkpointer.save({"replay_buffer": buffer.state_dict()})
+        checkpointer.close()
+        restored = PrioritizedReplayBuffer(capacity=16, obs_dim=4)
+        restored.load_state_dict(load_checkpoint(self.path)["replay_buffer"])
+
+        self.assertEqual((restored.position, len(restored)), (buffer.position, len(buffer)))
+        expected, sampled = buffer.sample(8), restored.sample(8)
+        for a, b in zip(expected[:-1], sampled[:-1]):
+            self.assertTrue(torch.equal(a, b))
+        np.testing.assert_array_equal(expected[-1], sampled[-1])
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,106 @@
+import unittest
+import csv
+import math
+import os
+import tempfile
+import pandas as pd
+from trainingTelemetry import TrainingTelemetry
+from MLTraining import train
+
+class TestTrainingTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_row_aggregates(self):
+        """Test if counters, timers and values are aggregated into one row and reset afterwards."""
+        telemetry = TrainingTelemetry(os.path.join(self.directory.name, "run.csv"))
+        telemetry.count("env_steps", 3)
+        telemetry.count("env_steps")
+        telemetry.add_time("sample", 0.002)
+        telemetry.add_time("sample", 0.004)
+        for value in (1.0, 3.0, 2.0):
+            telemetry.observe("loss", value)
+        row = telemetry.end_row(episode=1)
+
+        self.assertEqual(row["episode"], 1)
+        self.assertEqual(row["env_steps"], 4)
+        self.assertGreater(row["env_steps_per_sec"], 0)
+        self.assertAlmostEqual(row["sample_ms"], 6.0)
+        self.assertAlmostEqual(row["sample_mean_ms"], 3.0)
+        self.assertEqual((row["loss_mean"], row["loss_min"], row["loss_max"]), (2.0, 1.0, 3.0))
+        self.assertNotIn("env_steps", telemetry.end_row(episode=2))
+
+    def test_batched_csv_flush(self):
+        """Test if rows are only written every flush_every rows, and the rest on close."""
+        path = os.path.join(self.directory.name, "logs", "run.csv")
+        telemetry = TrainingTelemetry(path, flush_every=3)
+        telemetry.declare(values=("loss",))
+        for episode in range(4):
+            with telemetry.timer("env_step"):
+                pass
+            if episode == 2:
+                telemetry.observe("loss", 0.5)
+            telemetry.end_row(episode=episode)
+            if episode < 2:
+                self.assertFalse(os.path.exists(path))
+        telemetry.close()
+
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row["episode"] for row in rows], ["0", "1", "2", "3"])
+        self.assertTrue(math.isnan(float(rows[0]["loss_mean"])))
+        self.assertEqual(float(rows[2]["loss_mean"]), 0.5)
+
+    def test_parquet_run_log(self):
+        """Test if a .parquet path is written as row groups that read back as one table."""
+        path = os.path.join(self.directory.name, "run.parquet")
+        telemetry = TrainingTelemetry(path, flush_every=2)
+        for episode in range(5):
+            telemetry.count("env_steps", episode)
+            telemetry.end_row(episode=episode, epsilon=1.0 / (episode + 1))
+        telemetry.close()
+        table = pd.read_parquet(path)
+        self.assertEqual(list(table["episode"]), [0, 1, 2, 3, 4])
+        self.assertEqual(list(table["env_steps"]), [0, 1, 2, 3, 4])
+
+    def test_trainer_run_log(self):
+        """Test if training with telemetry_path writes one row per episode with timings, loss and buffer columns."""
+        path = os.path.join(self.directory.name, "train.csv")
+        train(num_episodes=4, max_steps=30, batch_size=2, checkpoint_every=0, verbose=False, seed=1, telemetry_path=path)
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(len(rows), 4)
+        for column in ("env_steps_per_sec", "sample_mean_ms", "forward_mean_ms", "backward_mean_ms", "loss_mean", "q_max_max", "buffer_bytes", "epsilon"):
+            self.assertIn(column, rows[0])
+        self.assertGreater(sum(int(row["updates"]) for row in rows), 0)
+
+    def test_resumed_run_appends(self):
+        """Test if a resumed run adds its rows after the existing log, CSV and Parquet, with a single header."""
+        for name in ("run.csv", "run.parquet"):
+            path = os.path.join(self.directory.name, name)
+            for episodes, append in ((range(3), False), (range(3, 5), True)):
+                telemetry = TrainingTelemetry(path, flush_every=2, append=append)
+                for episode in episodes:
+                    telemetry.count("env_steps", episode)
+                    telemetry.end_row(episode=episode)
+                telemetry.close()
+            table = pd.read_parquet(path) if name.endswith(".parquet") else pd.read_csv(path)
+            self.assertEqual(list(table["episode"]), [0, 1, 2, 3, 4])
+            self.assertEqual(list(table["env_steps"]), [0, 1, 2, 3, 4])
+
+    def test_trainer_resume_run_log(self):
+        """Test if resuming training from a checkpoint continues the run log instead of replacing it."""
+        path = os.path.join(self.directory.name, "train.csv")
+        options = dict(max_steps=10, checkpoint_every=1, checkpoint_path=os.path.join(self.directory.name, "run.pt"),
+                       verbose=False, seed=1, telemetry_path=path)
+        train(num_episodes=2, **options)
+        train(num_episodes=4, resume=True, **options)
+        with open(path, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual([row["episode"] for row in rows], ["1", "2", "3", "4"])
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
@@ -0,0 +1,65 @@
+import unittest
+import random
+import numpy as np
+from lidaEnvironment import CompostingEnv, action_to_array
+from vectorEnv import VectorCompostingEnv, stack_actions, CHAMBER_KEYS
+from subprocVectorEnv import SubprocVectorEnv, write_flat_observation
+
+class TestSubprocVectorEnv(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.num_envs = 7
+        cls.env = SubprocVectorEnv(cls.num_envs, num_workers=3)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.env.close()
+
+    def setUp(self):
+        self.rng = random.Random(0)
+
+    def random_action(self, duration=20):
+        return {key: {"paddle": (self.rng.randint(0, 1), self.rng.randint(0, 1)),
+                      "air_pump": self.rng.randint(0, 1),
+                      "lid": self.rng.randint(0, 1),
+                      "duration": self.rng.randint(0, duration)} for key in CHAMBER_KEYS}
+
+    def test_reset_matches_flat_observation(self):
+        """Test if every unit's reset observation equals CompostingEnv's flat observation."""
+        expected = CompostingEnv(observation_mode="flat").reset()
+        observations = self.env.reset()
+        self.assertEqual(observations.shape, (self.num_envs, len(expected)))
+        for row in observations:
+            np.testing.assert_array_equal(row, expected)
+
+    def test_step_matches_vector_env(self):
+        """Test if the workers' slices together step exactly like one VectorCompostingEnv, auto-resets included."""
+        vector_env = VectorCompostingEnv(self.num_envs)
+        self.env.reset()
+        expected = np.empty_like(self.env.observations)
+        expected_final = np.empty_like(self.env.observations)
+        finished = 0
+        for _ in range(60):
+            actions = [self.random_action(duration=200) for _ in range(self.num_envs)]
+            observation, rewards, dones, info = vector_env.step(stack_actions(actions))
+            write_flat_observation(observation, expected)
+            observations, shared_rewards, shared_dones, shared_info = self.env.step(np.stack([action_to_array(action) for action in actions]))
+
+            np.testing.assert_array_equal(observations, expected)
+            np.testing.assert_array_equal(shared_rewards, rewards)
+            np.testing.assert_array_equal(shared_dones, dones)
+            if dones.any():
+                write_flat_observation(info["final_observation"], expected_final)
+                np.testing.assert_array_equal(shared_info["final_observation"][dones], expected_final[dones])
+                finished += dones.sum()
+        self.assertGreater(finished, 0)
+
+    def test_step_accepts_action_dictionaries(self):
+        """Test if a list of action dictionaries is written into the shared action rows."""
+        self.env.reset()
+        actions = [self.random_action() for _ in range(self.num_envs)]
+        self.env.step(actions)
+        np.testing.assert_array_equal(self.env.actions[2], action_to_array(actions[2]))
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
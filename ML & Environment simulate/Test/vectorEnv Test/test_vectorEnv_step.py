@@ -0,0 +1,74 @@
+import unittest
+import contextlib
+import io
+import random
+import numpy as np
+from lidaEnvironment import CompostingEnv
+from vectorEnv import VectorCompostingEnv, stack_actions, CHAMBER_KEYS, SENSOR_KEYS
+
+class TestVectorEnvStep(unittest.TestCase):
+    def setUp(self):
+        self.num_envs = 6
+        self.vector_env = VectorCompostingEnv(self.num_envs)
+        self.envs = [CompostingEnv() for _ in range(self.num_envs)]
+        for env in self.envs:
+            env.reset()
+        self.rng = random.Random(0)
+
+    def random_action(self):
+        # Short durations keep most units running for a while before they hit extreme values
+        return {key: {"paddle": (self.rng.randint(0, 1), self.rng.randint(0, 1)),
+                      "air_pump": self.rng.randint(0, 1),
+                      "lid": self.rng.randint(0, 1),
+                      "duration": self.rng.randint(0, 20)} for key in CHAMBER_KEYS}
+
+    def assert_observation_equal(self, scalar_obs, vector_obs, i):
+        for key in CHAMBER_KEYS:
+            for sensor in SENSOR_KEYS:
+                np.testing.assert_array_equal(scalar_obs[key][sensor], vector_obs[key][sensor][i])
+            self.assertEqual(scalar_obs[key]["isEmpty"], vector_obs[key]["isEmpty"][i])
+
+    def test_reset_matches_scalar(self):
+        """Test if the batched reset observation equals the scalar reset observation for every unit."""
+        vector_obs = self.vector_env.reset()
+        for i, env in enumerate(self.envs):
+            self.assert_observation_equal(env.get_observation(), vector_obs, i)
+
+    def test_step_matches_scalar(self):
+        """Test if observations, rewards and dones match the scalar env step for step until each unit finishes."""
+        running = [True] * self.num_envs
+        finished = 0
+        for _ in range(200):
+            actions = [self.random_action() for _ in range(self.num_envs)]
+            vector_obs, rewards, dones, info = self.vector_env.step(stack_actions(actions))
+            for i, env in enumerate(self.envs):
+                if not running[i]:
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    obs, reward, done, _ = env.step(actions[i])
+                self.assertEqual(reward, rewards[i])
+                self.assertEqual(done, dones[i])
+                if done:
+                    self.assert_observation_equal(obs, info["final_observation"], i)
+                    running[i] = False
+                    finished += 1
+                else:
+                    self.assert_observation_equal(obs, vector_obs, i)
+        self.assertGreater(finished, 0, "At least one unit should finish so the done path is compared.")
+
+    def test_auto_reset(self):
+        """Test if a finished unit is reset while the other units keep their state."""
+        co2_column = self.vector_env.sensor_slices["active_chamber"]["co2"].start
+        self.vector_env.sensors["active_chamber"][0, co2_column] = 80.0  # Exceeds CO2 limit of 70
+        idle = [{key: {"paddle": (0, 0), "air_pump": 0, "lid": 0, "duration": 0} for key in CHAMBER_KEYS}] * self.num_envs
+        obs, _, dones, info = self.vector_env.step(stack_actions(idle))
+
+        self.assertTrue(dones[0])
+        self.assertFalse(dones[1:].any())
+        self.assertEqual(self.vector_env.time[0], 0)
+        self.assertEqual(self.vector_env.time[1], self.vector_env.time_increment)
+        self.assertEqual(info["final_observation"]["active_chamber"]["co2"][0, 0], 80.04)
+        self.assert_observation_equal(self.envs[0].get_observation(), obs, 0)
+
+if __name__ == "__main__":
+    unittest.main(argv=[''], exit=False)
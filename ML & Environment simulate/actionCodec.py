@@ -0,0 +1,93 @@
+import numpy as np
+import config
+from lidaEnvironment import CHAMBER_KEYS, ACTION_FIELDS, array_to_action, action_to_array
+
+DEFAULT_DURATION_BINS = (0, 60, 300, 600)  # Seconds, each bin decodes to its lower edge
+PADDLE_STATES = ((0, 0), (1, 0), (1, 1))  # Off, on counterclockwise, on clockwise
+DURATION_COLUMNS = tuple(i * len(ACTION_FIELDS) + ACTION_FIELDS.index("duration") for i in range(len(CHAMBER_KEYS)))
+
+
+class ActionCodec:
+    """
+    Maps CompostingEnv's Dict action space to dense integer indices 0 .. num_actions - 1 and back.
+
+    Per chamber an action is one of the PADDLE_STATES (the direction is only meaningful while the paddle
+    runs, so an off paddle has a single state), an air pump bit, a lid bit and a duration bin, giving
+    3 * 2 * 2 * len(duration_bins) codes. The flat index is active_code * chamber_codes + curing_code.
+    Both directions go through precomputed tables:
+        - rows (num_actions, len(ACTION_COLUMNS)): the action row of every index
+        - actions: the action dictionary of every index, for O(1) decode
+        - chamber_code (2, 2, 2, 2): (paddle status, direction, air pump, lid) -> chamber code without duration
+        - duration_bin (max_duration,): duration in seconds -> bin
+    Encoding a duration rounds it down to its bin, so decode(encode(action)) equals the action up to that.
+
+    For factorized (branching) Q-networks there is also a per-component encoding: one branch per column of
+    ACTION_COLUMNS, with branch_sizes choices each (2 for the bits, len(duration_bins) for a duration).
+    """
+
+    def __init__(self, max_duration=config.max_duration, duration_bins=DEFAULT_DURATION_BINS):
+        duration_bins = np.asarray(duration_bins, dtype=np.int64)
+        if duration_bins[0] != 0 or np.any(np.diff(duration_bins) <= 0) or duration_bins[-1] >= max_duration:
+            raise ValueError("duration_bins must start at 0, increase and stay below max_duration")
+        self.max_duration = max_duration
+        self.duration_bins = duration_bins
+        self.chamber_codes = len(PADDLE_STATES) * 2 * 2 * len(duration_bins)
+        self.num_actions = self.chamber_codes ** len(CHAMBER_KEYS)
+        self.branch_sizes = tuple(len(duration_bins) if field == "duration" else 2 for _ in CHAMBER_KEYS for field in ACTION_FIELDS)
+
+        # 1. Encoding tables
+        self.chamber_code = np.zeros((2, 2, 2, 2), dtype=np.int64)
+        for paddle_state, (status, direction) in enumerate(PADDLE_STATES):
+            directions = (0, 1) if status == 0 else (direction,)
+            for direction in directions:
+                for air_pump in (0, 1):
+                    for lid in (0, 1):
+                        self.chamber_code[status, direction, air_pump, lid] = ((paddle_state * 2 + air_pump) * 2 + lid) * len(duration_bins)
+        self.duration_bin = np.searchsorted(duration_bins, np.arange(max_duration), side="right") - 1
+
+        # 2. Decoding tables
+        chamber_rows = np.empty((self.chamber_codes, len(ACTION_FIELDS)), dtype=np.int64)
+        for code in range(self.chamber_codes):
+            rest, duration = divmod(code, len(duration_bins))
+            rest, lid = divmod(rest, 2)
+            paddle_state, air_pump = divmod(rest, 2)
+            chamber_rows[code] = (*PADDLE_STATES[paddle_state], air_pump, lid, duration_bins[duration])
+        active, curing = np.divmod(np.arange(self.num_actions), self.chamber_codes)
+        self.rows = np.concatenate([chamber_rows[active], chamber_rows[curing]], axis=1)
+        self.actions = [array_to_action(row) for row in self.rows]
+
+    def decode(self, index):
+        """Return the action dictionary of a flat index. The dictionary is shared, do not modify it."""
+        return self.actions[index]
+
+    def decode_rows(self, indices):
+        """Return the (N, len(ACTION_COLUMNS)) action rows of an array of flat indices."""
+        return self.rows[indices]
+
+    def encode(self, action):
+        """Return the flat index of an action dictionary."""
+        return int(self.encode_rows(action_to_array(action)[None, :])[0])
+
+    def encode_rows(self, rows):
+        """Return the flat indices of (N, len(ACTION_COLUMNS)) action rows laid out as ACTION_COLUMNS."""
+        rows = np.asarray(rows)
+        indices = np.zeros(len(rows), dtype=np.int64)
+        for i in range(len(CHAMBER_KEYS)):
+            status, direction, air_pump, lid, duration = rows[:, i * len(ACTION_FIELDS):(i + 1) * len(ACTION_FIELDS)].T
+            code = self.chamber_code[status, direction, air_pump, lid] + self.duration_bin[np.clip(duration, 0, self.max_duration - 1)]
+            indices = indices * self.chamber_codes + code
+        return indices
+
+    def encode_branches(self, rows):
+        """Return the (N, len(ACTION_COLUMNS)) branch choices of action rows, durations replaced by their bin."""
+        branches = np.array(rows, dtype=np.int64)
+        for column in DURATION_COLUMNS:
+            branches[:, column] = self.duration_bin[np.clip(branches[:, column], 0, self.max_duration - 1)]
+        return branches
+
+    def decode_branches(self, branches):
+        """Return the action rows of (N, len(ACTION_COLUMNS)) branch choices, bins replaced by their duration."""
+        rows = np.array(branches, dtype=np.int64)
+        for column in DURATION_COLUMNS:
+            rows[:, column] = self.duration_bins[rows[:, column]]
+        return rows
@@ -0,0 +1,244 @@
+import argparse
+import queue
+import threading
+import time
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+import torch.optim as optim
+from lidaEnvironment import CompostingEnv, ACTION_COLUMNS, array_to_action
+from replayBuffer import PrioritizedReplayBuffer
+from MLTraining import (BranchingDQN, codec, branch_sizes, choose_action, sample_from_buffer, branching_update,
+                        BATCH_SIZE, GAMMA, LEARNING_RATE, N_STEP, PRIORITY_ALPHA, PRIORITY_BETA_START)
+
+ACTOR_BATCH = 64  # Transitions per message from an actor to the learner
+WEIGHT_SYNC_STEPS = 200  # Env steps between an actor's checks for newer weights
+QUEUE_SIZE = 256  # Batches in flight before actors block
+
+
+def actor_epsilon(actor_id, num_actors, base=0.4, exponent=7):
+    """Fixed exploration rate of each actor, from base (actor 0) down to base ** (1 + exponent) (last actor)."""
+    if num_actors == 1:
+        return base
+    return base ** (1 + exponent * actor_id / (num_actors - 1))
+
+
+def run_actor(actor_id, num_actors, shared_net, weights_version, actor_versions, transitions, step_counts,
+              episode_counts, stop, seed):
+    """
+    Actor process: steps its own CompostingEnv with epsilon-greedy actions from a local copy of the policy
+    network and sends transitions to the learner in batches of ACTOR_BATCH. The local copy is refreshed
+    from shared_net whenever the learner has published newer weights, actor_versions[actor_id] records
+    the version in use.
+    """
+    torch.set_num_threads(1)
+    random_state = np.random.default_rng(seed)
+    env = CompostingEnv(observation_mode="flat", verbose=False)
+    state = env.reset().copy()
+    state_dim = len(state)
+    net = BranchingDQN(input_dim=state_dim, branch_sizes=branch_sizes)
+    seen_version = -1
+    epsilon = actor_epsilon(actor_id, num_actors)
+
+    def new_batch():
+        return (np.empty((ACTOR_BATCH, state_dim), dtype=np.float32), np.empty((ACTOR_BATCH, len(ACTION_COLUMNS)), dtype=np.int64),
+                np.empty(ACTOR_BATCH, dtype=np.float32), np.empty((ACTOR_BATCH, state_dim), dtype=np.float32),
+                np.empty(ACTOR_BATCH, dtype=bool))
+
+    batch, filled, steps = new_batch(), 0, 0
+    while not stop.is_set():
+        # 1. Pick up newer weights
+        if steps % WEIGHT_SYNC_STEPS == 0 and weights_version.value != seen_version:
+            with weights_version.get_lock():
+                net.load_state_dict(shared_net.state_dict())
+                seen_version = weights_version.value
+            actor_versions[actor_id] = seen_version
+
+        # 2. Step the env
+        if random_state.random() < epsilon:
+            branches = random_state.integers(0, branch_sizes)
+        else:
+            branches = choose_action(state, 0.0, net)
+        action_row = codec.decode_branches(branches[None, :])[0]
+        next_state, reward, done, _ = env.step(array_to_action(action_row))
+
+        observations, actions, rewards, next_observations, dones = batch
+        observations[filled] = state
+        actions[filled] = action_row
+        rewards[filled] = reward
+        next_observations[filled] = next_state
+        dones[filled] = done
+        filled += 1
+        steps += 1
+        state = env.reset().copy() if done else next_state.copy()
+        if done:
+            episode_counts[actor_id] += 1
+
+        # 3. Ship a full batch, the queue pickles it later so a fresh one is allocated
+        if filled == ACTOR_BATCH:
+            while not stop.is_set():
+                try:
+                    transitions.put((actor_id, batch), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+            step_counts[actor_id] += filled
+            batch, filled = new_batch(), 0
+
+    transitions.cancel_join_thread()
+
+
+class ActorLearner:
+    """
+    Actor-learner training of the branching DQN from MLTraining.py.
+
+    num_actors processes run CompostingEnv and push transition batches through a multiprocessing queue.
+    An ingest thread moves them into a PrioritizedReplayBuffer while the learner loop trains continuously,
+    so simulation and backprop overlap. The learner publishes its weights to a shared-memory copy of the
+    network every publish_every updates. Both sides keep throughput counters, printed every
+    report_seconds and returned by run().
+    """
+
+    def __init__(self, num_actors=2, buffer_size=100000, batch_size=BATCH_SIZE, target_update=1000,
+                 publish_every=100, beta_updates=100000, report_seconds=10, seed=0):
+        self.num_actors = num_actors
+        self.batch_size = batch_size
+        self.target_update = target_update
+        self.publish_every = publish_every
+        self.beta_updates = beta_updates
+        self.report_seconds = report_seconds
+        self.seed = seed
+
+        state_dim = CompostingEnv(observation_mode="flat", verbose=False).observation_space.shape[0]
+        self.policy_net = BranchingDQN(input_dim=state_dim, branch_sizes=branch_sizes)
+        self.target_net = BranchingDQN(input_dim=state_dim, branch_sizes=branch_sizes)
+        self.target_net.load_state_dict(self.policy_net.state_dict())
+        self.optimizer = optim.Adam(self.policy_net.parameters(), lr=LEARNING_RATE)
+        self.replay_buffer = PrioritizedReplayBuffer(buffer_size, state_dim, alpha=PRIORITY_ALPHA, seed=seed)
+        self.buffer_lock = threading.Lock()
+
+        # Shared between processes
+        self.context = mp.get_context("spawn")
+        self.shared_net = BranchingDQN(input_dim=state_dim, branch_sizes=branch_sizes)
+        self.shared_net.load_state_dict(self.policy_net.state_dict())
+        self.shared_net.share_memory()
+        self.weights_version = self.context.Value("q", 0)
+        self.actor_versions = self.context.Array("q", [-1] * num_actors)  # Weights version each actor acts with
+        self.step_counts = self.context.Array("q", num_actors)
+        self.episode_counts = self.context.Array("q", num_actors)
+        self.transitions = self.context.Queue(maxsize=QUEUE_SIZE)
+        self.stop_event = self.context.Event()
+        self.actors = []
+        self.ingest_thread = None
+
+        # Learner-side counters
+        self.updates = 0
+        self.ingested = 0
+
+    def start(self):
+        """Start the actor processes and the ingest thread."""
+        for actor_id in range(self.num_actors):
+            process = self.context.Process(target=run_actor, daemon=True, args=(
+                actor_id, self.num_actors, self.shared_net, self.weights_version, self.actor_versions,
+                self.transitions, self.step_counts, self.episode_counts, self.stop_event, self.seed + actor_id + 1))
+            process.start()
+            self.actors.append(process)
+        self.ingest_thread = threading.Thread(target=self.ingest, daemon=True)
+        self.ingest_thread.start()
+
+    def ingest(self):
+        """Move transition batches from the actors into the replay buffer."""
+        while not self.stop_event.is_set():
+            try:
+                actor_id, batch = self.transitions.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            # Each actor's transitions are one stream, so n-step returns follow its episodes
+            with self.buffer_lock:
+                self.replay_buffer.add_batch(*batch, streams=np.full(len(batch[2]), actor_id))
+            self.ingested += len(batch[2])
+
+    def publish_weights(self):
+        with self.weights_version.get_lock():
+            self.shared_net.load_state_dict(self.policy_net.state_dict())
+            self.weights_version.value += 1
+
+    def learn_step(self):
+        """One update on a prioritized batch. The buffer is only locked for sampling and the priority update."""
+        beta = min(1.0, PRIORITY_BETA_START + (1.0 - PRIORITY_BETA_START) * self.updates / self.beta_updates)
+        with self.buffer_lock:
+            batch = sample_from_buffer(self.replay_buffer, self.batch_size, beta, n_step=N_STEP, gamma=GAMMA)
+        priorities = branching_update(self.policy_net, self.target_net, self.optimizer, batch)
+        with self.buffer_lock:
+            self.replay_buffer.update_priorities(batch[-1], priorities)
+
+        self.updates += 1
+        if self.updates % self.target_update == 0:
+            self.target_net.load_state_dict(self.policy_net.state_dict())
+        if self.updates % self.publish_every == 0:
+            self.publish_weights()
+
+    def stats(self, elapsed):
+        env_steps = sum(self.step_counts[:])
+        return {
+            "seconds": elapsed,
+            "updates": self.updates,
+            "updates_per_sec": self.updates / elapsed if elapsed else 0.0,
+            "env_steps": env_steps,
+            "env_steps_per_sec": env_steps / elapsed if elapsed else 0.0,
+            "episodes": sum(self.episode_counts[:]),
+            "ingested": self.ingested,
+            "buffer_size": len(self.replay_buffer)
+        }
+
+    def run(self, seconds=None, max_updates=None):
+        """
+        Train until seconds have passed or max_updates updates are done, then stop the actors.
+        Returns the final throughput counters.
+        """
+        if not self.actors:
+            self.start()
+        start = last_report = time.perf_counter()
+        try:
+            while True:
+                now = time.perf_counter()
+                if (seconds is not None and now - start >= seconds) or (max_updates is not None and self.updates >= max_updates):
+                    break
+                if len(self.replay_buffer) < self.batch_size:
+                    time.sleep(0.01)
+                    continue
+                self.learn_step()
+                if now - last_report >= self.report_seconds:
+                    last_report = now
+                    stats = self.stats(now - start)
+                    print(f"[learner] {stats['updates']} updates ({stats['updates_per_sec']:.0f}/s), "
+                          f"[actors] {stats['env_steps']} steps ({stats['env_steps_per_sec']:.0f}/s), "
+                          f"{stats['episodes']} episodes, buffer {stats['buffer_size']}")
+        finally:
+            stats = self.stats(time.perf_counter() - start)
+            self.close()
+        return stats
+
+    def close(self):
+        """Stop the actors and the ingest thread."""
+        self.stop_event.set()
+        for process in self.actors:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        if self.ingest_thread is not None:
+            self.ingest_thread.join(timeout=5)
+        self.actors = []
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Actor-learner training of the branching DQN")
+    parser.add_argument("--actors", type=int, default=max(1, mp.cpu_count() - 1), help="Number of actor processes")
+    parser.add_argument("--seconds", type=float, default=600, help="Training time")
+    parser.add_argument("--buffer-size", type=int, default=100000)
+    parser.add_argument("--report-seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    trainer = ActorLearner(num_actors=args.actors, buffer_size=args.buffer_size, report_seconds=args.report_seconds)
+    stats = trainer.run(seconds=args.seconds)
+    print(f"Training complete: {stats['updates']} updates, {stats['env_steps']} env steps, {stats['episodes']} episodes.")
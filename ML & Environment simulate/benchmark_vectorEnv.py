@@ -0,0 +1,71 @@
+import argparse
+import contextlib
+import io
+import time
+import numpy as np
+from lidaEnvironment import CompostingEnv, ACTION_COLUMNS
+from vectorEnv import VectorCompostingEnv, CHAMBER_KEYS
+from subprocVectorEnv import SubprocVectorEnv
+
+# Benchmark simulated unit-steps per second of the scalar env and of VectorCompostingEnv for several batch sizes
+
+def random_batched_actions(rng, num_envs, max_duration):
+    return {key: {"paddle": rng.integers(0, 2, size=(num_envs, 2)),
+                  "air_pump": rng.integers(0, 2, size=num_envs),
+                  "lid": rng.integers(0, 2, size=num_envs),
+                  "duration": rng.integers(1, max_duration, size=num_envs)} for key in CHAMBER_KEYS}
+
+def benchmark_scalar(num_steps, rng):
+    env = CompostingEnv()
+    env.reset()
+    batches = [random_batched_actions(rng, 1, 30) for _ in range(num_steps)]
+    actions = [{key: {"paddle": tuple(batch[key]["paddle"][0]),
+                      "air_pump": batch[key]["air_pump"][0],
+                      "lid": batch[key]["lid"][0],
+                      "duration": batch[key]["duration"][0]} for key in CHAMBER_KEYS} for batch in batches]
+
+    start = time.perf_counter()
+    # has_extreme_values prints debug output on every step
+    with contextlib.redirect_stdout(io.StringIO()):
+        for action in actions:
+            _, _, done, _ = env.step(action)
+            if done:
+                env.reset()
+    return num_steps / (time.perf_counter() - start)
+
+def benchmark_vector(num_envs, num_steps, rng):
+    env = VectorCompostingEnv(num_envs)
+    actions = [random_batched_actions(rng, num_envs, 30) for _ in range(num_steps)]
+
+    start = time.perf_counter()
+    for action in actions:
+        env.step(action)
+    return num_envs * num_steps / (time.perf_counter() - start)
+
+def benchmark_subproc(num_envs, num_workers, num_steps, rng):
+    actions = rng.integers(0, 2, size=(num_steps, num_envs, len(ACTION_COLUMNS)))
+    actions[:, :, 4::5] = rng.integers(1, 30, size=(num_steps, num_envs, 2))  # Duration columns
+    with SubprocVectorEnv(num_envs, num_workers=num_workers) as env:
+        env.reset()
+        start = time.perf_counter()
+        for action in actions:
+            env.step(action)
+        return num_envs * num_steps / (time.perf_counter() - start)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Steps/sec of CompostingEnv and VectorCompostingEnv")
+    parser.add_argument("--steps", type=int, default=200, help="Batched steps per measurement")
+    parser.add_argument("--num-envs", type=int, nargs="+", default=[1, 8, 64, 512, 4096])
+    parser.add_argument("--workers", type=int, default=0, help="Also measure SubprocVectorEnv with this many worker processes")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>8} {'steps/sec':>14}")
+    print(f"{'scalar':>8} {benchmark_scalar(args.steps, rng):>14,.0f}")
+    for num_envs in args.num_envs:
+        print(f"{num_envs:>8} {benchmark_vector(num_envs, args.steps, rng):>14,.0f}")
+    if args.workers:
+        print(f"SubprocVectorEnv, {args.workers} workers")
+        for num_envs in args.num_envs:
+            if num_envs >= args.workers:
+                print(f"{num_envs:>8} {benchmark_subproc(num_envs, args.workers, args.steps, rng):>14,.0f}")
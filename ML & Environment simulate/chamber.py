@@ -1,13 +1,25 @@
 import numpy as np
 
+# Clipped sensors come first so they form one contiguous block at the start of the buffer
+SENSORS = ("temperature", "moisture", "oxygen", "co2", "methane")
+CLIPPED_SENSORS = ("temperature", "moisture", "oxygen")  # Readings clipped to [-100, 100] on update
+FIXED_POINT_SCALE = 100  # Fixed-point mode stores readings as int32 hundredths (centi-units)
+
+def to_centi_units(value):
+    """Convert float readings or deltas to whole hundredths, truncating below 1/100."""
+    # Rounding to 6 places first absorbs float noise such as 0.29 * 100 = 28.999999999999996
+    return np.floor(np.round(np.multiply(value, FIXED_POINT_SCALE), 6)).astype(np.int64)
+
 class Chamber:
-    def __init__(self, temperature, moisture, oxygen, co2, methane, paddle_direction=1, lid_status=False, air_pump_status=False, isEmpty=True):
+    # Sensor data lives in one contiguous buffer, each sensor is a slice of it
+    __slots__ = ("_buffer", "_slices", "_layout", "_clipped", "_views", "_readonly_views", "_fixed_point",
+                 "paddle_status", "paddle_direction", "lid_status", "air_pump_status", "isEmpty")
+
+    def __init__(self, temperature, moisture, oxygen, co2, methane, paddle_direction=1, lid_status=False, air_pump_status=False, isEmpty=True, fixed_point=False):
         # Sensor Data as arrays for multiple sensors, truncating to 2 decimal places
-        self.temperature = self.truncate_to_2_decimals(np.array(temperature, dtype=float))
-        self.moisture = self.truncate_to_2_decimals(np.array(moisture, dtype=float))
-        self.oxygen = self.truncate_to_2_decimals(np.array(oxygen, dtype=float))
-        self.co2 = self.truncate_to_2_decimals(np.array(co2, dtype=float))
-        self.methane = self.truncate_to_2_decimals(np.array(methane, dtype=float))
+        # With fixed_point the buffer holds int32 centi-units and updates use integer arithmetic
+        self._fixed_point = fixed_point
+        self._allocate({"temperature": temperature, "moisture": moisture, "oxygen": oxygen, "co2": co2, "methane": methane})
         
         # Equipment Status
         self.paddle_status = False
@@ -16,6 +28,176 @@ class Chamber:
         self.air_pump_status = air_pump_status
         self.isEmpty = isEmpty
 
+    def _allocate(self, sensor_values, truncate=SENSORS):
+        """(Re)build the sensor buffer for the given values, truncating the listed sensors to 2 decimal places."""
+        values = {sensor: np.array(sensor_values[sensor], dtype=float).ravel() for sensor in SENSORS}
+        self._slices = {}
+        offset = 0
+        for sensor in SENSORS:
+            self._slices[sensor] = slice(offset, offset + len(values[sensor]))
+            offset += len(values[sensor])
+        self._layout = tuple(len(values[sensor]) for sensor in SENSORS)
+        self._clipped = slice(0, self._slices[CLIPPED_SENSORS[-1]].stop)
+        self._buffer = np.empty(offset, dtype=np.int32 if self._fixed_point else float)
+        self._views = {}
+        self._readonly_views = {}
+        for sensor, columns in self._slices.items():
+            view = self._buffer[columns]
+            if sensor in truncate and self._fixed_point:
+                view[:] = self._to_fixed_point(values[sensor])
+            else:
+                view[:] = values[sensor]
+                if sensor in truncate:
+                    self._truncate_in_place(view)
+            readonly = view.view()
+            readonly.flags.writeable = False
+            self._views[sensor] = view
+            self._readonly_views[sensor] = readonly
+
+    def _truncate_in_place(self, view):
+        """Truncate a buffer view to 2 decimal places without allocating."""
+        np.multiply(view, 100, out=view)
+        np.floor(view, out=view)
+        np.divide(view, 100, out=view)
+
+    def _to_fixed_point(self, value):
+        """Convert float readings or deltas to whole centi-units for the int32 buffer."""
+        return to_centi_units(value).astype(np.int32)
+
+    def _store(self, sensor, new_values):
+        """Write new values for one sensor, truncating to 2 decimal places in place."""
+        new_values = np.asarray(new_values, dtype=float).ravel()
+        view = self._views[sensor]
+        if len(new_values) != len(view):
+            # The number of sensors changed, rebuild the buffer layout
+            sensor_values = dict(self._views)
+            sensor_values[sensor] = new_values
+            self._allocate(sensor_values, truncate=(sensor,))
+            return
+        if self._fixed_point:
+            view[:] = self._to_fixed_point(new_values)
+            return
+        view[:] = new_values
+        self._truncate_in_place(view)
+
+    def _update(self, sensor, delta, index):
+        """Add delta to one sensor (or one of its readings), clipping where needed and truncating in place."""
+        view = self._views[sensor]
+        if index is not None and not 0 <= index < len(view):
+            name = "CO2" if sensor == "co2" else sensor.capitalize()
+            raise IndexError(f"{name} sensor index {index} out of range")
+        clipped = sensor in CLIPPED_SENSORS
+        if self._fixed_point:
+            # Integer arithmetic on centi-units, exact no matter how many updates are applied
+            limit = 100 * FIXED_POINT_SCALE
+            target = view if index is None else view[index:index + 1]
+            np.add(target, self._to_fixed_point(delta), out=target)
+            if clipped:
+                np.clip(target, -limit, limit, out=target)
+        elif index is not None:
+            updated_value = view[index] + delta
+            if clipped:
+                updated_value = np.clip(updated_value, -100, 100)
+            view[index] = self.truncate_to_2_decimals(updated_value)
+        else:
+            np.add(view, delta, out=view)
+            if clipped:
+                np.clip(view, -100, 100, out=view)
+            self._truncate_in_place(view)
+
+    def update_sensors(self, delta, mask=None):
+        """
+        Add a per-reading delta vector (in buffer order, see get_sensor_slices) to all sensors at once.
+        Only readings selected by mask are clipped and truncated, like the single-sensor updates.
+        """
+        buffer = self._buffer
+        clipped = buffer[self._clipped]
+        where = True if mask is None else mask
+        clip_where = True if mask is None else mask[self._clipped]
+        limit = 100
+        if self._fixed_point:
+            delta = self._to_fixed_point(delta)
+            limit = 100 * FIXED_POINT_SCALE
+        np.add(buffer, delta, out=buffer, where=where)
+        np.clip(clipped, -limit, limit, out=clipped, where=clip_where)
+        if not self._fixed_point:
+            np.multiply(buffer, 100, out=buffer, where=where)
+            np.floor(buffer, out=buffer, where=where)
+            np.divide(buffer, 100, out=buffer, where=where)
+
+    def copy_sensors_to(self, out):
+        """Write all readings as floats into out (e.g. a slice of an observation vector) without allocating."""
+        if self._fixed_point:
+            np.divide(self._buffer, FIXED_POINT_SCALE, out=out)
+        else:
+            np.copyto(out, self._buffer, casting="same_kind")
+
+    def get_centi_units(self):
+        """Return all readings as whole hundredths (int64) in buffer order."""
+        if self._fixed_point:
+            return self._buffer.astype(np.int64)
+        return to_centi_units(self._buffer)
+
+    def set_centi_units(self, values):
+        """Overwrite all readings from whole hundredths in buffer order, no further truncation needed."""
+        if self._fixed_point:
+            self._buffer[:] = values
+        else:
+            np.divide(values, FIXED_POINT_SCALE, out=self._buffer)
+
+    def get_sensor_buffer(self):
+        """Return a read-only view of the whole sensor buffer (float64 readings, or int32 centi-units in fixed-point mode)."""
+        buffer = self._buffer.view()
+        buffer.flags.writeable = False
+        return buffer
+
+    def load_sensor_buffer(self, layout, values):
+        """Restore all readings from a buffer saved with get_sensor_buffer() for the given layout, without truncating."""
+        if tuple(layout) == self._layout:
+            np.copyto(self._buffer, values)
+            return
+        # The saved chamber had a different number of readings, rebuild the buffer layout
+        bounds = np.cumsum((0,) + tuple(layout))
+        self._allocate({sensor: values[bounds[i]:bounds[i + 1]] for i, sensor in enumerate(SENSORS)}, truncate=())
+
+    def get_sensor_slices(self):
+        """Return the buffer slice of each sensor, the column order update_sensors expects."""
+        return self._slices
+
+    def get_layout(self):
+        """Return the number of readings per sensor, in SENSORS order."""
+        return self._layout
+
+    def _sensor_values(self, sensor):
+        """Float view of one sensor, converted to float32 in fixed-point mode."""
+        if self._fixed_point:
+            return np.divide(self._views[sensor], FIXED_POINT_SCALE, dtype=np.float32)
+        return self._readonly_views[sensor]
+
+    def is_fixed_point(self):
+        return self._fixed_point
+
+    # Read-only views into the sensor buffer (float32 copies in fixed-point mode)
+    @property
+    def temperature(self):
+        return self._sensor_values("temperature")
+
+    @property
+    def moisture(self):
+        return self._sensor_values("moisture")
+
+    @property
+    def oxygen(self):
+        return self._sensor_values("oxygen")
+
+    @property
+    def co2(self):
+        return self._sensor_values("co2")
+
+    @property
+    def methane(self):
+        return self._sensor_values("methane")
+
 
     def truncate_to_2_decimals(self, value):
         """Truncate a float or array to 2 decimal places without rounding."""
@@ -99,23 +281,23 @@ class Chamber:
     # Setters with truncation for each attribute
     def set_temperature(self, new_temp):
         """Set temperature values, ensuring each element is truncated to 2 decimal places."""
-        self.temperature = self.truncate_to_2_decimals(np.array(new_temp, dtype=float))
+        self._store("temperature", new_temp)
     
     def set_moisture(self, new_moisture):
         """Set moisture values, ensuring each element is truncated to 2 decimal places."""
-        self.moisture = self.truncate_to_2_decimals(np.array(new_moisture, dtype=float))
+        self._store("moisture", new_moisture)
     
     def set_oxygen(self, new_oxygen):
         """Set oxygen values, ensuring each element is truncated to 2 decimal places."""
-        self.oxygen = self.truncate_to_2_decimals(np.array(new_oxygen, dtype=float))
+        self._store("oxygen", new_oxygen)
     
     def set_co2(self, new_co2):
         """Set CO2 values, ensuring each element is truncated to 2 decimal places."""
-        self.co2 = self.truncate_to_2_decimals(np.array(new_co2, dtype=float))
+        self._store("co2", new_co2)
     
     def set_methane(self, new_methane):
         """Set methane values, ensuring each element is truncated to 2 decimal places."""
-        self.methane = self.truncate_to_2_decimals(np.array(new_methane, dtype=float))
+        self._store("methane", new_methane)
 
 
     # Equipment operation
@@ -148,69 +330,26 @@ class Chamber:
         """Close the lid"""
         self.lid_status = False
 
-    # Update temperature function with single or all sensor options
-    # Update functions with rounding for each attribute
-    # Update functions with truncation for each attribute
-  # Update temperature function with truncation for single or all sensor options
+    # Update functions with clipping and truncation, for single or all sensor options
     def update_temperature(self, delta, index=None):
         """Adjust temperature sensor readings with truncation."""
-        if index is not None:
-            if 0 <= index < len(self.temperature):
-                updated_value = self.temperature[index] + delta
-                self.temperature[index] = self.truncate_to_2_decimals(np.clip(updated_value, -100, 100))
-            else:
-                raise IndexError(f"Temperature sensor index {index} out of range")
-        else:
-            updated_values = self.temperature + delta
-            self.temperature = self.truncate_to_2_decimals(np.clip(updated_values, -100, 100))
+        self._update("temperature", delta, index)
 
     def update_moisture(self, delta, index=None):
         """Adjust moisture sensor readings with truncation."""
-        if index is not None:
-            if 0 <= index < len(self.moisture):
-                updated_value = self.moisture[index] + delta
-                self.moisture[index] = self.truncate_to_2_decimals(np.clip(updated_value, -100, 100))
-            else:
-                raise IndexError(f"Moisture sensor index {index} out of range")
-        else:
-            updated_values = self.moisture + delta
-            self.moisture = self.truncate_to_2_decimals(np.clip(updated_values, -100, 100))
+        self._update("moisture", delta, index)
 
     def update_oxygen(self, delta, index=None):
         """Update oxygen sensor readings with truncation."""
-        if index is not None:
-            if 0 <= index < len(self.oxygen):
-                updated_value = self.oxygen[index] + delta
-                self.oxygen[index] = self.truncate_to_2_decimals(np.clip(updated_value, -100, 100))
-            else:
-                raise IndexError(f"Oxygen sensor index {index} out of range")
-        else:
-            updated_values = self.oxygen + delta
-            self.oxygen = self.truncate_to_2_decimals(np.clip(updated_values, -100, 100))
+        self._update("oxygen", delta, index)
 
     def update_co2(self, delta, index=None):
         """Update CO2 sensor readings with truncation."""
-        if index is not None:
-            if 0 <= index < len(self.co2):
-                updated_value = self.co2[index] + delta
-                self.co2[index] = self.truncate_to_2_decimals(updated_value)
-            else:
-                raise IndexError(f"CO2 sensor index {index} out of range")
-        else:
-            updated_values = self.co2 + delta
-            self.co2 = self.truncate_to_2_decimals(updated_values)
+        self._update("co2", delta, index)
     
     def update_methane(self, delta, index=None):
         """Update methane sensor readings with truncation."""
-        if index is not None:
-            if 0 <= index < len(self.methane):
-                updated_value = self.methane[index] + delta
-                self.methane[index] = self.truncate_to_2_decimals(updated_value)
-            else:
-                raise IndexError(f"Methane sensor index {index} out of range")
-        else:
-            updated_values = self.methane + delta
-            self.methane = self.truncate_to_2_decimals(updated_values)
+        self._update("methane", delta, index)
 
 
     def get_status(self):
@@ -0,0 +1,188 @@
+import heapq
+import itertools
+import numpy as np
+from chamber import CLIPPED_SENSORS, FIXED_POINT_SCALE, to_centi_units
+from lidaEnvironment import CompostingEnv, CHAMBER_KEYS, EPISODE_MIN_TIME, centi_factors
+
+ACTUATORS = ("paddle", "paddle_direction", "air_pump", "lid")
+CARRY_SCALE = 1000  # Per-second rates times milliseconds, the carry is kept in 1/1000 hundredths
+
+
+class EventDrivenSimulation:
+    """
+    Event-driven clock around a CompostingEnv.
+
+    Actuator on/off transitions are kept in a priority queue ordered by time in milliseconds, the
+    way the ESP32 automation tasks (motorAutomationTask, airPumpAutomationTask) switch them. Between
+    two events the equipment status is constant and the sensors are integrated over the whole
+    interval at once from the env's action-effect tables:
+        - paddle and air pump effects are per second and integrated exactly in hundredths, the part
+          below one hundredth is carried over to later intervals
+        - natural changes are per step, a chamber gets them after every time_increment it has been
+          idle in total, however the idle time is split by events
+    So the result does not depend on how events split the timeline. Idle stretches of whole steps
+    (paddle and air pump off in both chambers) go through env.advance(), and the episode ends at
+    the first millisecond check_done() holds, or the step it would for idle time.
+    """
+
+    def __init__(self, env=None):
+        self.env = env if env is not None else CompostingEnv(verbose=False)
+        self.events = []
+        self.sequence = itertools.count()  # Keeps events at the same time in scheduling order
+        self.time_ms = self.env.state['time'] * 1000
+        self.done = False
+        self.idle_ms = {key: 0 for key in CHAMBER_KEYS}  # Idle time towards each chamber's next natural step
+        self.carry = {key: 0 for key in CHAMBER_KEYS}  # Component change below one hundredth, in CARRY_SCALE units
+
+    def schedule(self, time_ms, chamber_key, actuator, value):
+        """
+        Schedule an actuator transition at an absolute simulated time in milliseconds.
+            - paddle, air_pump, lid: True (on/open) or False (off/closed)
+            - paddle_direction: 1 for clockwise, -1 for counterclockwise
+        """
+        if chamber_key not in CHAMBER_KEYS:
+            raise ValueError(f"Unknown chamber {chamber_key}")
+        if actuator not in ACTUATORS:
+            raise ValueError(f"Unknown actuator {actuator}")
+        if time_ms < self.time_ms:
+            raise ValueError("Cannot schedule an event in the past")
+        heapq.heappush(self.events, (time_ms, next(self.sequence), chamber_key, actuator, value))
+
+    def schedule_pulse(self, time_ms, chamber_key, actuator, duration_ms):
+        """
+        Switch an actuator on at time_ms and off again duration_ms later, like the automation tasks
+        (turn on, vTaskDelay(automation_*_time), turn off).
+        """
+        self.schedule(time_ms, chamber_key, actuator, True)
+        self.schedule(time_ms + duration_ms, chamber_key, actuator, False)
+
+    def run_until(self, end_time_ms):
+        """
+        Process every event up to end_time_ms and integrate the sensors in between.
+        Stops early when the episode is done. Returns (observation, reward, done, info) with the
+        number of events processed and integration segments in info.
+        """
+        events, segments = 0, 0
+        while not self.done and self.events and self.events[0][0] <= end_time_ms:
+            segments += self.integrate_to(self.events[0][0])
+            if self.done:
+                break  # Events from the end of the episode on stay queued
+            _, _, chamber_key, actuator, value = heapq.heappop(self.events)
+            self.apply_event(chamber_key, actuator, value)
+            events += 1
+        if not self.done:
+            segments += self.integrate_to(end_time_ms)
+        info = {"events": events, "segments": segments, "time_ms": self.time_ms}
+        return self.env.get_observation(), self.env.calculate_reward(), self.done, info
+
+    def apply_event(self, chamber_key, actuator, value):
+        """Switch one actuator of one chamber."""
+        chamber = getattr(self.env, chamber_key)
+        if actuator == "paddle":
+            chamber.operate_paddle(bool(value))
+        elif actuator == "paddle_direction":
+            chamber.change_paddle_direction(value)
+        elif actuator == "air_pump":
+            chamber.simulate_air_pump(bool(value))
+        elif value:
+            chamber.open_lid()
+        else:
+            chamber.close_lid()
+
+    def integrate_to(self, time_ms):
+        """
+        Apply the sensor changes from the current time to time_ms under the current equipment status.
+        Returns the number of integration segments used (0 when no time passes).
+        """
+        env = self.env
+        step_ms = env.time_increment * 1000
+        segments = 0
+        while not self.done and time_ms > self.time_ms:
+            idle = {key: not (getattr(env, key).get_paddle_status() or getattr(env, key).get_air_pump_status())
+                    for key in CHAMBER_KEYS}
+            remaining = time_ms - self.time_ms
+            whole_steps = int(remaining // step_ms)
+            if whole_steps and all(idle.values()) and not any(self.idle_ms.values()):
+                # Closed form over whole idle steps, stops at the step the episode would end
+                _, _, self.done, info = env.advance(whole_steps)
+                self.time_ms += info["steps"] * step_ms
+            else:
+                # Up to the next natural step of an idle chamber, or time_ms
+                elapsed = min([remaining] + [step_ms - self.idle_ms[key] for key in CHAMBER_KEYS if idle[key]])
+                self.integrate_segment(int(elapsed), idle)
+            segments += 1
+        return segments
+
+    def integrate_segment(self, elapsed_ms, idle):
+        """
+        Integrate elapsed_ms under constant equipment status, stopping at the first millisecond the
+        episode is done, then apply the natural step of every idle chamber that completes one.
+        """
+        env = self.env
+        start_ms = self.time_ms
+        tracks = {key: self.component_track(key) for key in CHAMBER_KEYS}
+
+        def factors_at(key, ms):
+            *_, slices, fixed_point = tracks[key]
+            return centi_factors(self.readings_at(tracks[key], ms)[0], slices, fixed_point)
+
+        # Readings only move monotonically within the segment, and without crossing an extreme
+        # limit check_done() can only turn True inside it from EPISODE_MIN_TIME on
+        self.write_readings(tracks, start_ms, elapsed_ms)
+        if env.check_done() or env.state['time'] >= EPISODE_MIN_TIME:
+            done_ms, _ = env.first_done_step(factors_at, elapsed_ms, lambda ms: (start_ms + ms) / 1000)
+            if done_ms is not None:
+                self.write_readings(tracks, start_ms, done_ms)
+                self.done = True
+                elapsed_ms = done_ms
+
+        for key in CHAMBER_KEYS:
+            if idle[key]:
+                self.idle_ms[key] += elapsed_ms
+        if self.done:
+            return
+
+        # Natural changes per completed idle step, with the same truncation as step()
+        stepped = [key for key in CHAMBER_KEYS if self.idle_ms[key] >= env.time_increment * 1000]
+        for key in stepped:
+            chamber = getattr(env, key)
+            _, natural, touched = env.get_action_effects(chamber)
+            chamber.update_sensors(natural[0, 0, 0], touched[0, 0, 0])
+            self.idle_ms[key] = 0
+        if stepped:
+            self.done = env.check_done()
+
+    def component_track(self, key):
+        """Readings, carry, per-stage rates and clip range of a chamber at the start of a segment."""
+        chamber = getattr(self.env, key)
+        rates, _, touched = self.env.get_action_effects(chamber)
+        status = (int(chamber.get_paddle_status()), int(chamber.get_air_pump_status()))
+        stages = [(to_centi_units(stage_rates), stage_touched)
+                  for stage_rates, stage_touched in zip(rates[status], touched[status]) if stage_rates.any()]
+        slices = chamber.get_sensor_slices()
+        centi = chamber.get_centi_units()
+        carry = self.carry[key] if np.shape(self.carry[key]) in ((), centi.shape) else 0  # Layout changed
+        lower = np.full(len(centi), -2 ** 62)
+        upper = np.full(len(centi), 2 ** 62)
+        for sensor in CLIPPED_SENSORS:
+            lower[slices[sensor]], upper[slices[sensor]] = -100 * FIXED_POINT_SCALE, 100 * FIXED_POINT_SCALE
+        return centi, carry, stages, lower, upper, slices, chamber.is_fixed_point()
+
+    @staticmethod
+    def readings_at(track, ms):
+        """Readings in whole hundredths and the carry after ms milliseconds of a segment."""
+        centi, carry, stages, lower, upper, _, _ = track
+        for stage_rates, stage_touched in stages:
+            # Each stage is clipped on its own, like update_state() does
+            total = carry + stage_rates * ms
+            centi = np.where(stage_touched, np.clip(centi + total // CARRY_SCALE, lower, upper), centi)
+            carry = total % CARRY_SCALE
+        return centi, carry
+
+    def write_readings(self, tracks, start_ms, ms):
+        """Set both chambers to their readings ms milliseconds into a segment and move the clock there."""
+        for key, track in tracks.items():
+            centi, self.carry[key] = self.readings_at(track, ms)
+            getattr(self.env, key).set_centi_units(centi)
+        self.time_ms = start_ms + ms
+        self.env.state['time'] = self.time_ms / 1000
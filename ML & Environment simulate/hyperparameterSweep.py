@@ -0,0 +1,173 @@
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import random
+import statistics
+import time
+import torch
+import torch.multiprocessing as mp
+from MLTraining import make_config, train
+
+# Values tried for each option by default, any DEFAULT_CONFIG option can be swept
+DEFAULT_SPACE = {
+    "gamma": [0.95, 0.99],
+    "batch_size": [32, 64],
+    "learning_rate": [0.001, 0.0005],
+    "epsilon_decay": [0.99, 0.995],
+    "target_update_frequency": [5, 10]
+}
+
+
+def grid_trials(space):
+    """Every combination of the values in space, as a list of option dictionaries."""
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[key] for key in keys))]
+
+
+def random_trials(space, num_trials, seed=0):
+    """num_trials distinct combinations drawn at random (the whole grid if it is smaller)."""
+    trials = grid_trials(space)
+    random.Random(seed).shuffle(trials)
+    return trials[:num_trials]
+
+
+class MedianPruner:
+    """
+    Stops trials whose reward curve falls behind the others.
+
+    Every interval episodes after warmup episodes, a trial records the mean reward of its last window
+    episodes in curves (a dictionary shared between the worker processes). It is pruned when at least
+    min_trials other trials have reached the same episode and its value is below their median.
+    """
+
+    def __init__(self, curves, warmup=20, interval=5, window=10, min_trials=3):
+        self.curves = curves
+        self.warmup = warmup
+        self.interval = interval
+        self.window = window
+        self.min_trials = min_trials
+
+    def should_prune(self, trial_id, episode, rewards):
+        if (episode + 1) < self.warmup or (episode + 1) % self.interval != 0:
+            return False
+        value = statistics.fmean(rewards[-self.window:])
+        curve = self.curves.get(trial_id, {})
+        curve[episode] = value
+        self.curves[trial_id] = curve  # Reassign so the shared dictionary sees the change
+        others = [other[episode] for other_id, other in self.curves.items() if other_id != trial_id and episode in other]
+        return len(others) >= self.min_trials and value < statistics.median(others)
+
+
+def pin_worker(cpus):
+    """Pool initializer: pin this worker process to one CPU from the queue and use a single torch thread."""
+    torch.set_num_threads(1)
+    cpu = cpus.get()
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+
+def run_trial(trial_id, params, base_config, curves, pruning):
+    """Train one configuration in a pool worker and return its row of the results table."""
+    config = make_config(base_config, **params)
+    # Every trial starts from the same seed, so reward differences come from the options and not the draws
+    config.update(seed=config["seed"] or 0, checkpoint_every=0, resume=False, verbose=False)
+    pruner = MedianPruner(curves, **pruning)
+    rewards = []
+
+    def report(episode, total_reward):
+        rewards.append(total_reward)
+        return not pruner.should_prune(trial_id, episode, rewards)
+
+    start = time.perf_counter()
+    status = "complete"
+    try:
+        result = train(config, report=report)
+        if result["stopped"]:
+            status = "pruned"
+    except Exception as error:  # One failing configuration should not end the sweep
+        status = f"failed: {error}"
+    window = rewards[-pruning["window"]:]
+    return {
+        "trial": trial_id,
+        **{key: json.dumps(value) if isinstance(value, (list, tuple)) else value for key, value in params.items()},
+        "status": status,
+        "episodes": len(rewards),
+        "mean_reward": statistics.fmean(window) if window else float("nan"),
+        "best_reward": max(rewards) if rewards else float("nan"),
+        "seconds": round(time.perf_counter() - start, 2),
+        "cpu": sorted(os.sched_getaffinity(0))[0] if hasattr(os, "sched_getaffinity") else None
+    }
+
+
+def sweep(trials, base_config=None, workers=None, pruning=None, output=None):
+    """
+    Run every trial (a dictionary of DEFAULT_CONFIG overrides) across a pool of worker processes, one
+    pinned CPU per worker, prune trials that fall behind and write the results table to output (CSV),
+    best mean reward first. Returns the rows.
+    """
+    pruning = {"warmup": 20, "interval": 5, "window": 10, "min_trials": 3, **(pruning or {})}
+    available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(mp.cpu_count()))
+    workers = min(workers or len(available), len(trials))
+
+    context = mp.get_context("spawn")
+    with context.Manager() as manager:
+        curves = manager.dict()
+        cpus = context.Queue()
+        for i in range(workers):
+            cpus.put(available[i % len(available)] if len(available) >= workers else None)
+        with context.Pool(workers, initializer=pin_worker, initargs=(cpus,)) as pool:
+            pending = [pool.apply_async(run_trial, (trial_id, params, base_config or {}, curves, pruning))
+                       for trial_id, params in enumerate(trials)]
+            rows = [result.get() for result in pending]
+
+    rows.sort(key=lambda row: (row["status"] != "complete", math.inf if math.isnan(row["mean_reward"]) else -row["mean_reward"]))
+    if output:
+        with open(output, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+    return rows
+
+
+def parse_space(options):
+    """Parse KEY=V1,V2,... options into a search space, values are read as JSON when possible."""
+    space = {}
+    for option in options:
+        key, _, values = option.partition("=")
+        parsed = []
+        for value in values.split(","):
+            try:
+                parsed.append(json.loads(value))
+            except json.JSONDecodeError:
+                parsed.append(value)
+        space[key] = parsed
+    return space
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel hyperparameter sweep of the DQN trainer in MLTraining.py")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=V1,V2", help="Values to try for an option, replaces the default search space")
+    parser.add_argument("--trials", type=int, default=0, help="Random combinations to run, 0 runs the full grid")
+    parser.add_argument("--episodes", type=int, default=100, help="Episodes per trial")
+    parser.add_argument("--max-steps", type=int, default=500, help="Steps per episode cap")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes, default one per available CPU")
+    parser.add_argument("--warmup", type=int, default=20, help="Episodes before a trial can be pruned")
+    parser.add_argument("--interval", type=int, default=5, help="Episodes between pruning checks")
+    parser.add_argument("--min-trials", type=int, default=3, help="Other trials needed at the same episode to prune")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="sweep_results.csv")
+    args = parser.parse_args()
+
+    space = parse_space(args.param) if args.param else DEFAULT_SPACE
+    trials = random_trials(space, args.trials, args.seed) if args.trials else grid_trials(space)
+    base_config = {"num_episodes": args.episodes, "max_steps": args.max_steps, "seed": args.seed}
+    pruning = {"warmup": args.warmup, "interval": args.interval, "min_trials": args.min_trials}
+
+    print(f"Running {len(trials)} trials")
+    rows = sweep(trials, base_config, args.workers, pruning, args.output)
+    for row in rows:
+        print(", ".join(f"{key}={value}" for key, value in row.items()))
+    print(f"Results written to {args.output}")
@@ -1,14 +1,119 @@
 import gym
 from gym import spaces
+import pickle
+import struct
 import numpy as np
 import config  # Import config.py file directly
 import json
 import random
-from chamber import Chamber
+from chamber import Chamber, SENSORS, CLIPPED_SENSORS, FIXED_POINT_SCALE, to_centi_units
+
+CHAMBER_KEYS = ("active_chamber", "curing_chamber")
+# Columns of a flat action row, same order as MLTraining.encode_action
+ACTION_FIELDS = ("paddle_status", "paddle_direction", "air_pump", "lid", "duration")
+ACTION_COLUMNS = tuple((chamber_key, field) for chamber_key in CHAMBER_KEYS for field in ACTION_FIELDS)
+EPISODE_MIN_TIME = 14 * 24 * 60 * 60  # Earliest successful completion
+EPISODE_MAX_TIME = 20 * 24 * 60 * 60  # Episode ends due to excessive duration
+# Snapshot layout, see CompostingEnv.get_state()
+STATE_HEADER = struct.Struct("<dcB")  # time, sensor dtype ('d' float64 or 'i' int32), RNG kind
+CHAMBER_HEADER = struct.Struct("<?b???5H")  # paddle, direction, lid, air pump, isEmpty, readings per sensor
+PCG64_STATE = struct.Struct("<16s16sBI")  # state, increment, has_uint32, uinteger
+RNG_NONE, RNG_PCG64, RNG_PICKLED = 0, 1, 2
+
+
+def action_to_array(action, out=None):
+    """Write an action dictionary into a flat integer row laid out as ACTION_COLUMNS."""
+    row = np.empty(len(ACTION_COLUMNS), dtype=np.int64) if out is None else out
+    for i, chamber_key in enumerate(CHAMBER_KEYS):
+        chamber_action = action[chamber_key]
+        offset = i * len(ACTION_FIELDS)
+        row[offset] = chamber_action['paddle'][0]
+        row[offset + 1] = chamber_action['paddle'][1]
+        row[offset + 2] = chamber_action['air_pump']
+        row[offset + 3] = chamber_action['lid']
+        row[offset + 4] = chamber_action['duration']
+    return row
+
+
+def array_to_action(row):
+    """Convert a flat action row laid out as ACTION_COLUMNS back into an action dictionary."""
+    action = {}
+    for i, chamber_key in enumerate(CHAMBER_KEYS):
+        paddle_status, paddle_direction, air_pump, lid, duration = (int(value) for value in row[i * len(ACTION_FIELDS):(i + 1) * len(ACTION_FIELDS)])
+        action[chamber_key] = {
+            "paddle": (paddle_status, paddle_direction),
+            "air_pump": air_pump,
+            "lid": lid,
+            "duration": duration
+        }
+    return action
+
+
+def first_true_step(predicate, low, high):
+    """Smallest step in [low, high] where predicate holds, for a predicate that stays true once true. None if never."""
+    if not predicate(high):
+        return None
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(middle):
+            high = middle
+        else:
+            low = middle + 1
+    return low
+
+
+def true_interval(predicate, steps):
+    """
+    Steps in [1, steps] where a predicate on a monotone quantity holds, as (first, last) or None.
+    Such a predicate is true on a prefix or on a suffix of the steps, so two binary searches find it.
+    """
+    if predicate(1):
+        first_false = first_true_step(lambda step: not predicate(step), 1, steps)
+        return (1, steps if first_false is None else first_false - 1)
+    first = first_true_step(predicate, 1, steps)
+    return None if first is None else (first, steps)
+
+
+def intersect_intervals(intervals):
+    """Intersection of (first, last) step intervals, None if empty."""
+    first, last = 1, float("inf")
+    for interval in intervals:
+        if interval is None:
+            return None
+        first, last = max(first, interval[0]), min(last, interval[1])
+    return (first, last) if first <= last else None
+
+
+def centi_factors(centi, slices, fixed_point):
+    """
+    The values calculate_reward and check_done look at, from a chamber's readings in whole hundredths,
+    the same the chamber getters would return for them.
+    """
+    values = centi.astype(np.float32) / np.float32(FIXED_POINT_SCALE) if fixed_point else centi / FIXED_POINT_SCALE
+    return {
+        "co2": values[slices["co2"].start],
+        "methane": values[slices["methane"].start],
+        "oxygen": values[slices["oxygen"].start],
+        "temperature": np.mean(values[slices["temperature"]]),
+        "moisture": np.mean(values[slices["moisture"]])
+    }
+
 
 class CompostingEnv(gym.Env):
-    def __init__(self):
+    def __init__(self, fixed_point=False, observation_mode="dict", verbose=True):
+        """
+        fixed_point: store chamber readings as int32 centi-units, so updates are exact integer
+        arithmetic and observations are float32. Long episodes are then bit-reproducible.
+        observation_mode: "dict" for the nested observation, or "flat" for one preallocated float32
+        vector laid out as described by observation_layout.
+        verbose: print the extreme-value debug output on every check.
+        """
         super(CompostingEnv, self).__init__()
+        if observation_mode not in ("dict", "flat"):
+            raise ValueError("observation_mode must be 'dict' or 'flat'")
+        self.fixed_point = fixed_point
+        self.observation_mode = observation_mode
+        self.verbose = verbose
 
         # 0.1 Load configuration for max_duration from config.py
         self.max_duration = config.max_duration  # Use the max_duration from config.py
@@ -36,8 +141,19 @@ class CompostingEnv(gym.Env):
             "co2": (0, 70),
             "methane": (0, 30)
         }
+        # Natural decay or fluctuation per step when no components are active (placeholders)
+        self.natural_changes = {
+            "temperature": -0.1,  # Natural cooling
+            "moisture": -0.05,  # Gradual drying
+            "methane": 0.02,  # Methane builds up slowly
+            "oxygen": -0.03,  # Oxygen gradually depletes
+            "co2": 0.04  # CO2 increases due to decomposition
+        }
         # 1.1 Initialize state with time as 0, time increase in step() function
         self.state = {"time": 0}
+        self.time_increment = 360  # Simulated seconds per step
+        # Action-effect tables per chamber sensor layout, see build_action_effects()
+        self.action_effects = {}
 
         # 2. Create two Chamber instances with initial sensor values
         self.active_chamber = Chamber(
@@ -46,7 +162,8 @@ class CompostingEnv(gym.Env):
             oxygen=np.array([15.0]),
             co2=np.array([5.0]),
             methane=np.array([1.0]),
-            isEmpty=False
+            isEmpty=False,
+            fixed_point=fixed_point
         )
 
         self.curing_chamber = Chamber(
@@ -55,7 +172,8 @@ class CompostingEnv(gym.Env):
             oxygen=np.array([18.0]),
             co2=np.array([6.0]),
             methane=np.array([2.0]),
-            isEmpty=True
+            isEmpty=True,
+            fixed_point=fixed_point
         )
 
         # Define observation and action spaces (assuming similar structure as provided)
@@ -76,6 +194,9 @@ class CompostingEnv(gym.Env):
             })
         })
 
+        if observation_mode == "flat":
+            self.build_flat_observation()
+
         self.action_space = spaces.Dict({
             "active_chamber": spaces.Dict({
                 "paddle": spaces.Tuple((
@@ -99,8 +220,15 @@ class CompostingEnv(gym.Env):
 
     def reset(self):
         """
-        Reset the environment by resetting both chambers' states.
+        Reset the environment by resetting both chambers' states, their equipment and the clock.
         """
+        self.state['time'] = 0
+        for chamber in (self.active_chamber, self.curing_chamber):
+            chamber.operate_paddle(False)
+            chamber.change_paddle_direction(1)
+            chamber.simulate_air_pump(False)
+            chamber.close_lid()
+
         self.active_chamber.set_temperature(np.array([50.0, 52.0, 51.0, 50.0], dtype=float))
         self.active_chamber.set_moisture(np.array([60.0, 62.0], dtype=float))
         self.active_chamber.set_oxygen(np.array([15.0], dtype=float))
@@ -119,25 +247,64 @@ class CompostingEnv(gym.Env):
 
 
     
+    def build_flat_observation(self):
+        """
+        Allocate the flat observation vector and publish its layout.
+        observation_layout holds one (offset, chamber, sensor, index) entry per vector element, in the
+        same order flatten_state uses: each chamber's sensors in SENSORS order followed by isEmpty.
+        """
+        layout = []
+        self.flat_chamber_slices = {}
+        for chamber_key in CHAMBER_KEYS:
+            chamber = getattr(self, chamber_key)
+            start = len(layout)
+            for sensor, count in zip(SENSORS, chamber.get_layout()):
+                layout.extend((len(layout), chamber_key, sensor, index) for index in range(count))
+            self.flat_chamber_slices[chamber_key] = slice(start, len(layout))
+            layout.append((len(layout), chamber_key, "isEmpty", 0))
+        self.observation_layout = tuple(layout)
+        self.flat_layout_key = (self.active_chamber.get_layout(), self.curing_chamber.get_layout())
+        self.flat_observation = np.zeros(len(layout), dtype=np.float32)
+        if self.observation_mode == "flat":
+            self.observation_space = spaces.Box(low=0, high=100, shape=(len(layout),), dtype=np.float32)
+
+    def get_flat_observation(self):
+        """
+        Write both chambers into the preallocated float32 observation vector and return it.
+        The same array is reused on every call, copy it to keep an observation across steps.
+        """
+        if getattr(self, "flat_layout_key", None) != (self.active_chamber.get_layout(), self.curing_chamber.get_layout()):
+            # The number of sensor readings changed, rebuild the layout
+            self.build_flat_observation()
+        for chamber_key in CHAMBER_KEYS:
+            chamber = getattr(self, chamber_key)
+            columns = self.flat_chamber_slices[chamber_key]
+            chamber.copy_sensors_to(self.flat_observation[columns])
+            self.flat_observation[columns.stop] = chamber.get_isEmpty()
+        return self.flat_observation
+
     def get_observation(self):
         """
         Return the observation for both active and curing chambers.
+        Sensor values are copied, the chamber getters return views that change on the next step.
         """
+        if self.observation_mode == "flat":
+            return self.get_flat_observation()
         observation = {
             "active_chamber": {
-                "temperature": self.active_chamber.get_temperature(),
-                "moisture": self.active_chamber.get_moisture(),
-                "oxygen": self.active_chamber.get_oxygen(),
-                "co2": self.active_chamber.get_co2(),
-                "methane": self.active_chamber.get_methane(),
+                "temperature": self.active_chamber.get_temperature().copy(),
+                "moisture": self.active_chamber.get_moisture().copy(),
+                "oxygen": self.active_chamber.get_oxygen().copy(),
+                "co2": self.active_chamber.get_co2().copy(),
+                "methane": self.active_chamber.get_methane().copy(),
                 "isEmpty": self.active_chamber.get_isEmpty()
             },
             "curing_chamber": {
-                "temperature": self.curing_chamber.get_temperature(),
-                "moisture": self.curing_chamber.get_moisture(),
-                "oxygen": self.curing_chamber.get_oxygen(),
-                "co2": self.curing_chamber.get_co2(),
-                "methane": self.curing_chamber.get_methane(),
+                "temperature": self.curing_chamber.get_temperature().copy(),
+                "moisture": self.curing_chamber.get_moisture().copy(),
+                "oxygen": self.curing_chamber.get_oxygen().copy(),
+                "co2": self.curing_chamber.get_co2().copy(),
+                "methane": self.curing_chamber.get_methane().copy(),
                 "isEmpty": self.curing_chamber.get_isEmpty()
             }
         }
@@ -148,8 +315,7 @@ class CompostingEnv(gym.Env):
         Execute an action, update the state, calculate reward, and return the results.
         """
         # Increment the time by a simulated amount (Assuming each step represents one hour)
-        time_increment = 360  
-        self.state['time'] += time_increment
+        self.state['time'] += self.time_increment
 
         # Step 1: Apply actions to both chambers
         self.apply_action(self.active_chamber, action['active_chamber'])
@@ -167,6 +333,119 @@ class CompostingEnv(gym.Env):
         # Step 5: Return the new state, reward, completion status, and any debug information
         return self.get_observation(), reward, done, {}
 
+    def get_state(self):
+        """
+        Snapshot the full simulation state as a compact immutable bytes blob: the clock, both chambers'
+        sensor buffers and equipment status, isEmpty and the RNG state. Restore it with set_state().
+        """
+        chambers = [getattr(self, key) for key in CHAMBER_KEYS]
+        buffers = [chamber.get_sensor_buffer() for chamber in chambers]
+        parts = []
+        rng = self._np_random
+        if rng is None:
+            rng_kind = RNG_NONE
+        elif type(rng.bit_generator).__name__ == "PCG64":
+            rng_kind = RNG_PCG64
+            rng_state = rng.bit_generator.state
+            parts.append(PCG64_STATE.pack(rng_state["state"]["state"].to_bytes(16, "little"),
+                                          rng_state["state"]["inc"].to_bytes(16, "little"),
+                                          rng_state["has_uint32"], rng_state["uinteger"]))
+        else:
+            rng_kind = RNG_PICKLED
+            parts.append(pickle.dumps(rng.bit_generator.state))
+
+        header = [STATE_HEADER.pack(self.state['time'], buffers[0].dtype.char.encode(), rng_kind)]
+        for chamber, buffer in zip(chambers, buffers):
+            header.append(CHAMBER_HEADER.pack(chamber.paddle_status, chamber.paddle_direction, chamber.lid_status,
+                                              chamber.air_pump_status, chamber.isEmpty, *chamber.get_layout()))
+            header.append(buffer.tobytes())
+        return b"".join(header + parts)
+
+    def set_state(self, blob):
+        """
+        Restore a snapshot taken with get_state().
+        """
+        time, dtype, rng_kind = STATE_HEADER.unpack_from(blob)
+        self.state['time'] = int(time) if time.is_integer() else time
+        offset = STATE_HEADER.size
+        for chamber_key in CHAMBER_KEYS:
+            chamber = getattr(self, chamber_key)
+            paddle, direction, lid, air_pump, isEmpty, *layout = CHAMBER_HEADER.unpack_from(blob, offset)
+            offset += CHAMBER_HEADER.size
+            buffer = chamber.get_sensor_buffer()
+            if buffer.dtype.char != dtype.decode():
+                raise ValueError("Snapshot was taken from an environment with a different fixed_point setting")
+            count = sum(layout)
+            chamber.load_sensor_buffer(layout, np.frombuffer(blob, dtype=buffer.dtype, count=count, offset=offset))
+            offset += count * buffer.itemsize
+            chamber.paddle_status, chamber.paddle_direction, chamber.lid_status = paddle, direction, lid
+            chamber.air_pump_status, chamber.isEmpty = air_pump, isEmpty
+
+        if rng_kind == RNG_PCG64:
+            rng_state, increment, has_uint32, uinteger = PCG64_STATE.unpack_from(blob, offset)
+            self.np_random.bit_generator.state = {
+                "bit_generator": "PCG64",
+                "state": {"state": int.from_bytes(rng_state, "little"), "inc": int.from_bytes(increment, "little")},
+                "has_uint32": has_uint32,
+                "uinteger": uinteger
+            }
+        elif rng_kind == RNG_PICKLED:
+            self.np_random.bit_generator.state = pickle.loads(blob[offset:])
+        else:
+            self._np_random = None
+
+    def rollout(self, policy, max_steps, batched=False):
+        """
+        Run one episode from reset (clock back to 0) for at most max_steps steps, without building
+        per-step observation dictionaries, and return it as preallocated arrays:
+            - observations (T, D) float32: flat observation (see observation_layout) each action was chosen on
+            - actions (T, A) int64: action rows laid out as ACTION_COLUMNS
+            - rewards (T,), dones (T,), times (T,): results of each step, times in simulated seconds
+            - final_observation (D,): observation after the last step
+        policy(observation) gets the flat observation, or a (1, D) batch when batched is True, and
+        returns an action dictionary or an action row (a (1, A) batch when batched).
+        """
+        self.reset()
+        observation = self.get_flat_observation()
+        observations = np.empty((max_steps, len(observation)), dtype=np.float32)
+        actions = np.empty((max_steps, len(ACTION_COLUMNS)), dtype=np.int64)
+        rewards = np.empty(max_steps)
+        dones = np.zeros(max_steps, dtype=bool)
+        times = np.empty(max_steps)
+
+        steps = 0
+        for t in range(max_steps):
+            observations[t] = observation
+            chosen = policy(observations[t:t + 1] if batched else observations[t])
+            if isinstance(chosen, dict):
+                action = chosen
+                action_to_array(action, out=actions[t])
+            else:
+                actions[t] = np.asarray(chosen).reshape(-1)
+                action = array_to_action(actions[t])
+
+            # Same sequence as step()
+            self.state['time'] += self.time_increment
+            self.apply_action(self.active_chamber, action['active_chamber'])
+            self.apply_action(self.curing_chamber, action['curing_chamber'])
+            self.update_state(action)
+            rewards[t] = self.calculate_reward()
+            dones[t] = self.check_done()
+            times[t] = self.state['time']
+            observation = self.get_flat_observation()
+            steps = t + 1
+            if dones[t]:
+                break
+
+        return {
+            "observations": observations[:steps],
+            "actions": actions[:steps],
+            "rewards": rewards[:steps],
+            "dones": dones[:steps],
+            "times": times[:steps],
+            "final_observation": observation.copy()
+        }
+
     def apply_action(self, chamber, chamber_action):
         """
         Apply the action to the specific chamber based on the given action dictionary.
@@ -187,38 +466,67 @@ class CompostingEnv(gym.Env):
     def update_state(self, action):
         """
         Update the environmental state based on the action's specified durations.
+        The chamber's sensors change by the per-second effects of its (paddle, air pump) status times
+        the duration, or by the natural changes when both are off, one vector add per update stage.
         """
         for chamber_key, chamber in zip(['active_chamber', 'curing_chamber'], [self.active_chamber, self.curing_chamber]):
             chamber_action = action[chamber_key]
             duration = self.get_action_duration(chamber_action)
 
-            # Check paddle status
-            if chamber.get_paddle_status() == 1:
-                # Apply paddle-specific updates
-                temp_adjustment = self.calculate_temperature("paddle", duration)
-                self.update_temperature(chamber, temp_adjustment)
+            rates, natural, touched = self.get_action_effects(chamber)
+            status = (int(chamber.get_paddle_status()), int(chamber.get_air_pump_status()))
+            for stage_rates, stage_natural, stage_touched in zip(rates[status], natural[status], touched[status]):
+                if stage_touched.any():
+                    chamber.update_sensors(stage_rates * duration + stage_natural, stage_touched)
 
-                moisture_adjustment = self.calculate_moisture("paddle", duration)
-                self.update_moisture(chamber, moisture_adjustment)
-
-                co2_adjustment = self.calculate_co2("paddle", duration)
-                self.update_co2(chamber, co2_adjustment)
-
-            # Check air pump status
-            if chamber.get_air_pump_status() == 1:
-                # Apply air pump-specific updates
-                methane_adjustment = self.calculate_methane("air_pump", duration)
-                self.update_methane(chamber, methane_adjustment)
-
-                oxygen_adjustment = self.calculate_oxygen("air_pump", duration)
-                self.update_oxygen(chamber, oxygen_adjustment)
-
-                temp_adjustment = self.calculate_temperature("air_pump", duration)
-                self.update_temperature(chamber, temp_adjustment)
+    def get_action_effects(self, chamber: Chamber):
+        """
+        Return the action-effect tables for the chamber's sensor layout, building them on first use.
+        """
+        layout = chamber.get_layout()
+        if layout not in self.action_effects:
+            self.action_effects[layout] = self.build_action_effects(chamber.get_sensor_slices())
+        return self.action_effects[layout]
 
-            # Apply natural changes if no components are active
-            if chamber.get_paddle_status() == 0 and chamber.get_air_pump_status() == 0:
-                self.update_natural_action(chamber)
+    def build_action_effects(self, sensor_slices):
+        """
+        Build lookup tables indexed by (paddle status, air pump status, update stage), each row spans all
+        sensor readings:
+            - rates: per-second change while the components are on
+            - natural: per-step natural change, only in the (0, 0) row
+            - touched: which readings the stage updates
+        With both components on the paddle effects are applied in stage 0 and the air pump effects in
+        stage 1, each clipped and truncated on its own like the paddle and air pump sensor updates.
+        Every other status only uses stage 0.
+        """
+        size = max(columns.stop for columns in sensor_slices.values())
+        rates = np.zeros((2, 2, 2, size))
+        natural = np.zeros((2, 2, 2, size))
+        touched = np.zeros((2, 2, 2, size), dtype=bool)
+
+        # Per-second coefficients come from the calculate_* functions
+        paddle_effects = {
+            "temperature": self.calculate_temperature("paddle", 1),
+            "moisture": self.calculate_moisture("paddle", 1),
+            "co2": self.calculate_co2("paddle", 1)
+        }
+        air_pump_effects = {
+            "methane": self.calculate_methane("air_pump", 1),
+            "oxygen": self.calculate_oxygen("air_pump", 1),
+            "temperature": self.calculate_temperature("air_pump", 1)
+        }
+        for sensor, adjustment in paddle_effects.items():
+            rates[1, :, 0, sensor_slices[sensor]] = adjustment
+            touched[1, :, 0, sensor_slices[sensor]] = True
+        for sensor, adjustment in air_pump_effects.items():
+            rates[0, 1, 0, sensor_slices[sensor]] = adjustment
+            touched[0, 1, 0, sensor_slices[sensor]] = True
+            rates[1, 1, 1, sensor_slices[sensor]] = adjustment
+            touched[1, 1, 1, sensor_slices[sensor]] = True
+        for sensor, change in self.natural_changes.items():
+            natural[0, 0, 0, sensor_slices[sensor]] = change
+            touched[0, 0, 0, sensor_slices[sensor]] = True
+        return rates, natural, touched
 
 
     def update_natural_action(self, chamber):
@@ -226,19 +534,12 @@ class CompostingEnv(gym.Env):
         Simulate natural environmental changes when no components are active.
 
         """
-        # Natural decay or fluctuation rates (placeholders)
-        natural_temp_change = -0.1  # Natural cooling
-        natural_moisture_change = -0.05  # Gradual drying
-        natural_methane_increase = 0.02  # Methane builds up slowly
-        natural_oxygen_decrease = -0.03  # Oxygen gradually depletes
-        natural_co2_increase = 0.04  # CO2 increases due to decomposition
-
         # Apply natural changes to the chamber
-        self.update_temperature(chamber, natural_temp_change)
-        self.update_moisture(chamber, natural_moisture_change)
-        self.update_methane(chamber, natural_methane_increase)
-        self.update_oxygen(chamber, natural_oxygen_decrease)
-        self.update_co2(chamber, natural_co2_increase)
+        self.update_temperature(chamber, self.natural_changes["temperature"])
+        self.update_moisture(chamber, self.natural_changes["moisture"])
+        self.update_methane(chamber, self.natural_changes["methane"])
+        self.update_oxygen(chamber, self.natural_changes["oxygen"])
+        self.update_co2(chamber, self.natural_changes["co2"])
 
     # Placeholder functions for environmental updates
     def update_temperature(self, chamber:Chamber, adjust_value):
@@ -344,9 +645,10 @@ class CompostingEnv(gym.Env):
         meth = chamber.get_methane()[0]
         
         # Debug statements
-        print(f"Checking extreme values for chamber: temp={temp}, moisture={moist}, oxygen={oxy}, co2={co2}, methane={meth}")
-        print(f"Thresholds: temperature={self.extreme_limits['temperature']}, moisture={self.extreme_limits['moisture']}, "
-              f"oxygen={self.extreme_limits['oxygen']}, co2={self.extreme_limits['co2']}, methane={self.extreme_limits['methane']}")
+        if self.verbose:
+            print(f"Checking extreme values for chamber: temp={temp}, moisture={moist}, oxygen={oxy}, co2={co2}, methane={meth}")
+            print(f"Thresholds: temperature={self.extreme_limits['temperature']}, moisture={self.extreme_limits['moisture']}, "
+                  f"oxygen={self.extreme_limits['oxygen']}, co2={self.extreme_limits['co2']}, methane={self.extreme_limits['methane']}")
     
         # Evaluate extreme conditions based on defined limits
         return (temp < self.extreme_limits["temperature"][0] or temp > self.extreme_limits["temperature"][1] or
@@ -359,11 +661,11 @@ class CompostingEnv(gym.Env):
         """
         Check if the episode has reached its end condition.
         """
-        if self.state['time'] >= 14 * 24 * 60 * 60:
+        if self.state['time'] >= EPISODE_MIN_TIME:
             if self.meets_optimal_conditions(self.active_chamber) and self.meets_optimal_conditions(self.curing_chamber):
                 return True  # Successful completion
     
-            if self.state['time'] >= 20 * 24 * 60 * 60:
+            if self.state['time'] >= EPISODE_MAX_TIME:
                 return True  # Episode ends due to excessive duration
     
         # Critical check for extreme values
@@ -372,7 +674,121 @@ class CompostingEnv(gym.Env):
     
         return False
 
-    
+    def advance(self, steps):
+        """
+        Jump forward `steps` idle steps (paddle and air pump off in both chambers) in closed form.
+
+        Idle steps only add the natural-change row, so after the first step every reading moves
+        linearly and stays inside its clip range. Each quantity check_done and calculate_reward look
+        at is then monotone in the step count, and the first step where the episode ends is found by
+        binary search instead of stepping. Stops at that step, like calling step() until done.
+
+        The closed form needs exact whole-hundredth updates, so it is used in fixed-point mode, where it
+        is bit-identical to stepping. In float mode every step's truncation of the float64 readings
+        drifts (e.g. 40.9 - 0.1 truncates to 40.79), so the idle steps are run one by one instead and
+        the result is the same as calling step().
+        Returns (observation, reward, done, info) like step(), with info["steps"] (steps taken) and
+        info["total_reward"] (sum of the per-step rewards over those steps).
+        """
+        if steps < 1:
+            raise ValueError("steps must be at least 1")
+        chambers = {key: getattr(self, key) for key in CHAMBER_KEYS}
+        if any(chamber.get_paddle_status() or chamber.get_air_pump_status() for chamber in chambers.values()):
+            raise ValueError("advance() needs the paddle and air pump off in both chambers")
+        if not all(chamber.is_fixed_point() for chamber in chambers.values()):
+            return self.advance_by_stepping(steps)
+
+        # 1. Readings after the first idle step, in hundredths, and their change per further step
+        tracks = {}
+        for key, chamber in chambers.items():
+            slices = chamber.get_sensor_slices()
+            rates, natural, touched = self.get_action_effects(chamber)
+            delta = to_centi_units(natural[0, 0, 0])
+            lower = np.full(len(delta), -2 ** 62)
+            upper = np.full(len(delta), 2 ** 62)
+            for sensor in CLIPPED_SENSORS:
+                lower[slices[sensor]], upper[slices[sensor]] = -100 * FIXED_POINT_SCALE, 100 * FIXED_POINT_SCALE
+            first = np.clip(chamber.get_centi_units() + delta, lower, upper)
+            tracks[key] = (first, delta, lower, upper, slices, chamber.is_fixed_point())
+
+        def readings_at(key, step):
+            first, delta, lower, upper, _, _ = tracks[key]
+            return np.clip(first + (step - 1) * delta, lower, upper)
+
+        def factors_at(key, step):
+            _, _, _, _, slices, fixed_point = tracks[key]
+            return centi_factors(readings_at(key, step), slices, fixed_point)
+
+        # 2. First step where check_done() would be True
+        start_time = self.state['time']
+        done_step, in_range = self.first_done_step(factors_at, steps, lambda step: start_time + step * self.time_increment)
+        done = done_step is not None
+        taken = done_step if done else steps
+
+        # 3. Per-step rewards over the steps taken, from the active chamber's in-range intervals
+        total_reward = 0
+        for factor in self.optimal_ranges:
+            factor_interval = intersect_intervals([in_range["active_chamber", factor], (1, taken)])
+            if factor_interval is not None:
+                total_reward += self.weights[factor] * (factor_interval[1] - factor_interval[0] + 1)
+
+        # 4. Write the final state
+        for key, chamber in chambers.items():
+            chamber.set_centi_units(readings_at(key, taken))
+        self.state['time'] = start_time + taken * self.time_increment
+        info = {"steps": taken, "total_reward": total_reward}
+        return self.get_observation(), self.calculate_reward(), done, info
+
+    def first_done_step(self, factors_at, steps, time_at):
+        """
+        First step in [1, steps] where check_done() would be True, for readings that move monotonically
+        with the step: factors_at(chamber_key, step) returns the centi_factors() of a chamber after
+        `step` steps and time_at(step) the clock. Each in-range and extreme condition then holds on a
+        prefix or suffix of the steps and is found by binary search.
+        Returns (step or None, in_range) with the (first, last) steps, or None, in which each
+        (chamber_key, factor) is inside its optimal range.
+        """
+        def interval(key, factor, test):
+            return true_interval(lambda step: test(factors_at(key, step)[factor]), steps)
+
+        in_range = {}
+        extreme_starts = []
+        for key in CHAMBER_KEYS:
+            for factor, (min_val, max_val) in self.optimal_ranges.items():
+                in_range[key, factor] = intersect_intervals([
+                    interval(key, factor, lambda value, min_val=min_val: min_val <= value),
+                    interval(key, factor, lambda value, max_val=max_val: value <= max_val)])
+            for factor, (min_val, max_val) in self.extreme_limits.items():
+                extremes = [interval(key, factor, lambda value, max_val=max_val: value > max_val)]
+                if factor != "methane":  # has_extreme_values only checks methane's upper limit
+                    extremes.append(interval(key, factor, lambda value, min_val=min_val: value < min_val))
+                extreme_starts.extend(extreme[0] for extreme in extremes if extreme is not None)
+
+        min_time_step = first_true_step(lambda step: time_at(step) >= EPISODE_MIN_TIME, 1, steps)
+        max_time_step = first_true_step(lambda step: time_at(step) >= EPISODE_MAX_TIME, 1, steps)
+        done_steps = list(extreme_starts)
+        optimal = intersect_intervals(list(in_range.values()))
+        if optimal is not None and min_time_step is not None and max(optimal[0], min_time_step) <= optimal[1]:
+            done_steps.append(max(optimal[0], min_time_step))
+        if max_time_step is not None:
+            done_steps.append(max_time_step)
+        return (min(done_steps) if done_steps else None), in_range
+
+    def advance_by_stepping(self, steps):
+        """
+        advance() in float mode: the idle steps of step(), without building an observation per step.
+        """
+        idle_action = {key: {} for key in CHAMBER_KEYS}
+        total_reward, taken, done = 0, 0, False
+        while taken < steps and not done:
+            self.state['time'] += self.time_increment
+            self.update_state(idle_action)
+            reward = self.calculate_reward()
+            done = self.check_done()
+            total_reward += reward
+            taken += 1
+        info = {"steps": taken, "total_reward": total_reward}
+        return self.get_observation(), reward, done, info
 
     def simulate_paddle(self, chamber: Chamber, paddle_action):
         """
@@ -0,0 +1,135 @@
+import argparse
+import copy
+import time
+import warnings
+import numpy as np
+import torch
+import torch.nn as nn
+from lidaEnvironment import CompostingEnv
+from MLTraining import BranchingDQN, codec, CHECKPOINT_PATH, DURATION_BINS
+from actionCodec import ActionCodec, DURATION_COLUMNS
+from trainingCheckpoint import load_checkpoint
+
+
+class GreedyPolicy(nn.Module):
+    """
+    Deployment wrapper around a trained Q-network: takes a (batch, D) float32 batch of flat observations
+    (see CompostingEnv.observation_layout) and returns the greedy actions.
+        - BranchingDQN: (batch, len(ACTION_COLUMNS)) int64 action rows, durations in seconds
+        - DQN: (batch,) int64 flat action indices, see ActionCodec
+    """
+
+    def __init__(self, net, duration_bins=None):
+        super().__init__()
+        self.net = net
+        self.branching = isinstance(net, BranchingDQN)
+        if self.branching:
+            self.padded_index = net.padded_index.clone()
+            self.padding = net.padding.clone()
+            # Columns holding a duration bin are mapped to seconds with duration_bins, the others stay as they are
+            bins = torch.as_tensor(np.asarray(duration_bins if duration_bins is not None else codec.duration_bins), dtype=torch.int64)
+            self.duration_bins = bins
+            self.is_duration = torch.tensor([i in DURATION_COLUMNS for i in range(len(net.branch_sizes))])
+        else:
+            self.padded_index = torch.zeros(0, 0, dtype=torch.int64)
+            self.padding = torch.zeros(0, 0, dtype=torch.bool)
+            self.duration_bins = torch.zeros(0, dtype=torch.int64)
+            self.is_duration = torch.zeros(0, dtype=torch.bool)
+
+    def forward(self, observations):
+        q_values = self.net(observations)
+        if not self.branching:
+            return q_values.argmax(1)
+        choices = q_values[:, self.padded_index].masked_fill(self.padding, float("-inf")).argmax(2)
+        return torch.where(self.is_duration, self.duration_bins[choices.clamp(max=self.duration_bins.shape[0] - 1)], choices)
+
+
+def quantize(net):
+    """Dynamically quantized copy of a network: nn.Linear weights in int8, activations quantized per batch."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        warnings.simplefilter("ignore", UserWarning)
+        return torch.ao.quantization.quantize_dynamic(net, {nn.Linear}, dtype=torch.qint8)
+
+
+def export_policy(net, path, quantized=False, duration_bins=None):
+    """
+    Save a trained Q-network as a TorchScript GreedyPolicy artifact, optionally int8 dynamically quantized.
+    Returns the scripted module.
+    """
+    net = copy.deepcopy(net).eval()  # Leave the caller's network in its training mode
+    if quantized:
+        net = quantize(net)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        scripted = torch.jit.script(GreedyPolicy(net, duration_bins).eval())
+        scripted = torch.jit.freeze(scripted) if not quantized else scripted
+        torch.jit.save(scripted, path)
+    return scripted
+
+
+def load_policy(path):
+    """Load an exported policy for CPU inference."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return torch.jit.load(path, map_location="cpu").eval()
+
+
+def greedy_actions(policy, observations):
+    """
+    Score a batch of flat observations in one forward pass and return the greedy actions as a NumPy array.
+    A single observation of shape (D,) is treated as a batch of one.
+    """
+    observations = np.ascontiguousarray(observations, dtype=np.float32)
+    with torch.inference_mode():
+        batch = torch.from_numpy(observations)
+        actions = policy(batch.unsqueeze(0) if batch.dim() == 1 else batch)
+    return actions.numpy()
+
+
+def load_trained_net(checkpoint_path):
+    """
+    Build the branching DQN from MLTraining and load the policy network of a training checkpoint.
+    Returns the network and the duration bins it was trained with, taken from the checkpoint's config
+    (checkpoints without one were trained with the default DURATION_BINS).
+    """
+    checkpoint = load_checkpoint(checkpoint_path)
+    if checkpoint is None:
+        raise FileNotFoundError(f"No checkpoint at {checkpoint_path}")
+    env = CompostingEnv(observation_mode="flat", verbose=False)
+    duration_bins = checkpoint.get("config", {}).get("duration_bins", DURATION_BINS)
+    trained_codec = ActionCodec(max_duration=env.max_duration, duration_bins=duration_bins)
+    net = BranchingDQN(input_dim=env.observation_space.shape[0], branch_sizes=trained_codec.branch_sizes)
+    net.load_state_dict(checkpoint["policy_net"])
+    return net, trained_codec.duration_bins
+
+
+def benchmark(policy, state_dim, batch_sizes, repeats=200):
+    """Mean latency in milliseconds of greedy_actions for each batch size."""
+    latencies = {}
+    for batch_size in batch_sizes:
+        observations = np.random.default_rng(0).uniform(0, 100, size=(batch_size, state_dim)).astype(np.float32)
+        greedy_actions(policy, observations)  # Warm-up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            greedy_actions(policy, observations)
+        latencies[batch_size] = (time.perf_counter() - start) / repeats * 1000
+    return latencies
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the trained policy network as a TorchScript greedy policy")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="Training checkpoint written by MLTraining.py")
+    parser.add_argument("--output", default="policy.pt")
+    parser.add_argument("--quantize", action="store_true", help="Export the int8 dynamically quantized variant")
+    parser.add_argument("--benchmark", type=int, nargs="*", default=None, help="Batch sizes to time after exporting")
+    torch.set_num_threads(1)
+    args = parser.parse_args()
+
+    net, duration_bins = load_trained_net(args.checkpoint)
+    export_policy(net, args.output, quantized=args.quantize, duration_bins=duration_bins)
+    print(f"Exported {'quantized ' if args.quantize else ''}policy to {args.output}")
+    if args.benchmark is not None:
+        policy = load_policy(args.output)
+        for batch_size, latency in benchmark(policy, net.fc1.in_features, args.benchmark or [1, 64, 512]).items():
+            print(f"batch {batch_size:>5}: {latency:.3f} ms")
@@ -0,0 +1,323 @@
+import numpy as np
+import torch
+from lidaEnvironment import ACTION_COLUMNS, action_to_array
+
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of transitions stored in preallocated, typed NumPy columns.
+
+    Columns (capacity rows each):
+        - observations, next_observations (float32, obs_dim): flat observations, see env.observation_layout
+        - actions (int32, len(ACTION_COLUMNS)): action rows laid out as ACTION_COLUMNS
+        - rewards, dones (float32)
+        - next_index (int64): row of the same episode's next transition, -1 at the end of an episode or
+          while it has not been stored yet
+        - sequence (int64): write counter of the row, to recognize rows that have been overwritten
+    Once full, the oldest transition is overwritten. sample() gathers a random batch by index and hands
+    the gathered arrays to torch with from_numpy, so the gather is the only copy.
+
+    Transitions are chained per stream (one env, or one unit of a vector env) through next_index, which
+    lets gather_n_step() build n-step returns for a whole batch with one array step per lookahead step.
+    """
+
+    COLUMNS = ("observations", "next_observations", "actions", "rewards", "dones", "next_index", "sequence")
+
+    def __init__(self, capacity, obs_dim, action_dim=len(ACTION_COLUMNS), seed=None):
+        self.capacity = capacity
+        self.observations = np.zeros((capacity, obs_dim), dtype=np.float32)
+        self.next_observations = np.zeros((capacity, obs_dim), dtype=np.float32)
+        self.actions = np.zeros((capacity, action_dim), dtype=np.int32)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=np.float32)
+        self.next_index = np.full(capacity, -1, dtype=np.int64)
+        self.sequence = np.full(capacity, -1, dtype=np.int64)
+        self.position = 0  # Next row to write
+        self.size = 0
+        self.written = 0  # Rows written so far
+        self.stream_rows = {}  # Stream -> (row, sequence) of its last transition, while its episode goes on
+        self.rng = np.random.default_rng(seed)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def nbytes(self):
+        """Memory held by the preallocated columns."""
+        return sum(getattr(self, name).nbytes for name in self.COLUMNS)
+
+    def add(self, observation, action, reward, next_observation, done, truncated=False, stream=0):
+        """
+        Store one transition. The action can be an action dictionary or an action row. truncated marks the
+        last transition of an episode that was cut off without done, stream tells apart interleaved envs.
+        Returns the row it was written to.
+        """
+        i = self.position
+        self.observations[i] = observation
+        if isinstance(action, dict):
+            action = action_to_array(action)
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_observations[i] = next_observation
+        self.dones[i] = done
+        self.next_index[i] = -1
+        self.sequence[i] = self.written
+
+        previous = self.stream_rows.get(stream)
+        if previous is not None and self.sequence[previous[0]] == previous[1]:
+            self.next_index[previous[0]] = i
+        if done or truncated:
+            self.stream_rows.pop(stream, None)
+        else:
+            self.stream_rows[stream] = (i, self.written)
+
+        self.written += 1
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return i
+
+    def add_batch(self, observations, actions, rewards, next_observations, dones, truncated=None, streams=None):
+        """
+        Store a batch of transitions, (N, ...) arrays with action rows. By default row k comes from unit k
+        of a vector env; streams gives each row's stream instead, rows of the same stream in time order
+        (e.g. a run of consecutive transitions from one actor). Returns the rows they were written to.
+        """
+        n = len(rewards)
+        rows = (self.position + np.arange(n)) % self.capacity
+        sequences = self.written + np.arange(n)
+        self.observations[rows] = observations
+        self.actions[rows] = actions
+        self.rewards[rows] = rewards
+        self.next_observations[rows] = next_observations
+        self.dones[rows] = dones
+        self.next_index[rows] = -1
+        self.sequence[rows] = sequences
+
+        # Chain every row to the previous row of its stream, within the batch or from earlier batches
+        streams = np.arange(n) if streams is None else np.asarray(streams)
+        ends = np.asarray(dones, dtype=bool) if truncated is None else np.asarray(dones, dtype=bool) | np.asarray(truncated, dtype=bool)
+        order = np.argsort(streams, kind="stable")
+        grouped, grouped_rows, grouped_ends = streams[order], rows[order], ends[order]
+        first = np.ones(n, dtype=bool)
+        first[1:] = grouped[1:] != grouped[:-1]
+        last = np.ones(n, dtype=bool)
+        last[:-1] = first[1:]
+
+        within = ~first & ~np.roll(grouped_ends, 1)
+        self.next_index[np.roll(grouped_rows, 1)[within]] = grouped_rows[within]
+        for stream, row in zip(grouped[first].tolist(), grouped_rows[first].tolist()):
+            previous = self.stream_rows.get(stream)
+            if previous is not None and self.sequence[previous[0]] == previous[1]:
+                self.next_index[previous[0]] = row
+        for stream, row, sequence, end in zip(grouped[last].tolist(), grouped_rows[last].tolist(),
+                                              sequences[order][last].tolist(), grouped_ends[last].tolist()):
+            if end:
+                self.stream_rows.pop(stream, None)
+            else:
+                self.stream_rows[stream] = (row, sequence)
+
+        self.written += n
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+        return rows
+
+    def sample_indices(self, batch_size):
+        """Draw batch_size stored rows uniformly at random (with replacement)."""
+        return self.rng.integers(0, self.size, size=batch_size)
+
+    def gather(self, indices):
+        """
+        Gather the rows at indices as torch tensors sharing memory with the gathered arrays:
+        (observations, actions, rewards, next_observations, dones).
+        """
+        return (
+            torch.from_numpy(self.observations[indices]),
+            torch.from_numpy(self.actions[indices]),
+            torch.from_numpy(self.rewards[indices]),
+            torch.from_numpy(self.next_observations[indices]),
+            torch.from_numpy(self.dones[indices])
+        )
+
+    def n_step_targets(self, indices, n_step, gamma):
+        """
+        Follow each sampled row up to n_step - 1 transitions ahead through next_index, stopping at done,
+        at the end of the episode or at the newest stored transition. Returns (returns, bootstrap_rows,
+        discounts): the discounted reward sum, the row whose next observation to bootstrap from and
+        gamma ** steps taken, zero when the episode ended with done.
+        """
+        rows = np.asarray(indices)
+        returns = self.rewards[rows].astype(np.float64)
+        discounts = np.full(len(rows), float(gamma))
+        alive = (self.dones[rows] == 0) & (self.next_index[rows] >= 0)
+        for _ in range(n_step - 1):
+            ahead = np.where(alive, self.next_index[rows], rows)
+            returns += np.where(alive, discounts * self.rewards[ahead], 0.0)
+            discounts = np.where(alive, discounts * gamma, discounts)
+            rows = ahead
+            alive &= (self.dones[rows] == 0) & (self.next_index[rows] >= 0)
+        discounts *= 1.0 - self.dones[rows]
+        return returns, rows, discounts
+
+    def gather_n_step(self, indices, n_step, gamma):
+        """
+        Gather the rows at indices with n-step targets as torch tensors:
+        (observations, actions, n-step returns, bootstrap next_observations, bootstrap discounts).
+        The target of row i is returns[i] + discounts[i] * max_a Q(bootstrap next_observations[i], a);
+        with n_step = 1 it is the one-step target reward + gamma * (1 - done) * max_a Q(next_observation, a).
+        """
+        returns, bootstrap_rows, discounts = self.n_step_targets(indices, n_step, gamma)
+        return (
+            torch.from_numpy(self.observations[indices]),
+            torch.from_numpy(self.actions[indices]),
+            torch.from_numpy(returns.astype(np.float32)),
+            torch.from_numpy(self.next_observations[bootstrap_rows]),
+            torch.from_numpy(discounts.astype(np.float32))
+        )
+
+    def sample(self, batch_size, n_step=None, gamma=None):
+        """
+        Sample a random batch, see gather(), or with n_step and gamma, see gather_n_step().
+        """
+        indices = self.sample_indices(batch_size)
+        if n_step is None:
+            return self.gather(indices)
+        return self.gather_n_step(indices, n_step, gamma)
+
+    def state_dict(self):
+        """
+        Return a copy of the stored transitions (only the filled rows), the ring position and the RNG state,
+        for checkpoints. Copying keeps the snapshot consistent while training goes on.
+        """
+        return {
+            "capacity": self.capacity,
+            "position": self.position,
+            "size": self.size,
+            "written": self.written,
+            "stream_rows": dict(self.stream_rows),
+            "rng": self.rng.bit_generator.state,
+            "columns": {name: getattr(self, name)[:self.size].copy() for name in self.COLUMNS}
+        }
+
+    def load_state_dict(self, state):
+        """Restore a state_dict() snapshot into a buffer of the same capacity and observation size."""
+        if state["capacity"] != self.capacity:
+            raise ValueError(f"Checkpoint buffer capacity {state['capacity']} does not match {self.capacity}")
+        for name in self.COLUMNS:
+            getattr(self, name)[:state["size"]] = state["columns"][name]
+        self.position = state["position"]
+        self.size = state["size"]
+        self.written = state["written"]
+        self.stream_rows = dict(state["stream_rows"])
+        self.rng.bit_generator.state = state["rng"]
+
+
+class SumTree:
+    """
+    Binary sum-tree over capacity leaf priorities, stored in one flat NumPy array.
+
+    Node i has children 2i and 2i + 1, the root is node 1 and leaf j is node leaves + j, where leaves is
+    capacity rounded up to a power of two. Updates and prefix-sum searches walk one level per step for the
+    whole batch at once, so both are O(log N) array operations.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaves = 1 << max(capacity - 1, 0).bit_length()
+        self.depth = self.leaves.bit_length() - 1
+        self.tree = np.zeros(2 * self.leaves)
+
+    def total(self):
+        return self.tree[1]
+
+    def get(self, indices):
+        return self.tree[self.leaves + np.asarray(indices)]
+
+    def update(self, indices, priorities):
+        """Set the priorities of the given leaves and refresh their ancestors."""
+        nodes = self.leaves + np.asarray(indices)
+        self.tree[nodes] = priorities
+        for _ in range(self.depth):
+            nodes = np.unique(nodes // 2)
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+
+    def find(self, values):
+        """Return the leaf whose prefix-sum interval contains each value in [0, total())."""
+        values = np.array(values, dtype=float)
+        nodes = np.ones(len(values), dtype=np.int64)
+        for _ in range(self.depth):
+            left = self.tree[2 * nodes]
+            # Never step into an empty right subtree when rounding puts a value at its border
+            go_right = (values >= left) & (self.tree[2 * nodes + 1] > 0)
+            values -= np.where(go_right, left, 0)
+            nodes = 2 * nodes + go_right
+        return np.minimum(nodes - self.leaves, self.capacity - 1)
+
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    ReplayBuffer with proportional prioritized sampling.
+
+    Transition i is sampled with probability p_i^alpha / sum_k p_k^alpha, where p_i is its last absolute
+    TD error (plus epsilon) and new transitions get the highest priority seen so far. sample() returns
+    importance-sampling weights (N * P(i))^-beta normalized by their maximum, to scale the loss, and the
+    sampled rows, to pass back to update_priorities() with the new TD errors.
+    """
+
+    def __init__(self, capacity, obs_dim, action_dim=len(ACTION_COLUMNS), alpha=0.6, epsilon=1e-6, seed=None):
+        super().__init__(capacity, obs_dim, action_dim, seed)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.tree = SumTree(capacity)
+        self.max_priority = 1.0
+
+    @property
+    def nbytes(self):
+        return super().nbytes + self.tree.tree.nbytes
+
+    def add(self, observation, action, reward, next_observation, done, truncated=False, stream=0):
+        i = super().add(observation, action, reward, next_observation, done, truncated, stream)
+        self.tree.update([i], self.max_priority ** self.alpha)
+        return i
+
+    def add_batch(self, observations, actions, rewards, next_observations, dones, truncated=None, streams=None):
+        rows = super().add_batch(observations, actions, rewards, next_observations, dones, truncated, streams)
+        self.tree.update(rows, self.max_priority ** self.alpha)
+        return rows
+
+    def sample_indices(self, batch_size):
+        """Draw one row from each of batch_size equal slices of the total priority."""
+        bounds = np.linspace(0, self.tree.total(), batch_size + 1)
+        return self.tree.find(self.rng.uniform(bounds[:-1], bounds[1:]))
+
+    def importance_weights(self, indices, beta):
+        probabilities = self.tree.get(indices) / self.tree.total()
+        weights = (self.size * probabilities) ** -beta
+        return (weights / weights.max()).astype(np.float32)
+
+    def sample(self, batch_size, beta=0.4, n_step=None, gamma=None):
+        """
+        Sample a prioritized batch: (observations, actions, rewards, next_observations, dones, weights, indices),
+        or with n_step and gamma the n-step columns of gather_n_step() followed by weights and indices.
+        """
+        indices = self.sample_indices(batch_size)
+        columns = self.gather(indices) if n_step is None else self.gather_n_step(indices, n_step, gamma)
+        return columns + (torch.from_numpy(self.importance_weights(indices, beta)), indices)
+
+    def state_dict(self):
+        state = super().state_dict()
+        state["priorities"] = self.tree.get(np.arange(self.size))
+        state["max_priority"] = self.max_priority
+        return state
+
+    def load_state_dict(self, state):
+        super().load_state_dict(state)
+        self.tree.update(np.arange(self.size), state["priorities"])
+        self.max_priority = state["max_priority"]
+
+    def update_priorities(self, indices, td_errors):
+        """
+        Set the priorities of the sampled rows from their new TD errors.
+        """
+        priorities = np.abs(np.asarray(td_errors, dtype=float)) + self.epsilon
+        self.max_priority = max(self.max_priority, priorities.max())
+        self.tree.update(indices, priorities ** self.alpha)
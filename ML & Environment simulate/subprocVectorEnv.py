@@ -0,0 +1,210 @@
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from lidaEnvironment import ACTION_COLUMNS, ACTION_FIELDS, action_to_array
+from vectorEnv import VectorCompostingEnv, CHAMBER_KEYS
+
+# Command codes sent to the workers over their pipes, one byte each
+CMD_STEP = 0
+CMD_RESET = 1
+CMD_CLOSE = 2
+
+
+def observation_size(env):
+    """Length of the flat observation of one unit of a VectorCompostingEnv (sensors, then isEmpty, per chamber)."""
+    return sum(env.sensors[key].shape[1] + 1 for key in CHAMBER_KEYS)
+
+
+def rows_to_batched_action(rows):
+    """Convert (N, A) action rows laid out as ACTION_COLUMNS into a batched action for VectorCompostingEnv."""
+    batched = {}
+    for i, chamber_key in enumerate(CHAMBER_KEYS):
+        offset = i * len(ACTION_FIELDS)
+        batched[chamber_key] = {
+            "paddle": rows[:, offset:offset + 2],
+            "air_pump": rows[:, offset + 2],
+            "lid": rows[:, offset + 3],
+            "duration": rows[:, offset + 4]
+        }
+    return batched
+
+
+def write_flat_observation(observation, out, mask=None):
+    """
+    Write a batched VectorCompostingEnv observation into the (N, D) float32 array out, in the order of
+    CompostingEnv.observation_layout. With a boolean mask only the selected units are written.
+    """
+    offset = 0
+    for key in CHAMBER_KEYS:
+        for values in observation[key].values():
+            values = values.reshape(len(values), -1)
+            columns = slice(offset, offset + values.shape[1])
+            if mask is None:
+                out[:, columns] = values
+            else:
+                out[mask, columns] = values[mask]
+            offset += values.shape[1]
+
+
+def attach(name, shape, dtype):
+    """Open a shared memory block by name and view it as an array. Returns (block, array)."""
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def worker(pipe, start, stop, names, num_envs, obs_dim):
+    """
+    Own units start:stop of the batch. Waits for a command code, reads its action rows from the shared
+    action array, steps its VectorCompostingEnv and writes the results back into the shared arrays.
+    """
+    blocks, arrays = [], {}
+    for key, (shape, dtype) in buffer_specs(num_envs, obs_dim).items():
+        block, array = attach(names[key], shape, dtype)
+        blocks.append(block)
+        arrays[key] = array[start:stop]
+
+    env = VectorCompostingEnv(stop - start)
+    try:
+        while True:
+            command = pipe.recv_bytes()[0]
+            if command == CMD_STEP:
+                observation, rewards, dones, info = env.step(rows_to_batched_action(arrays["actions"]))
+                if dones.any():
+                    write_flat_observation(info["final_observation"], arrays["final_observations"], dones)
+                arrays["rewards"][:] = rewards
+                arrays["dones"][:] = dones
+                write_flat_observation(observation, arrays["observations"])
+            elif command == CMD_RESET:
+                write_flat_observation(env.reset(), arrays["observations"])
+            elif command == CMD_CLOSE:
+                break
+            pipe.send_bytes(bytes([command]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+        pipe.close()
+
+
+def buffer_specs(num_envs, obs_dim):
+    """Shape and dtype of every shared array."""
+    return {
+        "actions": ((num_envs, len(ACTION_COLUMNS)), np.int64),
+        "observations": ((num_envs, obs_dim), np.float32),
+        "final_observations": ((num_envs, obs_dim), np.float32),
+        "rewards": ((num_envs,), np.float64),
+        "dones": ((num_envs,), np.bool_)
+    }
+
+
+class SubprocVectorEnv:
+    """
+    VectorCompostingEnv split across worker processes, so the env logic runs on several cores.
+
+    Worker i owns a contiguous slice of the num_envs units. Actions, observations, rewards and dones
+    live in multiprocessing.shared_memory arrays that every worker views; the pipes only carry a
+    one-byte command code (CMD_STEP, CMD_RESET, CMD_CLOSE) and a one-byte acknowledgement, so nothing
+    is pickled per step. Observations are flat float32 rows in the order of CompostingEnv's flat
+    observation, actions are integer rows laid out as ACTION_COLUMNS. Finished units are reset
+    automatically like in VectorCompostingEnv, with their last observation in final_observations.
+    """
+
+    def __init__(self, num_envs, num_workers=None, context=None):
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers or mp.cpu_count(), num_envs)
+        self.obs_dim = observation_size(VectorCompostingEnv(1))
+        self.closed = False
+
+        # 1. Shared arrays, created here and attached to by name in the workers
+        self.blocks = {}
+        arrays = {}
+        for key, (shape, dtype) in buffer_specs(num_envs, self.obs_dim).items():
+            size = max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1)
+            self.blocks[key] = shared_memory.SharedMemory(create=True, size=size)
+            arrays[key] = np.ndarray(shape, dtype=dtype, buffer=self.blocks[key].buf)
+            arrays[key].fill(0)
+        self.actions = arrays["actions"]
+        self.observations = arrays["observations"]
+        self.final_observations = arrays["final_observations"]
+        self.rewards = arrays["rewards"]
+        self.dones = arrays["dones"]
+
+        # 2. One worker per contiguous slice of units
+        context = context or mp.get_context()
+        names = {key: block.name for key, block in self.blocks.items()}
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        self.slices = [slice(start, stop) for start, stop in zip(bounds[:-1], bounds[1:])]
+        self.pipes, self.processes = [], []
+        for units in self.slices:
+            parent, child = context.Pipe()
+            process = context.Process(target=worker, args=(child, units.start, units.stop, names, num_envs, self.obs_dim), daemon=True)
+            process.start()
+            child.close()
+            self.pipes.append(parent)
+            self.processes.append(process)
+
+    def _command(self, command):
+        """Send a command code to every worker, then wait for all of them to acknowledge it."""
+        message = bytes([command])
+        for pipe in self.pipes:
+            pipe.send_bytes(message)
+        for pipe in self.pipes:
+            pipe.recv_bytes()
+
+    def reset(self):
+        """
+        Reset every unit and return the (num_envs, D) observation array.
+        The returned arrays are views of shared memory and are overwritten by the next call.
+        """
+        self._command(CMD_RESET)
+        return self.observations
+
+    def step(self, actions):
+        """
+        Step every unit with (num_envs, A) action rows laid out as ACTION_COLUMNS (or a list of action
+        dictionaries). Returns (observations, rewards, dones, info) as views of shared memory; info has
+        final_observation for units that finished and were reset.
+        """
+        if isinstance(actions, (list, tuple)):
+            for i, action in enumerate(actions):
+                action_to_array(action, out=self.actions[i])
+        else:
+            self.actions[:] = actions
+        self._command(CMD_STEP)
+        info = {}
+        if self.dones.any():
+            info["final_observation"] = self.final_observations
+        return self.observations, self.rewards, self.dones, info
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self.closed:
+            return
+        self.closed = True
+        for pipe in self.pipes:
+            try:
+                pipe.send_bytes(bytes([CMD_CLOSE]))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self.pipes:
+            pipe.close()
+        self.actions = self.observations = self.final_observations = self.rewards = self.dones = None
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __del__(self):
+        if hasattr(self, "blocks"):
+            self.close()
@@ -0,0 +1,95 @@
+import copy
+import os
+import threading
+import torch
+
+
+def snapshot_module(module):
+    """Copy of a network's or optimizer's state_dict that later training steps cannot change."""
+    return copy.deepcopy(module.state_dict())
+
+
+def load_checkpoint(path):
+    """
+    Load a checkpoint written by AsyncCheckpointer. Returns None when there is none at path.
+    """
+    if not os.path.exists(path):
+        return None
+    # The checkpoint holds NumPy arrays and RNG states besides tensors, and is only ever our own file
+    return torch.load(path, weights_only=False)
+
+
+class AsyncCheckpointer:
+    """
+    Writes training checkpoints to disk in a background thread.
+
+    save() takes an already snapshotted state (copies made on the training thread, see snapshot_module and
+    ReplayBuffer.state_dict) and returns immediately. The writer thread saves it to a temporary file next to
+    path and renames it over path with os.replace, so a crash or preemption mid-write leaves the previous
+    checkpoint intact. If a new snapshot arrives while one is still being written, only the newest pending
+    one is kept, so training is never blocked by a slow disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = None
+        self.condition = threading.Condition()
+        self.closed = False
+        self.writing = False
+        self.writes = 0
+        self.error = None
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.thread = threading.Thread(target=self.write_loop, daemon=True)
+        self.thread.start()
+
+    def save(self, state):
+        """Queue a snapshot for writing, replacing one that has not been picked up yet."""
+        if self.error is not None:
+            raise RuntimeError(f"Writing checkpoint {self.path} failed") from self.error
+        with self.condition:
+            self.pending = state
+            self.condition.notify_all()
+
+    def write_loop(self):
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                state, self.pending = self.pending, None
+                self.writing = True
+            try:
+                self.write(state)
+            except Exception as error:  # Reported on the next save() or close()
+                self.error = error
+            with self.condition:
+                self.writing = False
+                self.condition.notify_all()
+
+    def write(self, state):
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "wb") as file:
+            torch.save(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.path)
+        self.writes += 1
+
+    def wait(self):
+        """Block until every queued snapshot is on disk."""
+        with self.condition:
+            while self.pending is not None or self.writing:
+                self.condition.wait()
+        if self.error is not None:
+            raise RuntimeError(f"Writing checkpoint {self.path} failed") from self.error
+
+    def close(self):
+        """Finish writing the last snapshot and stop the writer thread."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        if self.error is not None:
+            raise RuntimeError(f"Writing checkpoint {self.path} failed") from self.error
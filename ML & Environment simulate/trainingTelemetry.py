@@ -0,0 +1,168 @@
+import csv
+import math
+import os
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet logs need pyarrow, CSV logs work without it
+    pa = None
+    pq = None
+
+
+class Timer:
+    """Context manager adding the elapsed wall time of its block to one TrainingTelemetry timer."""
+
+    __slots__ = ("telemetry", "name", "start")
+
+    def __init__(self, telemetry, name):
+        self.telemetry = telemetry
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.telemetry.add_time(self.name, time.perf_counter() - self.start)
+
+
+class TrainingTelemetry:
+    """
+    In-process training instrumentation written to a columnar run log.
+
+    Three kinds of measurements are aggregated in plain dictionaries between rows:
+        - counters, count(name, n): totals, logged as name and name_per_sec over the row's wall time
+        - timers, add_time(name, seconds) or with timer(name): logged as name_ms (total) and name_mean_ms
+        - values, observe(name, value): logged as name_mean, name_min and name_max
+    end_row(**fields) closes the current interval into one row together with fields (episode, epsilon,
+    buffer fill, ...). Rows are kept in memory and appended to path every flush_every rows, as CSV or, for a
+    .parquet path, as Parquet row groups (needs pyarrow). The columns are fixed by the first flushed rows,
+    so measurements that only start later (e.g. the loss once the buffer holds a batch) should be declared
+    up front with declare(); they are then logged as 0 or NaN until they are first measured.
+    With append=True (a resumed run) the rows are added after those of an existing log, in its columns,
+    instead of replacing it; the header is only written when the log does not exist yet or is empty.
+    """
+
+    def __init__(self, path, flush_every=50, append=False):
+        self.path = path
+        self.flush_every = flush_every
+        self.append = append
+        self.parquet = path.endswith(".parquet")
+        if self.parquet and pa is None:
+            raise ImportError("Writing a Parquet run log requires pyarrow, use a .csv path instead")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.counters = {}
+        self.timers = {}
+        self.values = {}
+        self.declared = ((), (), ())
+        self.rows = []
+        self.columns = None
+        self.writer = None  # Parquet writer, kept open between flushes
+        self.row_start = time.perf_counter()
+        self.rows_written = 0
+
+    def declare(self, counters=(), timers=(), values=()):
+        """Names that get a column in every row, measured or not."""
+        self.declared = (tuple(counters), tuple(timers), tuple(values))
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, name, seconds):
+        total = self.timers.get(name)
+        if total is None:
+            self.timers[name] = [seconds, 1]
+        else:
+            total[0] += seconds
+            total[1] += 1
+
+    def timer(self, name):
+        return Timer(self, name)
+
+    def observe(self, name, value):
+        stats = self.values.get(name)
+        if stats is None:
+            self.values[name] = [value, value, value, 1]  # Sum, min, max, count
+        else:
+            stats[0] += value
+            if value < stats[1]:
+                stats[1] = value
+            if value > stats[2]:
+                stats[2] = value
+            stats[3] += 1
+
+    def end_row(self, **fields):
+        """Close the current interval into a row, flushing to disk every flush_every rows. Returns the row."""
+        now = time.perf_counter()
+        elapsed = now - self.row_start
+        row = {"wall_time": time.time(), "interval_sec": elapsed, **fields}
+        counters, timers, values = self.declared
+        for name in counters:
+            self.counters.setdefault(name, 0)
+        for name in timers:
+            self.timers.setdefault(name, [0.0, 0])
+        for name in values:
+            self.values.setdefault(name, [math.nan, math.nan, math.nan, 0])
+        for name, total in self.counters.items():
+            row[name] = total
+            row[f"{name}_per_sec"] = total / elapsed if elapsed > 0 else math.nan
+        for name, (seconds, calls) in self.timers.items():
+            row[f"{name}_ms"] = seconds * 1000
+            row[f"{name}_mean_ms"] = seconds * 1000 / calls if calls else math.nan
+        for name, (total, low, high, count) in self.values.items():
+            row[f"{name}_mean"] = total / count if count else math.nan
+            row[f"{name}_min"] = low
+            row[f"{name}_max"] = high
+        self.rows.append(row)
+
+        self.counters, self.timers, self.values = {}, {}, {}
+        self.row_start = time.perf_counter()
+        if len(self.rows) >= self.flush_every:
+            self.flush()
+        return row
+
+    def flush(self):
+        """Append the buffered rows to the run log."""
+        if not self.rows:
+            return
+        resumed = (self.rows_written == 0 and self.append and os.path.exists(self.path)
+                   and os.path.getsize(self.path) > 0)
+        previous = None  # Rows of the log being resumed, Parquet files cannot be appended to in place
+        if resumed and self.parquet:
+            previous = pq.read_table(self.path)
+            self.columns = previous.column_names
+        elif resumed:
+            with open(self.path, newline="") as file:
+                self.columns = next(csv.reader(file))
+        if self.columns is None:
+            self.columns = list(self.rows[0])
+            for row in self.rows[1:]:
+                self.columns.extend(key for key in row if key not in self.columns)
+        if self.parquet:
+            table = pa.table({column: [row.get(column) for row in self.rows] for column in self.columns})
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema if previous is None else previous.schema)
+                if previous is not None:
+                    self.writer.write_table(previous)
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            new_file = self.rows_written == 0 and not resumed
+            with open(self.path, "w" if new_file else "a", newline="") as file:
+                writer = csv.DictWriter(file, fieldnames=self.columns, extrasaction="ignore")
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(self.rows)
+        self.rows_written += len(self.rows)
+        self.rows = []
+
+    def close(self):
+        """Flush the remaining rows and close the log."""
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
@@ -0,0 +1,227 @@
+import numpy as np
+from chamber import SENSORS as SENSOR_KEYS, CLIPPED_SENSORS
+from lidaEnvironment import CompostingEnv, CHAMBER_KEYS
+
+
+class VectorCompostingEnv:
+    """
+    Batched version of CompostingEnv that steps num_envs simulated LIDA units at once.
+
+    Every unit's sensors are held in one (num_envs, n_sensors) float64 array per chamber,
+    so apply_action, update_state, calculate_reward and check_done are whole-batch array
+    operations. Results match CompostingEnv step for step. Units that finish are reset
+    automatically and their last observation is returned in info["final_observation"].
+    """
+
+    def __init__(self, num_envs):
+        self.num_envs = num_envs
+
+        # 0. Use a scalar environment as the template for thresholds, coefficients and reset values
+        template = CompostingEnv(verbose=False)
+        template.reset()
+        self.max_duration = template.max_duration
+        self.time_increment = template.time_increment
+        self.weights = template.weights
+        self.optimal_ranges = template.optimal_ranges
+        self.extreme_limits = template.extreme_limits
+
+        # 1. Column layout of each chamber's sensor array and the per-column constants
+        self.sensor_slices = {}
+        self.initial_values = {}
+        self.clip_low = {}
+        self.clip_high = {}
+        self.action_effects = {}
+        for chamber_key in CHAMBER_KEYS:
+            chamber = getattr(template, chamber_key)
+            slices, values, offset = {}, [], 0
+            for sensor in SENSOR_KEYS:
+                sensor_values = getattr(chamber, f"get_{sensor}")()
+                slices[sensor] = slice(offset, offset + len(sensor_values))
+                values.append(sensor_values)
+                offset += len(sensor_values)
+            self.sensor_slices[chamber_key] = slices
+            self.initial_values[chamber_key] = np.concatenate(values)
+
+            low, high = np.full(offset, -np.inf), np.full(offset, np.inf)
+            for sensor in CLIPPED_SENSORS:
+                low[slices[sensor]], high[slices[sensor]] = -100, 100
+            self.clip_low[chamber_key], self.clip_high[chamber_key] = low, high
+            # Same (paddle, air pump) lookup tables the scalar env uses
+            self.action_effects[chamber_key] = template.build_action_effects(slices)
+
+        self.initial_isEmpty = {key: getattr(template, key).get_isEmpty() for key in CHAMBER_KEYS}
+
+        # 2. Batched state
+        self.sensors = {key: np.empty((num_envs, len(self.initial_values[key]))) for key in CHAMBER_KEYS}
+        self.isEmpty = {key: np.empty(num_envs, dtype=bool) for key in CHAMBER_KEYS}
+        self.paddle_status = {key: np.zeros(num_envs, dtype=bool) for key in CHAMBER_KEYS}
+        self.paddle_direction = {key: np.ones(num_envs, dtype=np.int8) for key in CHAMBER_KEYS}
+        self.lid_status = {key: np.zeros(num_envs, dtype=bool) for key in CHAMBER_KEYS}
+        self.air_pump_status = {key: np.zeros(num_envs, dtype=bool) for key in CHAMBER_KEYS}
+        self.time = np.zeros(num_envs, dtype=np.int64)
+        self.reset()
+
+    def reset(self):
+        """
+        Reset every unit and return the batched observation.
+        """
+        self.reset_envs(np.ones(self.num_envs, dtype=bool))
+        return self.get_observation()
+
+    def reset_envs(self, mask):
+        """
+        Reset the units selected by the boolean mask to their initial state.
+        """
+        for key in CHAMBER_KEYS:
+            self.sensors[key][mask] = self.initial_values[key]
+            self.isEmpty[key][mask] = self.initial_isEmpty[key]
+            self.paddle_status[key][mask] = False
+            self.paddle_direction[key][mask] = 1
+            self.lid_status[key][mask] = False
+            self.air_pump_status[key][mask] = False
+        self.time[mask] = 0
+
+    def get_observation(self):
+        """
+        Return the batched observation, shaped like CompostingEnv's with a leading num_envs axis.
+        """
+        observation = {}
+        for key in CHAMBER_KEYS:
+            chamber_observation = {sensor: self.sensors[key][:, columns].copy()
+                                   for sensor, columns in self.sensor_slices[key].items()}
+            chamber_observation["isEmpty"] = self.isEmpty[key].copy()
+            observation[key] = chamber_observation
+        return observation
+
+    def step(self, actions):
+        """
+        Execute one batched action, update the state, calculate rewards and auto-reset finished units.
+        """
+        self.time += self.time_increment
+
+        # Step 1: Apply actions to both chambers
+        for key in CHAMBER_KEYS:
+            self.apply_action(key, actions[key])
+
+        # Step 2: Update the environment state for both chambers
+        self.update_state(actions)
+
+        # Step 3: Calculate the rewards based on current state
+        rewards = self.calculate_reward()
+
+        # Step 4: Check which units are finished
+        dones = self.check_done()
+
+        # Step 5: Reset finished units and return the new state
+        observation = self.get_observation()
+        info = {}
+        if dones.any():
+            info["final_observation"] = observation
+            self.reset_envs(dones)
+            observation = self.get_observation()
+        return observation, rewards, dones, info
+
+    def apply_action(self, chamber_key, chamber_action):
+        """
+        Apply the batched action arrays to the equipment status of one chamber.
+        """
+        if 'paddle' in chamber_action:
+            paddle = np.asarray(chamber_action['paddle'])
+            paddle_on = paddle[:, 0] == 1
+            self.paddle_status[chamber_key] = paddle_on
+            direction = np.where(paddle[:, 1] == 1, 1, -1)
+            self.paddle_direction[chamber_key] = np.where(paddle_on, direction, self.paddle_direction[chamber_key])
+
+        if 'air_pump' in chamber_action:
+            self.air_pump_status[chamber_key] = np.asarray(chamber_action['air_pump']) != 0
+
+        if 'lid' in chamber_action:
+            self.lid_status[chamber_key] = np.asarray(chamber_action['lid']) == 1
+
+    def update_state(self, actions):
+        """
+        Update every unit's sensors based on equipment status and the action durations.
+        """
+        for key in CHAMBER_KEYS:
+            duration = np.asarray(actions[key].get("duration", self.max_duration), dtype=float)
+            duration = np.broadcast_to(duration, (self.num_envs,))[:, None]
+            paddle_on = self.paddle_status[key].astype(np.intp)
+            air_pump_on = self.air_pump_status[key].astype(np.intp)
+
+            rates, natural, touched = self.action_effects[key]
+            for stage in range(rates.shape[2]):  # Paddle, then air pump when both are on
+                delta = rates[paddle_on, air_pump_on, stage] * duration + natural[paddle_on, air_pump_on, stage]
+                self._apply_delta(key, delta, touched[paddle_on, air_pump_on, stage])
+
+    def _apply_delta(self, chamber_key, delta, mask):
+        """Add delta where mask is set, with the clipping and truncation Chamber applies."""
+        sensors = self.sensors[chamber_key]
+        updated = np.clip(sensors + delta, self.clip_low[chamber_key], self.clip_high[chamber_key])
+        updated = np.floor(updated * 100) / 100
+        # Only touch updated entries, truncation is not idempotent in float64
+        np.copyto(sensors, updated, where=mask)
+
+    def _summary_values(self, chamber_key):
+        """Return the values the reward and end conditions look at, one array per factor."""
+        sensors = self.sensors[chamber_key]
+        slices = self.sensor_slices[chamber_key]
+        return {
+            "co2": sensors[:, slices["co2"].start],
+            "methane": sensors[:, slices["methane"].start],
+            "oxygen": sensors[:, slices["oxygen"].start],
+            "temperature": np.mean(sensors[:, slices["temperature"]], axis=1),
+            "moisture": np.mean(sensors[:, slices["moisture"]], axis=1)
+        }
+
+    def calculate_reward(self):
+        """
+        Calculate the reward of every unit based on proximity to optimal conditions.
+        """
+        current_values = self._summary_values("active_chamber")
+        total_reward = np.zeros(self.num_envs)
+        for factor, value in current_values.items():
+            min_val, max_val = self.optimal_ranges[factor]
+            score = ((min_val <= value) & (value <= max_val)).astype(float)
+            total_reward = total_reward + score * self.weights[factor]
+        return total_reward
+
+    def meets_optimal_conditions(self, chamber_key):
+        values = self._summary_values(chamber_key)
+        meets = np.ones(self.num_envs, dtype=bool)
+        for factor, value in values.items():
+            min_val, max_val = self.optimal_ranges[factor]
+            meets &= (min_val <= value) & (value <= max_val)
+        return meets
+
+    def has_extreme_values(self, chamber_key):
+        values = self._summary_values(chamber_key)
+        extreme = values["methane"] > self.extreme_limits["methane"][1]
+        for factor in ("temperature", "moisture", "oxygen", "co2"):
+            min_val, max_val = self.extreme_limits[factor]
+            extreme |= (values[factor] < min_val) | (values[factor] > max_val)
+        return extreme
+
+    def check_done(self):
+        """
+        Check which units have reached their end condition.
+        """
+        past_minimum = self.time >= 14 * 24 * 60 * 60
+        optimal = self.meets_optimal_conditions("active_chamber") & self.meets_optimal_conditions("curing_chamber")
+        timed_out = self.time >= 20 * 24 * 60 * 60
+        extreme = self.has_extreme_values("active_chamber") | self.has_extreme_values("curing_chamber")
+        return (past_minimum & (optimal | timed_out)) | extreme
+
+
+def stack_actions(actions):
+    """
+    Stack a list of CompostingEnv action dictionaries into one batched action for VectorCompostingEnv.
+    """
+    batched = {}
+    for key in CHAMBER_KEYS:
+        batched[key] = {
+            "paddle": np.array([action[key]["paddle"] for action in actions], dtype=np.int64),
+            "air_pump": np.array([action[key]["air_pump"] for action in actions], dtype=np.int64),
+            "lid": np.array([action[key]["lid"] for action in actions], dtype=np.int64),
+            "duration": np.array([action[key]["duration"] for action in actions], dtype=np.int64)
+        }
+    return batched